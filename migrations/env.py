@@ -2,8 +2,7 @@ from logging.config import fileConfig
 import os
 import sys
 from pathlib import Path
-from sqlalchemy import engine_from_config
-from sqlalchemy import pool
+from sqlalchemy import create_engine
 from alembic import context
 
 # Add project root to Python path
@@ -11,7 +10,11 @@ project_root = Path(__file__).parent.parent.absolute()
 sys.path.insert(0, str(project_root))
 
 # Import the database URL function
-from tenants_manager.config.database import get_database_url
+from tenants_manager.config.database import (
+    apply_sqlite_pragmas,
+    get_database_url,
+    get_sqlite_pragmas,
+)
 
 # Import your models and Base
 from tenants_manager.models.tenant import Base
@@ -72,8 +75,11 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    db_manager = DatabaseManager()
-    connectable = db_manager.engine
+    # A plain engine: DatabaseManager would create and stamp the schema
+    # before the migrations get to run
+    connectable = create_engine(config.get_main_option("sqlalchemy.url"))
+    # Batch migrations rebuild tables, which foreign key enforcement blocks
+    apply_sqlite_pragmas(connectable, {**get_sqlite_pragmas(), "foreign_keys": "OFF"})
 
     with connectable.connect() as connection:
         context.configure(
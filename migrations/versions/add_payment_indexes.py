@@ -0,0 +1,33 @@
+"""Add composite indexes on payments
+
+Revision ID: add_payment_indexes
+Revises: add_tenant_balances
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_payment_indexes'
+down_revision = 'add_tenant_balances'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Per-tenant lookups by reference month (expected rent, monthly status)
+    op.create_index('ix_payments_tenant_id_reference_month', 'payments',
+                    ['tenant_id', 'reference_month'], unique=False)
+    # Monthly totals of completed rent payments
+    op.create_index('ix_payments_type_status_reference_month', 'payments',
+                    ['payment_type', 'status', 'reference_month'], unique=False)
+    # Payment history filtered by date range
+    op.create_index('ix_payments_tenant_id_payment_date', 'payments',
+                    ['tenant_id', 'payment_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_payments_tenant_id_payment_date', table_name='payments')
+    op.drop_index('ix_payments_type_status_reference_month', table_name='payments')
+    op.drop_index('ix_payments_tenant_id_reference_month', table_name='payments')
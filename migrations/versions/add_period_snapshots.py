@@ -0,0 +1,46 @@
+"""Add closed periods and monthly balance snapshots
+
+Revision ID: add_period_snapshots
+Revises: add_search_index
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_period_snapshots'
+down_revision = 'add_search_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled with `python -m tenants_manager.utils.periods backfill`
+    op.create_table(
+        'closed_periods',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('closed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('month')
+    )
+    op.create_table(
+        'balance_snapshots',
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('opening_balance', sa.Float(), nullable=False),
+        sa.Column('charges', sa.Float(), nullable=False),
+        sa.Column('payments', sa.Float(), nullable=False),
+        sa.Column('closing_balance', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('tenant_id', 'month')
+    )
+    op.create_index(
+        'ix_balance_snapshots_month', 'balance_snapshots', ['month'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_balance_snapshots_month', table_name='balance_snapshots')
+    op.drop_table('balance_snapshots')
+    op.drop_table('closed_periods')
@@ -0,0 +1,110 @@
+"""Add full-text search indexes for tenants and payments
+
+Revision ID: add_search_index
+Revises: add_tenant_name_index
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_index'
+down_revision = 'add_tenant_name_index'
+branch_labels = None
+depends_on = None
+
+TENANT_VALUES = (
+    "new.id, new.name, new.bi, new.email, new.phone, new.address, "
+    "(SELECT name FROM rooms WHERE id = new.room_id)"
+)
+
+
+def upgrade():
+    # FTS5 indexes keyed by tenant / payment id (rowid)
+    op.execute("""
+        CREATE VIRTUAL TABLE tenants_fts USING fts5(
+            name, bi, email, phone, address, room_name,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        INSERT INTO tenants_fts (tenants_fts, rank)
+        VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 1.0, 1.0, 2.0)')
+    """)
+    op.execute("""
+        CREATE VIRTUAL TABLE payments_fts USING fts5(
+            description, tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+
+    # Index existing rows
+    op.execute("""
+        INSERT INTO tenants_fts (rowid, name, bi, email, phone, address, room_name)
+        SELECT tenants.id, tenants.name, tenants.bi, tenants.email, tenants.phone,
+               tenants.address, rooms.name
+        FROM tenants LEFT JOIN rooms ON rooms.id = tenants.room_id
+    """)
+    op.execute("""
+        INSERT INTO payments_fts (rowid, description)
+        SELECT id, description FROM payments
+    """)
+
+    # Keep the indexes in sync with the source tables
+    op.execute(f"""
+        CREATE TRIGGER tenants_fts_insert AFTER INSERT ON tenants BEGIN
+            INSERT INTO tenants_fts (rowid, name, bi, email, phone, address, room_name)
+            VALUES ({TENANT_VALUES});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER tenants_fts_update
+        AFTER UPDATE OF id, name, bi, email, phone, address, room_id ON tenants BEGIN
+            DELETE FROM tenants_fts WHERE rowid = old.id;
+            INSERT INTO tenants_fts (rowid, name, bi, email, phone, address, room_name)
+            VALUES ({TENANT_VALUES});
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER tenants_fts_delete AFTER DELETE ON tenants BEGIN
+            DELETE FROM tenants_fts WHERE rowid = old.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER rooms_fts_update AFTER UPDATE OF name ON rooms BEGIN
+            UPDATE tenants_fts SET room_name = new.name
+            WHERE rowid IN (SELECT id FROM tenants WHERE room_id = new.id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER payments_fts_insert AFTER INSERT ON payments BEGIN
+            INSERT INTO payments_fts (rowid, description) VALUES (new.id, new.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER payments_fts_update
+        AFTER UPDATE OF id, description ON payments BEGIN
+            DELETE FROM payments_fts WHERE rowid = old.id;
+            INSERT INTO payments_fts (rowid, description) VALUES (new.id, new.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER payments_fts_delete AFTER DELETE ON payments BEGIN
+            DELETE FROM payments_fts WHERE rowid = old.id;
+        END
+    """)
+
+
+def downgrade():
+    for trigger in (
+        'payments_fts_delete',
+        'payments_fts_update',
+        'payments_fts_insert',
+        'rooms_fts_update',
+        'tenants_fts_delete',
+        'tenants_fts_update',
+        'tenants_fts_insert',
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS payments_fts")
+    op.execute("DROP TABLE IF EXISTS tenants_fts")
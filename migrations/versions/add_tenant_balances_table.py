@@ -0,0 +1,37 @@
+"""Add tenant_balances ledger table
+
+Revision ID: add_tenant_balances
+Revises: make_room_id_non_nullable
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_tenant_balances'
+down_revision = 'make_room_id_non_nullable'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Materialized balance per tenant; filled lazily or with
+    # `python -m tenants_manager.utils.ledger rebuild`
+    op.create_table(
+        'tenant_balances',
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('rent_due', sa.Float(), nullable=False),
+        sa.Column('total_paid', sa.Float(), nullable=False),
+        sa.Column('balance', sa.Float(), nullable=False),
+        sa.Column('computed_on', sa.Date(), nullable=False),
+        sa.Column('valid_until', sa.Date(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), server_default='1', nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('tenant_id')
+    )
+
+
+def downgrade():
+    op.drop_table('tenant_balances')
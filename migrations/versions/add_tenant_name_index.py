@@ -0,0 +1,24 @@
+"""Add (name, id) index on tenants
+
+Revision ID: add_tenant_name_index
+Revises: add_payment_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_tenant_name_index'
+down_revision = 'add_payment_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination of the tenant list: ORDER BY name, id with a seek predicate
+    op.create_index('ix_tenants_name_id', 'tenants', ['name', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tenants_name_id', table_name='tenants')
@@ -0,0 +1,112 @@
+"""
+Startup time measurement.
+
+Starts the application in fresh Python processes, the way a user launches
+it, and reports how long each startup phase took: importing the views,
+opening the database, building the main window, showing it and showing the
+first tenants. It's meant to be run directly from the command line:
+
+    python scripts/measure_startup.py [runs]
+
+Set QT_QPA_PLATFORM=offscreen to run it without a display.
+"""
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Give up waiting for the first tenants after this many seconds
+FIRST_ROWS_TIMEOUT = 30
+
+PHASES = [
+    ("imports", "Import views"),
+    ("database", "Open database"),
+    ("window", "Build MainWindow"),
+    ("show", "Show MainWindow"),
+    ("first_rows", "First tenants shown"),
+]
+
+
+def measure_once():
+    """Start the application in this process and return the phase timings"""
+    started = time.perf_counter()
+    timings = {}
+
+    def mark(phase):
+        timings[phase] = time.perf_counter() - started
+
+    sys.path.insert(0, PROJECT_ROOT)
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+
+    app = QApplication(sys.argv[:1])
+    from tenants_manager.views.main_window import MainWindow
+    from tenants_manager.utils.database import get_database_manager
+
+    mark("imports")
+    get_database_manager()
+    mark("database")
+    window = MainWindow()
+    mark("window")
+
+    # The first chunk of tenants is loaded after show(), on a worker thread
+    show_tenants = window.show_tenants
+
+    def first_rows_shown(page):
+        show_tenants(page)
+        mark("first_rows")
+        app.quit()
+
+    window.show_tenants = first_rows_shown
+    window.show()
+    app.processEvents()
+    mark("show")
+
+    QTimer.singleShot(FIRST_ROWS_TIMEOUT * 1000, app.quit)
+    app.exec()
+    window.close()
+    return timings
+
+
+def measure(runs):
+    """Run measure_once in `runs` new processes and collect the timings"""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        # Logging may also write to stdout; the timings are the last line
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    if "--child" in sys.argv:
+        print(json.dumps(measure_once()))
+        return
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = measure(runs)
+    print(f"Startup over {runs} runs (seconds since the process started measuring)")
+    print(f"{'Phase':<22}{'median':>10}{'min':>10}{'max':>10}")
+    for phase, label in PHASES:
+        values = [result[phase] for result in results if phase in result]
+        if not values:
+            print(f"{label:<22}{'timeout':>10}")
+            continue
+        print(
+            f"{label:<22}{statistics.median(values):>10.3f}"
+            f"{min(values):>10.3f}{max(values):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
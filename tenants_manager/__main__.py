@@ -1,4 +1,21 @@
-from .main import main
+import sys
+
+
+def main(argv=None):
+    """Entry point: the export subcommand, otherwise the application.
+
+    The GUI is imported only when it is started, so exports do not load Qt.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["export"]:
+        from .utils.export import main as export_main
+
+        return export_main(argv[1:])
+
+    from .main import main as gui_main
+
+    return gui_main()
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
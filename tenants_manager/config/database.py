@@ -1,35 +1,18 @@
 import os
+import re
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
+from sqlalchemy import event
 
 # Base directory
 BASE_DIR = Path(__file__).parent.parent.parent
-LOG_DIR = BASE_DIR / "logs"
-
-# Ensure logs directory exists
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# Set up file logging
-# Configure database logging to be less verbose
-logging.basicConfig(
-    level=logging.WARNING,  # Changed from DEBUG to WARNING
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(
-            LOG_DIR / "database.log", mode="a"
-        ),  # Changed to append mode
-    ],
-)
-logger = logging.getLogger(__name__)
 
-# Also log to console for critical errors
-console = logging.StreamHandler()
-console.setLevel(logging.ERROR)
-formatter = logging.Formatter("%(name)-12s: %(levelname)-8s %(message)s")
-console.setFormatter(formatter)
-logging.getLogger("").addHandler(console)
+# Logging is configured by the application (tenants_manager.main) or by the
+# script importing this module, not here
+logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 try:
@@ -39,8 +22,6 @@ except Exception as e:
     logging.error(f"Error loading .env file: {e}")
     raise
 
-# Base directory
-BASE_DIR = Path(__file__).parent.parent.parent
 logger.info(f"Base directory: {BASE_DIR}")
 
 # Database environment (dev, test, prod)
@@ -54,9 +35,53 @@ DB_PATHS = {
     "prod": BASE_DIR / "data" / "prod" / "tenants.db",
 }
 
+# SQLite pragmas run on every new connection, per environment. WAL lets the
+# background loaders read while the GUI writes, and with WAL synchronous=NORMAL
+# only risks the last transactions on power loss, never corruption. Negative
+# cache_size is in KiB. Any value can be overridden with SQLITE_<NAME>, e.g.
+# SQLITE_CACHE_SIZE=-65536.
+SQLITE_PRAGMAS = {
+    "dev": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,  # 16 MiB
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    "test": {
+        "journal_mode": "WAL",
+        # Test databases are disposable, skip fsync entirely
+        "synchronous": "OFF",
+        "cache_size": -8192,  # 8 MiB
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    "prod": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,  # 64 MiB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+# Pragmas apply_sqlite_pragmas accepts; values are interpolated into the
+# statement, so they must be plain words or (negative) numbers
+SQLITE_PRAGMA_NAMES = frozenset(
+    name for pragmas in SQLITE_PRAGMAS.values() for name in pragmas
+)
+SQLITE_PRAGMA_VALUE = re.compile(r"^[A-Za-z0-9_-]+$")
+
 
+@lru_cache(maxsize=None)
 def get_database_url() -> str:
-    """Get the database URL based on the current environment."""
+    """Get the database URL based on the current environment.
+
+    Computed once per process; DB_ENV is read at import time.
+    """
     try:
         # Get the path for the current environment
         db_path = DB_PATHS.get(DB_ENV, DB_PATHS["dev"])
@@ -101,3 +126,54 @@ def get_migrations_dir() -> Path:
     except Exception as e:
         logger.exception("Error getting migrations directory:")
         raise
+
+
+def get_sqlite_pragmas(env: str = None) -> dict:
+    """Get the SQLite pragmas for an environment (default: DB_ENV).
+
+    SQLITE_<NAME> environment variables override single values.
+    """
+    env = (env or DB_ENV).lower()
+    pragmas = dict(SQLITE_PRAGMAS.get(env, SQLITE_PRAGMAS["dev"]))
+    for name in pragmas:
+        override = os.getenv(f"SQLITE_{name.upper()}")
+        if override:
+            pragmas[name] = override
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine, pragmas: dict = None) -> None:
+    """Set the pragmas on every connection the engine opens.
+
+    Does nothing for other databases. In-memory databases report
+    journal_mode=memory instead of WAL, which is harmless. Unknown pragma
+    names and values that are not a single word or number (e.g. from a
+    SQLITE_<NAME> variable) are logged and skipped.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if pragmas is None:
+        pragmas = get_sqlite_pragmas()
+
+    valid = {}
+    for name, value in pragmas.items():
+        if name not in SQLITE_PRAGMA_NAMES:
+            logger.warning(f"Skipping unknown SQLite pragma {name!r}")
+        elif not SQLITE_PRAGMA_VALUE.match(str(value)):
+            logger.warning(f"Skipping SQLite pragma {name} with invalid value {value!r}")
+        else:
+            valid[name] = value
+    pragmas = valid
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite pragmas: {pragmas}")
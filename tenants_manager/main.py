@@ -103,6 +103,10 @@ def configure_logging():
 # Initialize logging
 logger = configure_logging()
 
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
 
 def main():
     """Main function to run the application."""
@@ -134,7 +138,11 @@ def main():
         else:
             logger.info("Using existing QApplication instance")
 
-        # Create and show main window
+        # The views pull in the models, SQLAlchemy and the database layer;
+        # import them only once the application exists
+        from tenants_manager.views.main_window import MainWindow
+
+        # Create and show main window. The window loads its data once shown.
         logger.info("Creating MainWindow...")
         window = MainWindow()
         logger.info("MainWindow created successfully")
@@ -171,20 +179,6 @@ def main():
         return 1
 
 
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(project_root)
-
-# Import MainWindow after setting up the path
-try:
-    from tenants_manager.views.main_window import MainWindow
-
-    logger.info("Successfully imported MainWindow")
-except ImportError as e:
-    logger.error(f"Failed to import MainWindow: {e}")
-    raise
-
-
 def show_error_dialog(message, details=None):
     """Show an error dialog with optional details"""
     try:
@@ -9,11 +9,14 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Enum,
+    Index,
     func,
+    select,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum as PyEnum
 
 # Configure logger for this module
@@ -69,6 +72,17 @@ class Payment(Base):
     # Relationship with tenant
     tenant = relationship("Tenant", back_populates="payments")
 
+    __table_args__ = (
+        Index("ix_payments_tenant_id_reference_month", "tenant_id", "reference_month"),
+        Index(
+            "ix_payments_type_status_reference_month",
+            "payment_type",
+            "status",
+            "reference_month",
+        ),
+        Index("ix_payments_tenant_id_payment_date", "tenant_id", "payment_date"),
+    )
+
 
 class RentHistory(Base):
     __tablename__ = "rent_history"
@@ -103,12 +117,22 @@ class Room(Base):
     def __repr__(self):
         return f"<Room(id={self.id}, name='{self.name}', capacity={self.capacity})>"
     
-    @property
+    @hybrid_property
     def current_occupancy(self):
         """Return the current number of active tenants in the room"""
         return len([t for t in self.tenants if t.is_active])
-    
-    @property
+
+    @current_occupancy.expression
+    def current_occupancy(cls):
+        # Correlated count, so queries on Room never load the tenants
+        return (
+            select(func.count(Tenant.id))
+            .where(Tenant.room_id == cls.id, Tenant.is_active == True)
+            .correlate_except(Tenant)
+            .scalar_subquery()
+        )
+
+    @hybrid_property
     def is_full(self):
         """Check if the room has reached its capacity"""
         return self.current_occupancy >= self.capacity
@@ -132,6 +156,9 @@ class Tenant(Base):
     is_active = Column(Boolean, default=True, nullable=False, server_default="1")
     deleted_at = Column(DateTime, nullable=True)
 
+    # Keyset pagination of the tenant list seeks on (name, id)
+    __table_args__ = (Index("ix_tenants_name_id", "name", "id"),)
+
     # Relationships
     room_ref = relationship("Room", back_populates="tenants", foreign_keys=[room_id])
     contracts = relationship("Contract", back_populates="tenant")
@@ -163,10 +190,9 @@ class Tenant(Base):
     def update_rent(self, new_amount, changed_by=None, session=None):
         """Update the rent amount and create a historical record"""
         if session is None:
-            from ..utils.database import DatabaseManager
+            from ..utils.database import get_database_manager
 
-            db = DatabaseManager()
-            session = db.get_session()
+            session = get_database_manager().get_session()
 
         try:
             # Close the current rent history record if it exists
@@ -193,6 +219,12 @@ class Tenant(Base):
             self.rent = new_amount
 
             session.add(new_rent_history)
+            session.flush()
+
+            # Rent changes affect every month, so recompute the stored balance
+            from ..utils.ledger import refresh_balances
+
+            refresh_balances(session, [self.id])
             session.commit()
             return True
 
@@ -212,9 +244,8 @@ class Tenant(Base):
         if isinstance(as_of_date, datetime):
             as_of_date = as_of_date.date()
 
-        # Get all rent periods up to as_of_date
-        rent_periods = self._get_rent_periods(as_of_date)
-        total_rent_due = sum(period["amount"] for period in rent_periods)
+        # Get the total rent due up to as_of_date
+        total_rent_due = self.get_rent_due(as_of_date)
 
         # Get all payments up to as_of_date
         total_payments = sum(
@@ -231,65 +262,187 @@ class Tenant(Base):
 
         return total_rent_due - total_payments
 
+    def get_rent_due(self, as_of_date=None):
+        """Get the total rent due up to the given date.
+
+        Each rent history interval contributes (number of rent dates in the
+        interval) x amount, so the cost depends on the number of history
+        records rather than on the number of months since entry_date.
+        """
+        as_of_date = _to_date(as_of_date or datetime.utcnow())
+        entry_date = _to_date(self.entry_date)
+
+        total = 0.0
+        covered = 0
+        for start, end, amount in self._get_rent_segments():
+            months = _count_rent_dates(entry_date, as_of_date, start, end)
+            total += months * amount
+            covered += months
+
+        # Rent dates not covered by any history record use the current rent
+        uncovered = _count_rent_dates(entry_date, as_of_date) - covered
+        return total + uncovered * self.rent
+
+    def _get_rent_segments(self):
+        """Get disjoint (start, end, amount) intervals from the rent history.
+
+        Where history records overlap, the record with the earliest valid_from
+        wins. end is None for an open-ended interval.
+        """
+        return rent_segments(self.rent_history)
+
+    def _iter_rent_periods(self, as_of_date=None):
+        """Yield rent periods ({"date", "amount"}) one month at a time up to the given date"""
+        as_of_date = _to_date(as_of_date or datetime.utcnow())
+        for charge_date, amount in iter_rent_charges(
+            self.entry_date, self.rent, self._get_rent_segments(), None, as_of_date
+        ):
+            yield {"date": charge_date, "amount": amount}
+
     def _get_rent_periods(self, as_of_date=None):
         """Get all rent periods with their amounts up to the given date"""
-        if as_of_date is None:
-            as_of_date = datetime.utcnow()
+        return list(self._iter_rent_periods(as_of_date))
 
-        # Convert as_of_date to date if it's a datetime
-        if isinstance(as_of_date, datetime):
-            as_of_date = as_of_date.date()
 
-        # Get all rent history records in chronological order
-        history = sorted(self.rent_history, key=lambda x: x.valid_from)
+def _to_date(value):
+    """Convert a datetime to a date, leaving dates untouched"""
+    return value.date() if isinstance(value, datetime) else value
 
-        periods = []
-        current_date = self.entry_date
 
-        while current_date <= as_of_date:
-            # Find the applicable rent for the current date
-            applicable_rent = self.rent  # Default to current rent
+def rent_segments(history):
+    """Disjoint (start, end, amount) intervals from rent history records.
 
-            current_date_date = (
-                current_date.date()
-                if isinstance(current_date, datetime)
-                else current_date
-            )
+    history is any iterable of objects with valid_from, valid_to and amount
+    (RentHistory instances or query rows). Where records overlap, the record
+    with the earliest valid_from wins. end is None for an open-ended interval.
+    """
+    # Get all rent history records in chronological order
+    history = sorted(history, key=lambda x: x.valid_from)
 
-            for record in history:
-                valid_from = (
-                    record.valid_from.date()
-                    if isinstance(record.valid_from, datetime)
-                    else record.valid_from
-                )
-                valid_to = (
-                    record.valid_to.date()
-                    if record.valid_to and isinstance(record.valid_to, datetime)
-                    else record.valid_to
-                )
+    segments = []
+    covered_to = None  # Last date covered by an earlier record
+    for record in history:
+        valid_from = _to_date(record.valid_from)
+        valid_to = _to_date(record.valid_to) if record.valid_to else None
 
-                if valid_from <= current_date_date and (
-                    valid_to is None or valid_to >= current_date_date
-                ):
-                    applicable_rent = record.amount
-                    break
+        if covered_to is None or covered_to < valid_from:
+            start = valid_from
+        else:
+            start = covered_to + timedelta(days=1)
 
-            # Add to periods
-            periods.append({"date": current_date_date, "amount": applicable_rent})
+        if valid_to is None or valid_to >= start:
+            segments.append((start, valid_to, record.amount))
 
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(
-                    year=current_date.year + 1, month=1, day=1
-                )
-            else:
-                current_date = current_date.replace(month=current_date.month + 1, day=1)
+        if valid_to is None:
+            # An open-ended record covers everything after it
+            break
+        if covered_to is None or valid_to > covered_to:
+            covered_to = valid_to
+
+    return segments
+
+
+def iter_rent_charges(entry_date, rent, segments, start_date, end_date):
+    """Yield (date, amount) for every rent date between start_date and end_date.
+
+    Rent is charged on entry_date and then on the first day of every
+    following month. Amounts come from segments (see rent_segments); dates
+    no segment covers are billed at rent. Dates before start_date are
+    skipped without being generated; start_date None means entry_date.
+    """
+    entry_date = _to_date(entry_date)
+    end_date = _to_date(end_date)
+    current_date = max(entry_date, _to_date(start_date) or entry_date)
+    if current_date != entry_date and current_date.day != 1:
+        current_date = _next_month(current_date)
+
+    segments = iter(segments)
+    segment = next(segments, None)
+    while current_date <= end_date:
+        # Skip segments that ended before the current date
+        while segment and segment[1] is not None and segment[1] < current_date:
+            segment = next(segments, None)
+
+        if segment and segment[0] <= current_date:
+            yield current_date, segment[2]
+        else:
+            yield current_date, rent  # Default to current rent
 
-            # Ensure current_date is a date object for the next iteration
-            if isinstance(current_date, datetime):
-                current_date = current_date.date()
+        current_date = _next_month(current_date)
+
+
+def _next_month(value):
+    """First day of the month after value"""
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1, day=1)
+    return value.replace(month=value.month + 1, day=1)
+
+
+def _count_rent_dates(entry_date, as_of_date, start=None, end=None):
+    """Count the rent dates between start and end (inclusive).
+
+    Rent is charged on entry_date and then on the first day of every
+    following month, up to as_of_date.
+    """
+    start = max(start, entry_date) if start else entry_date
+    end = min(end, as_of_date) if end else as_of_date
+    if start > end:
+        return 0
+
+    count = 1 if start == entry_date else 0
+    # First days of month after the entry month that fall within [start, end]
+    first_month = start.year * 12 + start.month + (0 if start.day == 1 else 1)
+    first_month = max(first_month, entry_date.year * 12 + entry_date.month + 1)
+    last_month = end.year * 12 + end.month
+    return count + max(0, last_month - first_month + 1)
+
+
+class TenantBalance(Base):
+    """Materialized balance per tenant, maintained by utils.ledger"""
+
+    __tablename__ = "tenant_balances"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), primary_key=True)
+    rent_due = Column(Float, nullable=False, default=0.0)
+    total_paid = Column(Float, nullable=False, default=0.0)
+    balance = Column(Float, nullable=False, default=0.0)
+    computed_on = Column(
+        Date, nullable=False
+    )  # Date the totals were computed for
+    valid_until = Column(
+        Date, nullable=False
+    )  # Last date before the next rent charge or future-dated payment
+    is_active = Column(Boolean, default=True, nullable=False, server_default="1")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def is_valid_for(self, as_of_date):
+        """Check if the stored balance is still the balance on as_of_date"""
+        return self.computed_on <= as_of_date <= self.valid_until
+
+
+class ClosedPeriod(Base):
+    """A month whose balances are closed, see utils.periods"""
+
+    __tablename__ = "closed_periods"
+
+    month = Column(Date, primary_key=True)  # First day of the month
+    closed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class BalanceSnapshot(Base):
+    """Balance movements of a tenant in a closed month, written by utils.periods"""
+
+    __tablename__ = "balance_snapshots"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    opening_balance = Column(Float, nullable=False)  # Balance the day before
+    charges = Column(Float, nullable=False)  # Rent charged in the month
+    payments = Column(Float, nullable=False)  # Completed payments in the month
+    closing_balance = Column(Float, nullable=False)  # Balance on the last day
+    created_at = Column(DateTime, default=datetime.utcnow)
 
-        return periods
+    __table_args__ = (Index("ix_balance_snapshots_month", "month"),)
 
 
 class Contract(Base):
@@ -0,0 +1,177 @@
+import logging
+from collections import namedtuple
+from datetime import timedelta
+from sqlalchemy import text
+
+from ..models.tenant import PaymentStatus
+from .balances import (
+    RENT_CTES,
+    _with_tenant_filter,
+    format_rent_sql,
+    month_index,
+    to_date,
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Days since the rent was charged, one per days_* field
+BUCKETS = ("0-30", "31-60", "61-90", "90+")
+
+AgingRow = namedtuple(
+    "AgingRow",
+    "tenant_id name room_id room balance days_0_30 days_31_60 days_61_90 "
+    "days_over_90",
+)
+RoomAging = namedtuple(
+    "RoomAging",
+    "room_id room tenants in_arrears balance days_0_30 days_31_60 days_61_90 "
+    "days_over_90",
+)
+AgingReport = namedtuple("AgingReport", "as_of_date tenants rooms total")
+
+# Payments settle the oldest charges first, so what a tenant owes is the
+# newest charges adding up to the balance. Only the charges of the last four
+# months can be 90 days old or less: those are priced from rent_history (see
+# RENT_CTES) and the balance is spread over them newest first with a running
+# total; whatever is left is older than 90 days.
+AGING_SQL = (
+    "WITH"
+    + RENT_CTES
+    + """,
+paid AS (
+    SELECT p.tenant_id, SUM(p.amount) AS paid
+    FROM payments p
+    WHERE p.status = :completed AND p.payment_date < :paid_before
+    GROUP BY p.tenant_id
+),
+balances AS (
+    SELECT
+        d.id AS tenant_id,
+        d.covered_amount
+            + MAX(0, d.total_months - d.covered_months) * COALESCE(d.rent, 0.0)
+            - COALESCE(p.paid, 0.0) AS balance
+    FROM rent_due d
+    LEFT JOIN paid p ON p.tenant_id = d.id
+),
+recent(months_back) AS (VALUES (0), (1), (2), (3)),
+charges AS (
+    SELECT
+        t.id AS tenant_id,
+        t.rent,
+        MAX(
+            date(:as_of, 'start of month', '-' || r.months_back || ' months'),
+            t.entry_date
+        ) AS charge_date
+    FROM tenants t
+    JOIN recent r
+    WHERE t.entry_date <= :as_of
+      AND date(:as_of, 'start of month', '-' || r.months_back || ' months')
+          >= date(t.entry_date, 'start of month')
+),
+priced AS (
+    SELECT
+        c.tenant_id,
+        c.charge_date,
+        COALESCE(s.amount, c.rent, 0.0) AS amount
+    FROM charges c
+    LEFT JOIN segments s
+        ON s.tenant_id = c.tenant_id
+        AND c.charge_date BETWEEN s.seg_from AND s.seg_to
+),
+owed AS (
+    SELECT
+        p.tenant_id,
+        julianday(:as_of) - julianday(p.charge_date) AS age,
+        MAX(
+            0.0,
+            MIN(p.amount, b.balance - (SUM(p.amount) OVER newer - p.amount))
+        ) AS amount,
+        SUM(p.amount) OVER (PARTITION BY p.tenant_id) AS recent_total
+    FROM priced p
+    JOIN balances b ON b.tenant_id = p.tenant_id
+    WINDOW newer AS (PARTITION BY p.tenant_id ORDER BY p.charge_date DESC)
+)
+SELECT
+    t.id,
+    t.name,
+    t.room_id,
+    r.name,
+    b.balance,
+    COALESCE(SUM(CASE WHEN o.age <= 30 THEN o.amount END), 0.0),
+    COALESCE(SUM(CASE WHEN o.age > 30 AND o.age <= 60 THEN o.amount END), 0.0),
+    COALESCE(SUM(CASE WHEN o.age > 60 AND o.age <= 90 THEN o.amount END), 0.0),
+    COALESCE(SUM(CASE WHEN o.age > 90 THEN o.amount END), 0.0)
+        + MAX(0.0, b.balance - COALESCE(MAX(o.recent_total), 0.0))
+FROM balances b
+JOIN tenants t ON t.id = b.tenant_id
+LEFT JOIN rooms r ON r.id = t.room_id
+LEFT JOIN owed o ON o.tenant_id = b.tenant_id
+{active_filter}
+GROUP BY t.id, t.name, t.room_id, r.name, b.balance
+ORDER BY t.name, t.id
+"""
+)
+
+
+def get_aging_rows(session, as_of_date=None, tenant_ids=None, include_deleted=False):
+    """Outstanding rent of every tenant by how long ago it was charged.
+
+    Runs a single query; the buckets add up to the balance when it is
+    positive and are all zero for tenants in credit.
+
+    Returns:
+        list: AgingRow per tenant, ordered by name
+    """
+    as_of_date = to_date(as_of_date)
+    if tenant_ids is not None:
+        tenant_ids = list(tenant_ids)
+        if not tenant_ids:
+            return []
+
+    sql = format_rent_sql(
+        AGING_SQL,
+        tenant_ids,
+        active_filter="" if include_deleted else "WHERE t.is_active = 1",
+    )
+    params = {
+        "as_of": as_of_date.isoformat(),
+        "as_of_month": month_index(as_of_date),
+        "completed": PaymentStatus.COMPLETED.name,
+        # Half-open upper bound so the whole as_of_date day is included
+        "paid_before": (as_of_date + timedelta(days=1)).isoformat(),
+    }
+    query = _with_tenant_filter(text(sql), params, tenant_ids)
+    return [AgingRow(*row) for row in session.execute(query, params)]
+
+
+def summarize(room_id, room, rows):
+    """RoomAging adding up AgingRows"""
+    amounts = [sum(row[field] for row in rows) for field in range(4, 9)]
+    in_arrears = sum(1 for row in rows if row.balance > 0)
+    return RoomAging(room_id, room, len(rows), in_arrears, *amounts)
+
+
+def summarize_rooms(rows):
+    """Add up AgingRows by room
+
+    Returns:
+        list: RoomAging per room, ordered by name
+    """
+    rooms = {}
+    for row in rows:
+        rooms.setdefault((row.room_id, row.room or ""), []).append(row)
+    summaries = [
+        summarize(room_id, room, room_rows)
+        for (room_id, room), room_rows in rooms.items()
+    ]
+    return sorted(summaries, key=lambda room: (room.room, room.room_id or 0))
+
+
+def get_aging_report(session, as_of_date=None, include_deleted=False):
+    """Aging of every tenant, every room and the whole portfolio"""
+    as_of_date = to_date(as_of_date)
+    rows = get_aging_rows(session, as_of_date, include_deleted=include_deleted)
+    return AgingReport(
+        as_of_date, rows, summarize_rooms(rows), summarize(None, None, rows)
+    )
@@ -0,0 +1,153 @@
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+
+from ..models.tenant import Tenant
+from . import ledger
+from .balances import to_date
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# A cached balance and the dates it holds for
+CachedBalance = namedtuple("CachedBalance", "balance valid_from valid_until")
+
+# Tenant columns the balance is computed from
+BALANCE_COLUMNS = ("rent", "entry_date")
+
+# The cache grows to hold this many reads of its largest read, e.g. all
+# tenants this month and in the month shown before
+READS_KEPT = 2
+
+
+class BalanceCache:
+    """In-memory LRU of tenant balances, in front of the balance ledger.
+
+    Entries are keyed by (tenant_id, as_of_month) and remember the dates
+    their balance holds for, so a lookup for any day of the month is exact:
+    outside that range it counts as a miss. Misses are read from the
+    tenant_balances ledger, the persisted tier, which recomputes and stores
+    what it does not have.
+
+    maxsize is a floor: a read of more tenants than it holds grows the
+    cache to hold READS_KEPT such reads, otherwise each all-tenant read would evict what
+    the previous one stored and never hit.
+
+    Committed changes invalidate the entries of the tenants they affect,
+    see on_changes. Changes made through another DatabaseManager or process
+    are not seen; call invalidate() after those.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # Bumped per tenant on invalidation; a lookup that started before
+        # does not store what it read, as it may predate the change
+        self._versions = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_balances(self, session, tenant_ids=None, as_of_date=None, active_only=False):
+        """Balances of tenants (all if None) as of a date, like ledger.get_balances
+
+        The caller should commit the session, the ledger may write to it.
+
+        Returns:
+            dict: {tenant_id: balance}
+        """
+        as_of_date = to_date(as_of_date)
+        month = as_of_date.replace(day=1)
+        if active_only:
+            tenant_ids = ledger.active_tenant_ids(session, tenant_ids)
+        elif tenant_ids is None:
+            tenant_ids = [tenant_id for (tenant_id,) in session.query(Tenant.id).all()]
+        else:
+            tenant_ids = list(tenant_ids)
+
+        balances, missing = {}, []
+        with self._lock:
+            if len(tenant_ids) > self.maxsize:
+                self.maxsize = len(tenant_ids) * READS_KEPT
+            for tenant_id in tenant_ids:
+                key = (tenant_id, month)
+                entry = self._entries.get(key)
+                if entry and entry.valid_from <= as_of_date <= entry.valid_until:
+                    self._entries.move_to_end(key)
+                    balances[tenant_id] = entry.balance
+                else:
+                    missing.append(tenant_id)
+            self.hits += len(balances)
+            self.misses += len(missing)
+            generation = self._generation
+            versions = [self._versions.get(tenant_id, 0) for tenant_id in missing]
+
+        if not missing:
+            return balances
+
+        entries = ledger.get_entries(session, missing, as_of_date)
+        with self._lock:
+            if generation == self._generation:
+                for tenant_id, version in zip(missing, versions):
+                    if tenant_id in entries and version == self._versions.get(
+                        tenant_id, 0
+                    ):
+                        self._entries[(tenant_id, month)] = CachedBalance(
+                            *entries[tenant_id]
+                        )
+                        self._entries.move_to_end((tenant_id, month))
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        balances.update(
+            {tenant_id: entry[0] for tenant_id, entry in entries.items()}
+        )
+        return balances
+
+    def invalidate(self, tenant_ids=None):
+        """Drop the entries of these tenants, or every entry"""
+        with self._lock:
+            if tenant_ids is None:
+                self._entries.clear()
+                self._versions.clear()
+                self._generation += 1
+                self.invalidations += 1
+                return
+            tenant_ids = set(tenant_ids)
+            for tenant_id in tenant_ids:
+                self._versions[tenant_id] = self._versions.get(tenant_id, 0) + 1
+            for key in [key for key in self._entries if key[0] in tenant_ids]:
+                del self._entries[key]
+            self.invalidations += len(tenant_ids)
+
+    def on_changes(self, changes):
+        """EventBus subscriber: invalidate the tenants a ChangeSet affects
+
+        Payments and rent history rows affect the tenants they belong to,
+        tenants themselves only when their rent or entry date changed (or
+        they were deleted).
+        """
+        tenant_ids = (
+            changes.referenced_by("payments", "tenants")
+            | changes.referenced_by("rent_history", "tenants")
+            | changes.updated_columns("tenants", *BALANCE_COLUMNS)
+            | frozenset(changes.deleted.get("tenants", ()))
+        )
+        if tenant_ids:
+            logger.debug(f"Invalidating cached balances of {len(tenant_ids)} tenants")
+            self.invalidate(tenant_ids)
+
+    def stats(self):
+        """Hit and miss counters and the number of cached entries"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
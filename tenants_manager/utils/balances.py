@@ -0,0 +1,216 @@
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import text, bindparam
+
+from ..models.tenant import PaymentStatus
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Rent is charged once on the tenant's entry date and then on the first day of
+# every following month (see Tenant._get_rent_periods). For every rent_history
+# row we work out the part of its validity interval that is not already
+# covered by an earlier row (earlier rows win, like the first match in the
+# Python loop), count the charge dates falling inside it and multiply by the
+# amount. Charge dates not covered by any row are billed at tenants.rent.
+# The CTEs end with rent_due, one row per tenant; queries built on them (see
+# utils.aging) fill the placeholders with format_rent_sql.
+RENT_CTES = """
+ordered AS (
+    SELECT
+        rh.tenant_id,
+        rh.amount,
+        date(rh.valid_from) AS valid_from,
+        date(rh.valid_to) AS valid_to,
+        MAX(COALESCE(date(rh.valid_to), '9999-12-31')) OVER (
+            PARTITION BY rh.tenant_id
+            ORDER BY rh.valid_from, rh.id
+            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+        ) AS covered_to
+    FROM rent_history rh
+    {history_filter}
+),
+segments AS (
+    SELECT
+        o.tenant_id,
+        o.amount,
+        t.entry_date,
+        MAX(
+            CASE
+                WHEN o.covered_to IS NULL OR o.covered_to < o.valid_from
+                    THEN o.valid_from
+                ELSE date(o.covered_to, '+1 day')
+            END,
+            t.entry_date
+        ) AS seg_from,
+        MIN(COALESCE(o.valid_to, :as_of), :as_of) AS seg_to
+    FROM ordered o
+    JOIN tenants t ON t.id = o.tenant_id
+    WHERE o.covered_to IS NULL OR o.covered_to < '9999-12-31'
+),
+counted AS (
+    SELECT
+        tenant_id,
+        amount,
+        CASE
+            WHEN seg_from IS NULL OR seg_from > seg_to THEN 0
+            ELSE
+                (CASE WHEN entry_date BETWEEN seg_from AND seg_to THEN 1 ELSE 0 END)
+                + MAX(
+                    0,
+                    {seg_to_month}
+                    - MAX(
+                        {seg_from_month}
+                        + (CASE WHEN strftime('%d', seg_from) = '01' THEN 0 ELSE 1 END),
+                        {entry_month} + 1
+                    )
+                    + 1
+                )
+        END AS months
+    FROM segments
+),
+rent_due AS (
+    SELECT
+        t.id,
+        t.rent,
+        CASE
+            WHEN t.entry_date > :as_of THEN 0
+            ELSE :as_of_month - {tenant_entry_month} + 1
+        END AS total_months,
+        COALESCE(SUM(c.months), 0) AS covered_months,
+        COALESCE(SUM(c.months * c.amount), 0.0) AS covered_amount
+    FROM tenants t
+    LEFT JOIN counted c ON c.tenant_id = t.id
+    {tenant_filter}
+    GROUP BY t.id, t.rent, t.entry_date
+)
+"""
+
+RENT_DUE_SQL = (
+    "WITH"
+    + RENT_CTES
+    + """
+SELECT id, rent, total_months, covered_months, covered_amount FROM rent_due
+"""
+)
+
+PAYMENTS_SQL = """
+SELECT p.tenant_id, SUM(p.amount) AS paid
+FROM payments p
+WHERE p.status = :completed
+  AND p.payment_date < :paid_before
+  {payment_filter}
+GROUP BY p.tenant_id
+"""
+
+
+def _month_index_sql(column):
+    """SQL expression turning an ISO date column into year * 12 + month"""
+    return (
+        f"(CAST(strftime('%Y', {column}) AS INTEGER) * 12"
+        f" + CAST(strftime('%m', {column}) AS INTEGER))"
+    )
+
+
+def month_index(value):
+    """Return year * 12 + month for a date, used to count whole months"""
+    return value.year * 12 + value.month
+
+
+def to_date(value=None):
+    """Normalize an optional date/datetime to a date (defaults to today, UTC)"""
+    if value is None:
+        value = datetime.utcnow()
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def month_range(value):
+    """Return the half-open [first day, first day of next month) range of a date's month"""
+    start = to_date(value).replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def month_end(value):
+    """Return the last day of a date's month"""
+    return month_range(value)[1] - timedelta(days=1)
+
+
+def _with_tenant_filter(sql, params, tenant_ids):
+    if tenant_ids is not None:
+        params["tenant_ids"] = list(tenant_ids)
+        sql = sql.bindparams(bindparam("tenant_ids", expanding=True))
+    return sql
+
+
+def format_rent_sql(sql, tenant_ids=None, **fields):
+    """Fill the placeholders of RENT_CTES (and fields) in a query built on it"""
+    return sql.format(
+        history_filter=(
+            "WHERE rh.tenant_id IN :tenant_ids" if tenant_ids is not None else ""
+        ),
+        tenant_filter="WHERE t.id IN :tenant_ids" if tenant_ids is not None else "",
+        seg_to_month=_month_index_sql("seg_to"),
+        seg_from_month=_month_index_sql("seg_from"),
+        entry_month=_month_index_sql("entry_date"),
+        tenant_entry_month=_month_index_sql("t.entry_date"),
+        **fields,
+    )
+
+
+def get_rent_due_totals(session, as_of_date=None, tenant_ids=None):
+    """Return {tenant_id: total rent due up to as_of_date} in a single query.
+
+    Args:
+        session: SQLAlchemy session (or connection) to run the query on
+        as_of_date (date, optional): Cut-off date, defaults to today
+        tenant_ids (iterable, optional): Restrict to these tenants, all if None
+    """
+    as_of_date = to_date(as_of_date)
+    sql = format_rent_sql(RENT_DUE_SQL, tenant_ids)
+    params = {"as_of": as_of_date.isoformat(), "as_of_month": month_index(as_of_date)}
+    query = _with_tenant_filter(text(sql), params, tenant_ids)
+
+    totals = {}
+    for tenant_id, rent, total_months, covered_months, covered_amount in session.execute(
+        query, params
+    ):
+        uncovered = max(0, (total_months or 0) - covered_months)
+        totals[tenant_id] = covered_amount + uncovered * (rent or 0.0)
+    return totals
+
+
+def get_payment_totals(session, as_of_date=None, tenant_ids=None):
+    """Return {tenant_id: completed payments made up to as_of_date} in a single query"""
+    as_of_date = to_date(as_of_date)
+    sql = PAYMENTS_SQL.format(
+        payment_filter=(
+            "AND p.tenant_id IN :tenant_ids" if tenant_ids is not None else ""
+        )
+    )
+    # Half-open upper bound so the whole as_of_date day is included
+    params = {
+        "completed": PaymentStatus.COMPLETED.name,
+        "paid_before": (as_of_date + timedelta(days=1)).isoformat(),
+    }
+    query = _with_tenant_filter(text(sql), params, tenant_ids)
+    return {tenant_id: paid or 0.0 for tenant_id, paid in session.execute(query, params)}
+
+
+def get_balance_components(session, as_of_date=None, tenant_ids=None):
+    """Return {tenant_id: (rent_due, paid)} using two aggregate queries"""
+    if tenant_ids is not None:
+        tenant_ids = list(tenant_ids)
+        if not tenant_ids:
+            return {}
+
+    rent_due = get_rent_due_totals(session, as_of_date, tenant_ids)
+    paid = get_payment_totals(session, as_of_date, tenant_ids)
+    return {
+        tenant_id: (due, paid.get(tenant_id, 0.0))
+        for tenant_id, due in rent_due.items()
+    }
@@ -1,30 +1,105 @@
 import os
 import sys
+import json
+import base64
 import logging
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime, date
-from sqlalchemy import create_engine, func, and_, or_
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, func, and_, or_, case, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, Session, joinedload, selectinload
 from ..models.tenant import (
     Base,
     Tenant,
+    Room,
     EmergencyContact,
     Payment,
     RentHistory,
     PaymentStatus,
     PaymentType,
 )
-from ..config.database import get_database_url, get_migrations_dir
+from ..config.database import (
+    get_database_url,
+    get_migrations_dir,
+    apply_sqlite_pragmas,
+)
+from . import aging, events, export, ledger, periods, schema, search, statements
+from .balance_cache import BalanceCache
+from .balances import month_range, to_date
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Shared managers by database URL, see get_database_manager
+_managers = {}
+_managers_lock = threading.Lock()
+# Databases whose schema was already created or checked in this process,
+# mapped to whether full-text search is available on them
+_verified_schemas = {}
+
+# Plain copy of a room for the views; tenant_count includes removed tenants
+RoomInfo = namedtuple("RoomInfo", "id name capacity tenant_count")
+# A room with its number of active tenants
+RoomOccupancy = namedtuple("RoomOccupancy", "id name capacity occupancy")
+
+
+def _encode_cursor(key, direction):
+    """Opaque page cursor pointing just after (or before) a sort key"""
+    payload = json.dumps([direction, list(key)]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_cursor(cursor):
+    """Return (direction, key) from a cursor made by _encode_cursor"""
+    direction, key = json.loads(base64.urlsafe_b64decode(cursor))
+    if direction not in ("next", "prev"):
+        raise ValueError(f"Invalid cursor direction: {direction}")
+    return direction, key
+
+
+def get_database_manager(db_url=None):
+    """Shared DatabaseManager for a database URL, created on first use.
+
+    Views and models should get their manager here instead of constructing
+    one: the engine, its connection pool and the schema check are then paid
+    once per process and database.
+
+    Args:
+        db_url: Optional database URL. If not provided, uses the URL from config.
+    """
+    url = db_url or get_database_url()
+    with _managers_lock:
+        manager = _managers.get(url)
+        if manager is None:
+            manager = DatabaseManager(url)
+            _managers[url] = manager
+        return manager
+
+
+def _is_memory_database(db_url):
+    """Whether every engine on this URL gets its own empty database"""
+    return make_url(db_url).database in (None, "", ":memory:")
+
+
+def _schema_verified(db_url):
+    """Whether the schema was verified and the database file is still there"""
+    if db_url not in _verified_schemas:
+        return False
+    url = make_url(db_url)
+    return url.get_backend_name() != "sqlite" or os.path.exists(url.database)
+
 
 class DatabaseManager:
-    def __init__(self, db_url=None):
+    def __init__(self, db_url=None, pragmas=None):
         """Initialize the database manager.
 
         Args:
             db_url: Optional database URL. If not provided, uses the URL from config.
+            pragmas: Optional SQLite pragmas for every connection. If not
+                     provided, uses the profile of the current environment;
+                     pass {} to keep SQLite's defaults.
         """
         logger.debug("Initializing DatabaseManager")
         self.db_url = db_url or get_database_url()
@@ -35,12 +110,23 @@ class DatabaseManager:
             # Disable SQL echo in production, can be enabled via environment variable if needed
             echo_sql = os.getenv("SQL_ECHO", "false").lower() == "true"
             self.engine = create_engine(self.db_url, echo=echo_sql)
+            apply_sqlite_pragmas(self.engine, pragmas)
             logger.debug("Engine created successfully")
 
             logger.debug("Creating session maker...")
             self.Session = sessionmaker(bind=self.engine)
             logger.debug("Session maker created successfully")
 
+            # What each commit changed, see utils.events
+            self.changes = events.EventBus()
+            events.watch_sessions(self.Session, self.changes)
+            # Edits that would change closed months are refused
+            periods.guard_sessions(self.Session)
+
+            # Balances by tenant and month, invalidated by the commits above
+            self.balance_cache = BalanceCache()
+            self.changes.subscribe(self.balance_cache.on_changes)
+
             # Initialize the database schema if needed
             logger.debug("Initializing database...")
             self.initialize_database()
@@ -52,11 +138,32 @@ class DatabaseManager:
             raise
 
     def initialize_database(self):
-        """Initialize the database by creating all tables."""
+        """Initialize the database by creating all tables.
+
+        Skipped when the schema of this database was already created or
+        checked in this process. A database stamped with the head Alembic
+        revisions is trusted without running create_all; one created here
+        from the models is stamped so later starts can skip it too.
+        """
+        if _schema_verified(self.db_url):
+            logger.debug("Database schema already verified")
+            self.search_enabled = _verified_schemas[self.db_url]
+            return
+
+        if schema.is_schema_current(self.engine):
+            logger.debug("Database schema is at the head revision")
+            self.search_enabled = search.has_search_index(self.engine)
+            _verified_schemas[self.db_url] = self.search_enabled
+            return
+
         logger.debug("Creating database tables...")
         try:
             Base.metadata.create_all(self.engine)
             logger.debug("Database tables created successfully")
+            self.search_enabled = search.ensure_search_index(self.engine)
+            if not _is_memory_database(self.db_url):
+                schema.stamp_head(self.engine, Base.metadata)
+                _verified_schemas[self.db_url] = self.search_enabled
 
             # Verify the database file was created
             if "sqlite" in self.db_url:
@@ -90,16 +197,11 @@ class DatabaseManager:
 
         with self.Session() as session:
             try:
-                if include_deleted:
-                    query = session.query(func.count(Tenant.id))
-                else:
-                    query = session.query(func.count(Tenant.id)).filter(
-                        Tenant.is_active == True
-                    )
-
-                if search_term and search_term.strip():
-                    search = f"%{search_term}%"
-                    query = query.filter(Tenant.name.ilike(search))
+                query, _ = self._filter_tenants(
+                    session.query(func.count(Tenant.id)).select_from(Tenant),
+                    search_term,
+                    include_deleted,
+                )
 
                 count = query.scalar() or 0
                 logger.debug(f"Found {count} tenants matching criteria")
@@ -113,29 +215,46 @@ class DatabaseManager:
                 return 0
 
     def get_tenants_paginated(
-        self, offset=0, limit=20, search_term=None, include_deleted=False
+        self,
+        offset=0,
+        limit=20,
+        search_term=None,
+        include_deleted=False,
+        with_balances=False,
+        as_of_date=None,
     ):
-        """Get a paginated list of tenants"""
+        """Get a paginated list of tenants
+
+        Args:
+            offset: Number of tenants to skip
+            limit: Maximum number of tenants to return
+            search_term: Optional search term to filter tenants by name
+            include_deleted: If True, include soft-deleted tenants
+            with_balances: If True, set a ``balance`` attribute on every tenant,
+                fetched for the whole page in one batch
+            as_of_date: Date for the balances, defaults to today
+        """
         logger.debug(
             f"Getting paginated tenants: offset={offset}, limit={limit}, search_term='{search_term}', include_deleted={include_deleted}"
         )
 
-        with self.Session() as session:
+        # Keep the returned tenants loaded when the ledger write is committed
+        with self.Session(expire_on_commit=False) as session:
             try:
-                from sqlalchemy.orm import joinedload
-                
                 query = session.query(Tenant).options(joinedload(Tenant.room_ref))
-                
-                if not include_deleted:
-                    query = query.filter(Tenant.is_active == True)
+                query, rank = self._filter_tenants(query, search_term, include_deleted)
 
-                if search_term and search_term.strip():
-                    search = f"%{search_term}%"
-                    query = query.filter(Tenant.name.ilike(search))
-
-                tenants = query.order_by(Tenant.name).offset(offset).limit(limit).all()
+                # Best search matches first
+                if rank is not None:
+                    query = query.order_by(rank)
+                tenants = (
+                    query.order_by(Tenant.name, Tenant.id).offset(offset).limit(limit).all()
+                )
                 logger.debug(f"Retrieved {len(tenants)} tenants")
 
+                if with_balances:
+                    self._annotate_balances(session, tenants, as_of_date)
+
                 # Print first few tenants for debugging
                 max_print = min(3, len(tenants))
                 for i in range(max_print):
@@ -152,6 +271,172 @@ class DatabaseManager:
                 traceback.print_exc()
                 return []
 
+    def get_tenants_page(
+        self,
+        cursor=None,
+        limit=20,
+        search_term=None,
+        include_deleted=False,
+        with_balances=False,
+        as_of_date=None,
+    ):
+        """Get a page of tenants using keyset pagination on (name, id)
+
+        Unlike get_tenants_paginated, the page is located with a seek on the
+        (name, id) index instead of an OFFSET, so every page costs the same.
+        Search results are ordered by rank first and seek on (rank, name, id).
+
+        Args:
+            cursor: Cursor returned by a previous call, None for the first page
+            limit: Maximum number of tenants to return
+            search_term: Optional search term, see _filter_tenants
+            include_deleted: If True, include soft-deleted tenants
+            with_balances: If True, set a ``balance`` attribute on every tenant
+            as_of_date: Date for the balances, defaults to today
+
+        Returns:
+            tuple: (tenants, next_cursor, prev_cursor), cursors are None when
+                   there is no page in that direction
+        """
+        direction, key = "next", None
+        if cursor:
+            try:
+                direction, key = _decode_cursor(cursor)
+            except Exception as e:
+                logger.warning(f"Ignoring invalid tenant cursor: {str(e)}")
+
+        with self.Session(expire_on_commit=False) as session:
+            try:
+                query = session.query(Tenant).options(joinedload(Tenant.room_ref))
+                query, rank = self._filter_tenants(query, search_term, include_deleted)
+
+                columns = [Tenant.name, Tenant.id]
+                if rank is not None:
+                    columns.insert(0, rank)
+                    query = query.add_columns(rank)
+                if key is not None and len(key) != len(columns):
+                    logger.warning("Tenant cursor does not match the search, starting over")
+                    direction, key = "next", None
+
+                position = tuple_(*columns)
+                if direction == "prev":
+                    if key is not None:
+                        query = query.filter(position < tuple_(*key))
+                    query = query.order_by(*[column.desc() for column in columns])
+                else:
+                    if key is not None:
+                        query = query.filter(position > tuple_(*key))
+                    query = query.order_by(*columns)
+
+                # One extra row tells whether there is a page beyond this one
+                rows = query.limit(limit + 1).all()
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                if direction == "prev":
+                    rows.reverse()
+                    has_next, has_prev = key is not None, has_more
+                else:
+                    has_next, has_prev = has_more, key is not None
+
+                if rank is not None:
+                    tenants = [tenant for tenant, _ in rows]
+                    keys = [(score, tenant.name, tenant.id) for tenant, score in rows]
+                else:
+                    tenants = rows
+                    keys = [(tenant.name, tenant.id) for tenant in rows]
+
+                if with_balances:
+                    self._annotate_balances(session, tenants, as_of_date)
+
+                next_cursor = prev_cursor = None
+                if tenants and has_next:
+                    next_cursor = _encode_cursor(keys[-1], "next")
+                if tenants and has_prev:
+                    prev_cursor = _encode_cursor(keys[0], "prev")
+                return tenants, next_cursor, prev_cursor
+
+            except Exception as e:
+                logger.error(f"Error getting tenant page: {str(e)}")
+                return [], None, None
+
+    def get_tenants_by_id(
+        self,
+        tenant_ids=(),
+        room_ids=(),
+        search_term=None,
+        include_deleted=False,
+        with_balances=False,
+        as_of_date=None,
+    ):
+        """Get the tenants with these IDs, or in these rooms, still in the list
+
+        Used to patch a loaded tenant list after a change: the same filters
+        as get_tenants_page apply, so a tenant that left the list (removed,
+        or no longer matching the search) is simply not returned.
+
+        Returns:
+            list: Tenants ordered by (name, id), with room_ref loaded
+        """
+        conditions = []
+        if tenant_ids:
+            conditions.append(Tenant.id.in_(list(tenant_ids)))
+        if room_ids:
+            conditions.append(Tenant.room_id.in_(list(room_ids)))
+        if not conditions:
+            return []
+
+        with self.Session(expire_on_commit=False) as session:
+            try:
+                query = session.query(Tenant).options(joinedload(Tenant.room_ref))
+                query, _ = self._filter_tenants(query, search_term, include_deleted)
+                tenants = (
+                    query.filter(or_(*conditions))
+                    .order_by(Tenant.name, Tenant.id)
+                    .all()
+                )
+                if with_balances:
+                    self._annotate_balances(session, tenants, as_of_date)
+                return tenants
+
+            except Exception as e:
+                logger.error(f"Error getting tenants by ID: {str(e)}")
+                return []
+
+    def _filter_tenants(self, query, search_term=None, include_deleted=False):
+        """Apply the tenant list filters shared by counting and paging
+
+        The search term is matched word by word, as prefixes, against the
+        name, BI, email, phone, address and room of the tenant using the
+        full-text index. Without FTS5 only the name is searched with LIKE.
+
+        Returns:
+            tuple: (query, rank) where rank is the search rank column to
+                   order by (lower is better), or None when not searching
+        """
+        if not include_deleted:
+            query = query.filter(Tenant.is_active == True)
+
+        if not (search_term and search_term.strip()):
+            return query, None
+
+        if not self.search_enabled:
+            return query.filter(Tenant.name.ilike(f"%{search_term}%")), None
+
+        match_query = search.build_match_query(search_term)
+        if match_query is None:
+            return query, None
+        matches = search.tenant_matches(match_query)
+        return query.join(matches, matches.c.id == Tenant.id), matches.c.rank
+
+    def _annotate_balances(self, session, tenants, as_of_date=None):
+        """Set a ``balance`` attribute on tenants, read from the cache in one batch"""
+        balances = self.balance_cache.get_balances(
+            session, [tenant.id for tenant in tenants], as_of_date
+        )
+        session.commit()
+        for tenant in tenants:
+            tenant.balance = balances.get(tenant.id, 0.0)
+
     def get_tenants(
         self, page=1, per_page=20, search_term=None, include_inactive=False
     ):
@@ -184,6 +469,109 @@ class DatabaseManager:
     def get_session(self):
         return self.Session()
 
+    @contextmanager
+    def session_scope(self, expire_on_commit=True):
+        """Unit of work: a new session that commits on success, rolls back
+        on error and is always closed.
+
+        Objects loaded in the scope are detached when it ends, so nothing
+        outlives it in an identity map. Use expire_on_commit=False to keep
+        reading the attributes already loaded, or copy what is needed into
+        plain values such as RoomInfo.
+        """
+        session = self.Session(expire_on_commit=expire_on_commit)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_tenant(self, tenant_id):
+        """Detached tenant with its room and emergency contact loaded, or None"""
+        try:
+            with self.session_scope(expire_on_commit=False) as session:
+                return (
+                    session.query(Tenant)
+                    .options(
+                        selectinload(Tenant.room_ref),
+                        selectinload(Tenant.emergency_contact),
+                    )
+                    .filter(Tenant.id == tenant_id)
+                    .first()
+                )
+        except Exception as e:
+            logger.error(f"Error loading tenant {tenant_id}: {str(e)}")
+            return None
+
+    def get_room(self, room_id):
+        """RoomInfo for a room, or None if it does not exist"""
+        try:
+            with self.session_scope() as session:
+                room = session.get(Room, room_id)
+                if room is None:
+                    return None
+                tenant_count = (
+                    session.query(func.count(Tenant.id))
+                    .filter(Tenant.room_id == room_id)
+                    .scalar()
+                )
+                return RoomInfo(room.id, room.name, room.capacity, tenant_count)
+        except Exception as e:
+            logger.error(f"Error loading room {room_id}: {str(e)}")
+            return None
+
+    def get_rooms_with_occupancy(self, search_term=None, room_ids=None):
+        """Rooms with their active tenant counts, ordered by name.
+
+        One LEFT JOIN/GROUP BY query; the tenants are never loaded.
+
+        Args:
+            search_term: Optional substring of the room name
+            room_ids: Optional IDs to limit the rooms to
+
+        Returns:
+            list: RoomOccupancy tuples
+        """
+        try:
+            with self.session_scope() as session:
+                query = (
+                    session.query(
+                        Room.id, Room.name, Room.capacity, func.count(Tenant.id)
+                    )
+                    .outerjoin(
+                        Tenant,
+                        and_(Tenant.room_id == Room.id, Tenant.is_active == True),
+                    )
+                    .group_by(Room.id, Room.name, Room.capacity)
+                )
+                if search_term:
+                    query = query.filter(Room.name.ilike(f"%{search_term}%"))
+                if room_ids is not None:
+                    query = query.filter(Room.id.in_(list(room_ids)))
+                return [RoomOccupancy(*row) for row in query.order_by(Room.name)]
+        except Exception as e:
+            logger.error(f"Error loading rooms: {str(e)}")
+            return []
+
+    def get_room_occupancy(self, room_id):
+        """RoomOccupancy for one room, or None if it does not exist"""
+        try:
+            with self.session_scope() as session:
+                row = (
+                    session.query(
+                        Room.id, Room.name, Room.capacity, Room.current_occupancy
+                    )
+                    .filter(Room.id == room_id)
+                    .first()
+                )
+                return RoomOccupancy(*row) if row else None
+        except Exception as e:
+            logger.error(f"Error loading occupancy of room {room_id}: {str(e)}")
+            return None
+
     def delete_tenant(self, tenant_id, hard_delete=False):
         """Delete a tenant, with option for hard or soft delete.
 
@@ -198,18 +586,21 @@ class DatabaseManager:
         with self.Session() as session:
             try:
                 # Get the tenant
-                tenant = session.query(Tenant).get(tenant_id)
+                tenant = session.get(Tenant, tenant_id)
                 if not tenant:
                     logger.warning(f"No tenant found with ID {tenant_id} for deletion")
                     return False
 
                 if hard_delete:
                     # Hard delete - remove the tenant completely
+                    ledger.remove_balance(session, tenant_id)
+                    periods.remove_snapshots(session, tenant_id)
                     session.delete(tenant)
                     action = "hard-deleted"
                 else:
                     # Soft delete - mark as inactive
                     tenant.soft_delete()
+                    ledger.set_active(session, tenant_id, False)
                     action = "soft-deleted"
 
                 session.commit()
@@ -242,6 +633,7 @@ class DatabaseManager:
 
                 # Restore the tenant
                 tenant.restore()
+                ledger.set_active(session, tenant_id, True)
                 session.commit()
                 logger.info(f"Successfully restored tenant ID {tenant_id}")
                 return True
@@ -282,7 +674,11 @@ class DatabaseManager:
 
         with self.Session() as session:
             try:
+                if status == PaymentStatus.COMPLETED:
+                    periods.check_open(session, payment_date)
                 session.add(payment)
+                session.flush()
+                ledger.apply_payment(session, payment)
                 session.commit()
                 return payment
             except Exception as e:
@@ -303,6 +699,10 @@ class DatabaseManager:
     ):
         """Get paginated payments for a tenant with optional filters
 
+        Only the rows of the requested page are loaded. When expected rent
+        entries are included they are merged with the actual payments by
+        reference month, newest first.
+
         Args:
             tenant_id (int): ID of the tenant
             start_date (date, optional): Filter payments after this date
@@ -316,226 +716,415 @@ class DatabaseManager:
         Returns:
             tuple: (list_of_payments, total_count)
         """
+        conditions = self._payment_filters(
+            tenant_id, start_date, end_date, reference_month, search_term
+        )
+        offset = max(page - 1, 0) * per_page
+
         with self.Session() as session:
-            # Base query for actual payments
-            query = session.query(Payment).filter(Payment.tenant_id == tenant_id)
+            if not (include_expected and start_date and end_date and not reference_month):
+                total = session.query(func.count(Payment.id)).filter(*conditions).scalar()
+                payments = (
+                    session.query(Payment)
+                    .filter(*conditions)
+                    .order_by(Payment.payment_date.desc(), Payment.id.desc())
+                    .offset(offset)
+                    .limit(per_page)
+                    .all()
+                )
+                return payments, total
 
-            # Apply date filters to actual payments
-            if start_date:
-                query = query.filter(Payment.payment_date >= start_date)
-            if end_date:
-                # Include the entire end date
-                end_of_day = datetime.combine(end_date, datetime.max.time())
-                query = query.filter(Payment.payment_date <= end_of_day)
-            if reference_month:
-                # If reference_month is provided, filter payments for that specific month
-                query = query.filter(
-                    func.strftime("%Y-%m", Payment.reference_month)
-                    == reference_month.strftime("%Y-%m")
+            expected = self._get_expected_months(
+                session, tenant_id, conditions, start_date, end_date
+            )
+            # Actual payments per reference month, used to place the page
+            counts = dict(
+                session.query(Payment.reference_month, func.count(Payment.id))
+                .filter(*conditions)
+                .group_by(Payment.reference_month)
+                .all()
+            )
+            total = sum(counts.values()) + len(expected)
+
+            # Walk the months newest first. Within a month the actual payments
+            # come first, then the expected entry. None marks an actual payment.
+            stop = offset + per_page
+            layout = []
+            position = 0
+            skipped = 0
+            for month in sorted(set(counts) | set(expected), reverse=True):
+                if position >= stop:
+                    break
+                count = counts.get(month, 0)
+                before = min(max(offset - position, 0), count)
+                skipped += before
+                layout.extend([None] * (min(count, stop - position) - before))
+                position += count
+                if month in expected:
+                    if offset <= position < stop:
+                        layout.append(expected[month])
+                    position += 1
+
+            needed = layout.count(None)
+            actual = iter(
+                session.query(Payment)
+                .filter(*conditions)
+                .order_by(
+                    Payment.reference_month.desc(),
+                    Payment.payment_date.desc(),
+                    Payment.id.desc(),
                 )
+                .offset(skipped)
+                .limit(needed)
+                .all()
+                if needed
+                else []
+            )
 
-            # Apply search term if provided
-            if search_term and search_term.strip():
-                search = f"%{search_term.strip()}%"
-                query = query.filter(
-                    or_(
-                        Payment.description.ilike(search),
-                        Payment.payment_type.ilike(search),
-                        Payment.status.ilike(search),
+            payments = [
+                next(actual) if entry is None else type("Payment", (), entry)
+                for entry in layout
+            ]
+            return payments, total
+
+    def count_tenant_payments(
+        self,
+        tenant_id,
+        start_date=None,
+        end_date=None,
+        reference_month=None,
+        search_term=None,
+        include_expected=True,
+    ):
+        """Count the payments get_tenant_payments would return across all pages
+
+        Returns:
+            int: Number of actual payments plus expected rent entries
+        """
+        conditions = self._payment_filters(
+            tenant_id, start_date, end_date, reference_month, search_term
+        )
+        with self.Session() as session:
+            total = session.query(func.count(Payment.id)).filter(*conditions).scalar()
+            if include_expected and start_date and end_date and not reference_month:
+                total += len(
+                    self._get_expected_months(
+                        session, tenant_id, conditions, start_date, end_date
                     )
                 )
+            return total
+
+    def _payment_filters(self, tenant_id, start_date, end_date, reference_month, search_term):
+        """SQL conditions selecting the actual payments of a tenant"""
+        conditions = [Payment.tenant_id == tenant_id]
+
+        # Apply date filters to actual payments
+        if start_date:
+            conditions.append(Payment.payment_date >= start_date)
+        if end_date:
+            # Include the entire end date
+            end_of_day = datetime.combine(end_date, datetime.max.time())
+            conditions.append(Payment.payment_date <= end_of_day)
+        if reference_month:
+            # If reference_month is provided, filter payments for that specific month
+            month_start, next_month = month_range(reference_month)
+            conditions.append(Payment.reference_month >= month_start)
+            conditions.append(Payment.reference_month < next_month)
+
+        # Apply search term if provided
+        if search_term and search_term.strip():
+            term = search_term.strip()
+            # Type and status are enums, match their names here instead of in SQL
+            matches = [
+                Payment.payment_type.in_(
+                    [item for item in PaymentType if term.upper() in item.name]
+                ),
+                Payment.status.in_(
+                    [item for item in PaymentStatus if term.upper() in item.name]
+                ),
+            ]
+            match_query = search.build_match_query(term)
+            if not self.search_enabled:
+                matches.append(Payment.description.ilike(f"%{term}%"))
+            elif match_query is not None:
+                matches.append(Payment.id.in_(search.payment_matches(match_query)))
+            conditions.append(or_(*matches))
+        return conditions
+
+    def payment_matches_search(self, payment, search_term):
+        """Python counterpart of the search filter in _payment_filters
+
+        Used to narrow payments that were already fetched for a shorter term.
+        """
+        term = search_term.strip()
+        if term.upper() in payment.payment_type.name or term.upper() in payment.status.name:
+            return True
+        if not self.search_enabled:
+            return term.lower() in (payment.description or "").lower()
+        return search.text_matches(term, payment.description)
 
-            # Get actual payments
-            actual_payments = query.order_by(Payment.payment_date.desc()).all()
-            payments = list(
-                actual_payments
-            )  # Create a copy to avoid modifying the original
-
-            # If we should include expected rent entries
-            if include_expected and (start_date and end_date) and not reference_month:
-                # Get expected rent entries for the date range
-                expected_entries = self.get_expected_rent_entries(
-                    tenant_id, start_date, end_date
-                )
+    @staticmethod
+    def merge_expected_entries(payments, expected_entries):
+        """Merge payments and expected rent entries in get_tenant_payments order
 
-                # Convert actual payments to dict format for easier comparison
-                actual_payments_dict = {}
-                for payment in actual_payments:
-                    if payment.reference_month:
-                        month_key = payment.reference_month.strftime("%Y-%m")
-                        actual_payments_dict[month_key] = payment
-
-                # Add expected entries for months without actual payments
-                for entry in expected_entries:
-                    month_key = entry["reference_month"].strftime("%Y-%m")
-                    if month_key not in actual_payments_dict:
-                        # Create a Payment-like object for the expected entry
-                        payment = type("Payment", (), entry)
-                        payments.append(payment)
-
-                # Sort all payments by reference month in descending order (newest first)
-                payments.sort(
-                    key=lambda p: (
-                        getattr(p, "reference_month", None)
-                        or getattr(p, "payment_date", None)
-                        or datetime.min
-                    ),
-                    reverse=True,
-                )
+        Args:
+            payments (list): Filtered payments of one tenant
+            expected_entries (list): Entries from get_expected_rent_entries
+
+        Returns:
+            list: Payments and Payment-like expected entries, newest month
+                  first, payments before the expected entry of their month
+        """
+        covered = {payment.reference_month.replace(day=1) for payment in payments}
+        rows = [
+            ((payment.reference_month, 1, payment.payment_date, payment.id), payment)
+            for payment in payments
+        ]
+        rows.extend(
+            ((entry["reference_month"], 0, datetime.min, 0), type("Payment", (), entry))
+            for entry in expected_entries
+            if entry["reference_month"] not in covered
+        )
+        rows.sort(key=lambda row: row[0], reverse=True)
+        return [row for _, row in rows]
+
+    def _get_expected_months(self, session, tenant_id, conditions, start_date, end_date):
+        """Expected rent entries of a tenant keyed by month
 
-            # Apply pagination
-            total = len(payments)
-            offset = (page - 1) * per_page
-            paginated_payments = payments[offset : offset + per_page]
+        A month gets no expected entry when it has a rent payment or when
+        one of the filtered payments refers to it. The number of entries is
+        bounded by the months in the range, not by the payment history.
+        """
+        tenant = (
+            session.query(Tenant)
+            .options(selectinload(Tenant.rent_history))
+            .filter(Tenant.id == tenant_id)
+            .first()
+        )
+        if tenant is None:
+            return {}
+
+        start_date = to_date(start_date)
+        end_date = to_date(end_date)
+        range_start = month_range(start_date)[0]
+        range_end = month_range(end_date)[1]
+        covered = (
+            session.query(Payment.reference_month)
+            .filter(
+                Payment.tenant_id == tenant_id,
+                Payment.reference_month >= range_start,
+                Payment.reference_month < range_end,
+                or_(Payment.payment_type == PaymentType.RENT, and_(*conditions)),
+            )
+            .distinct()
+        )
+        paid_months = {month.replace(day=1) for (month,) in covered}
 
-            return paginated_payments, total
+        entries = self._build_expected_entries(tenant, paid_months, start_date, end_date)
+        return {entry["reference_month"]: entry for entry in entries}
 
     def get_expected_rent_entries(self, tenant_id, start_date, end_date):
         """Generate expected rent entries for a tenant between two dates"""
-        with self.Session() as session:
-            # Get the tenant's rent history
-            tenant = session.query(Tenant).get(tenant_id)
-            if not tenant:
-                return []
+        return self.get_expected_rent_entries_bulk(
+            [tenant_id], start_date, end_date
+        ).get(tenant_id, [])
 
-            # Get all rent history records in chronological order
-            history = sorted(tenant.rent_history, key=lambda x: x.valid_from)
+    def get_expected_rent_entries_bulk(self, tenant_ids, start_date, end_date):
+        """Generate expected rent entries for many tenants between two dates
 
-            # If no rent history, use current rent
-            if not history:
-                entry_date = (
-                    tenant.entry_date.date()
-                    if hasattr(tenant.entry_date, "date")
-                    else tenant.entry_date
-                )
-                history = [
-                    type(
-                        "obj",
-                        (object,),
-                        {
-                            "valid_from": entry_date or datetime.min,
-                            "amount": tenant.rent,
-                        },
-                    )
-                ]
+        Months that already have a rent payment are looked up for all
+        tenants and the whole range in one query, so the number of queries
+        does not grow with tenants x months.
 
-            # Generate expected rent for each month in the date range
-            expected_entries = []
-            current_date = max(
-                start_date,
-                (
-                    tenant.entry_date.date()
-                    if hasattr(tenant.entry_date, "date")
-                    else tenant.entry_date
-                ),
-            )
+        Args:
+            tenant_ids (iterable): IDs of the tenants, all active tenants if None
+            start_date (date): First day of the range
+            end_date (date): Last day of the range
 
-            # Ensure end_date is a date object
-            if hasattr(end_date, "date"):
-                end_date = end_date.date()
+        Returns:
+            dict: {tenant_id: list_of_expected_entries}
+        """
+        start_date = to_date(start_date)
+        end_date = to_date(end_date)
+        range_start = month_range(start_date)[0]
+        range_end = month_range(end_date)[1]
 
-            while current_date <= end_date:
-                # Find the applicable rent for the current date
-                applicable_rent = tenant.rent  # Default to current rent
+        with self.Session() as session:
+            query = session.query(Tenant).options(selectinload(Tenant.rent_history))
+            if tenant_ids is None:
+                query = query.filter(Tenant.is_active == True)
+            else:
+                query = query.filter(Tenant.id.in_(list(tenant_ids)))
+            tenants = query.all()
+            if not tenants:
+                return {}
+
+            # Months in the range that already have a rent payment
+            paid_months = {}
+            rows = (
+                session.query(Payment.tenant_id, Payment.reference_month)
+                .filter(
+                    Payment.tenant_id.in_([tenant.id for tenant in tenants]),
+                    Payment.payment_type == PaymentType.RENT,
+                    Payment.reference_month >= range_start,
+                    Payment.reference_month < range_end,
+                )
+                .distinct()
+            )
+            for paid_tenant_id, reference_month in rows:
+                paid_months.setdefault(paid_tenant_id, set()).add(
+                    reference_month.replace(day=1)
+                )
 
-                for record in history:
-                    valid_from = (
-                        record.valid_from.date()
-                        if hasattr(record.valid_from, "date")
-                        else record.valid_from
-                    )
-                    if valid_from <= current_date:
-                        applicable_rent = record.amount
-                    else:
-                        break
-
-                # Create an expected rent entry for this month if there's no actual payment
-                # Check if we have a payment for this month
-                current_month_str = current_date.strftime("%Y-%m")
-                has_payment = (
-                    session.query(Payment)
-                    .filter(
-                        Payment.tenant_id == tenant_id,
-                        Payment.payment_type == PaymentType.RENT,
-                        func.strftime("%Y-%m", Payment.reference_month)
-                        == current_month_str,
-                    )
-                    .first()
-                    is not None
+            return {
+                tenant.id: self._build_expected_entries(
+                    tenant, paid_months.get(tenant.id, set()), start_date, end_date
                 )
+                for tenant in tenants
+            }
 
-                if not has_payment and applicable_rent > 0:
-                    # Create a date object for the first day of the month
-                    month_date = current_date.replace(day=1)
-                    if hasattr(month_date, "date"):
-                        month_date = month_date.date()
+    @staticmethod
+    def _build_expected_entries(tenant, paid_months, start_date, end_date):
+        """Expected rent entries for the months of a range without a rent payment"""
+        # Get all rent history records in chronological order
+        history = sorted(tenant.rent_history, key=lambda x: x.valid_from)
+
+        expected_entries = []
+        current_date = max(start_date, to_date(tenant.entry_date))
+        while current_date <= end_date:
+            # Find the applicable rent for the current date
+            applicable_rent = tenant.rent  # Default to current rent
+            for record in history:
+                if to_date(record.valid_from) <= current_date:
+                    applicable_rent = record.amount
+                else:
+                    break
 
-                    expected_entries.append(
-                        {
-                            "id": None,
-                            "tenant_id": tenant_id,
-                            "payment_date": None,
-                            "amount": float(applicable_rent),  # Ensure it's a float
-                            "payment_type": PaymentType.RENT,
-                            "reference_month": month_date,
-                            "description": f'Renda esperada para {current_date.strftime("%B %Y")}',
-                            "status": "EXPECTED",
-                            "is_expected": True,
-                            "created_at": datetime.now(),
-                            "updated_at": datetime.now(),
-                        }
-                    )
+            month_date = current_date.replace(day=1)
+            if month_date not in paid_months and applicable_rent > 0:
+                expected_entries.append(
+                    {
+                        "id": None,
+                        "tenant_id": tenant.id,
+                        "payment_date": None,
+                        "amount": float(applicable_rent),  # Ensure it's a float
+                        "payment_type": PaymentType.RENT,
+                        "reference_month": month_date,
+                        "description": f'Renda esperada para {current_date.strftime("%B %Y")}',
+                        "status": "EXPECTED",
+                        "is_expected": True,
+                        "created_at": datetime.now(),
+                        "updated_at": datetime.now(),
+                    }
+                )
 
-                # Move to the first day of the next month
-                try:
-                    if current_date.month == 12:
-                        current_date = current_date.replace(
-                            year=current_date.year + 1, month=1, day=1
-                        )
-                    else:
-                        current_date = current_date.replace(
-                            month=current_date.month + 1, day=1
-                        )
-
-                    # Ensure current_date is a date object for the next iteration
-                    if hasattr(current_date, "date") and not isinstance(
-                        current_date, datetime.date
-                    ):
-                        current_date = current_date.date()
-                except ValueError as e:
-                    # Handle invalid date (e.g., Feb 30)
-                    if current_date.month == 12:
-                        current_date = current_date.replace(
-                            year=current_date.year + 1, month=1, day=1
-                        )
-                    else:
-                        current_date = current_date.replace(
-                            month=current_date.month + 2, day=1
-                        )
-                    if hasattr(current_date, "date"):
-                        current_date = current_date.date()
-
-            return expected_entries
+            # Move to the first day of the next month
+            current_date = month_range(current_date)[1]
+
+        return expected_entries
 
     def get_total_rent_collected(self, reference_month=None):
         """Get total rent collected for a specific month"""
         if reference_month is None:
             reference_month = datetime.utcnow()
 
+        month_start, next_month = month_range(reference_month)
         with self.Session() as session:
             total = (
                 session.query(func.sum(Payment.amount))
                 .filter(
                     Payment.payment_type == PaymentType.RENT,
                     Payment.status == PaymentStatus.COMPLETED,
-                    func.strftime("%Y-%m", Payment.reference_month)
-                    == reference_month.strftime("%Y-%m"),
+                    Payment.reference_month >= month_start,
+                    Payment.reference_month < next_month,
                 )
                 .scalar()
             )
 
             return total or 0.0
 
+    def get_monthly_payment_overview(
+        self, reference_month=None, tenant_ids=None, room_ids=None, as_of_date=None
+    ):
+        """Get the payment status of every active tenant for a month.
+
+        Amounts paid are aggregated with a single GROUP BY over payments and
+        rooms; balances come from the ledger in one batch.
+
+        Args:
+            reference_month (date, optional): Any day of the month, defaults to today.
+            tenant_ids, room_ids (optional): Limit the overview to these
+                tenants and the tenants of these rooms
+            as_of_date (date, optional): Date of the balances, defaults to
+                reference_month
+
+        Returns:
+            list: One dict per tenant (ordered by name) with tenant_id, name,
+                  room, rent, amount_paid, status ("paid", "partial" or
+                  "pending") and balance
+        """
+        if reference_month is None:
+            reference_month = datetime.utcnow()
+        month_start, next_month = month_range(reference_month)
+
+        with self.Session() as session:
+            amount_paid = func.coalesce(func.sum(Payment.amount), 0.0)
+            query = (
+                session.query(
+                    Tenant.id,
+                    Tenant.name,
+                    Room.name,
+                    Tenant.rent,
+                    amount_paid,
+                    case(
+                        (amount_paid >= Tenant.rent, "paid"),
+                        (amount_paid > 0, "partial"),
+                        else_="pending",
+                    ),
+                )
+                .outerjoin(Room, Room.id == Tenant.room_id)
+                .outerjoin(
+                    Payment,
+                    and_(
+                        Payment.tenant_id == Tenant.id,
+                        Payment.status == PaymentStatus.COMPLETED,
+                        Payment.reference_month >= month_start,
+                        Payment.reference_month < next_month,
+                    ),
+                )
+                .filter(Tenant.is_active == True)
+            )
+            if tenant_ids is not None or room_ids is not None:
+                query = query.filter(
+                    or_(
+                        Tenant.id.in_(list(tenant_ids or ())),
+                        Tenant.room_id.in_(list(room_ids or ())),
+                    )
+                )
+            rows = (
+                query.group_by(Tenant.id, Tenant.name, Room.name, Tenant.rent)
+                .order_by(Tenant.name)
+                .all()
+            )
+
+            balances = self.balance_cache.get_balances(
+                session, [row[0] for row in rows], as_of_date or reference_month
+            )
+            session.commit()
+
+        return [
+            {
+                "tenant_id": tenant_id,
+                "name": name,
+                "room": room or "",
+                "rent": rent,
+                "amount_paid": paid,
+                "status": status,
+                "balance": balances.get(tenant_id, 0.0),
+            }
+            for tenant_id, name, room, rent, paid, status in rows
+        ]
+
     def get_rent_history(self, tenant_id, start_date=None, end_date=None):
         """Get rent history for a tenant within a date range"""
         with self.Session() as session:
@@ -577,60 +1166,252 @@ class DatabaseManager:
                     )
                     return 0.0
 
-                tenant = session.query(Tenant).get(tenant_id)
-                if not tenant:
+                balances = self.balance_cache.get_balances(
+                    session, [tenant_id], as_of_date
+                )
+                session.commit()
+                if tenant_id not in balances:
                     logger.debug(f"No tenant found with id: {tenant_id}")
                     return 0.0
-                logger.debug(
-                    f"Found tenant: ID={tenant.id}, Name={getattr(tenant, 'name', 'N/A')}"
-                )
-                return tenant.get_balance(as_of_date)
+                return balances[tenant_id]
 
         except Exception as e:
             logger.error(f"Error in get_tenant_balance: {str(e)}")
             logger.exception("Exception in get_tenant_balance")
             return 0.0
 
-    def get_total_debt(self, as_of_date=None):
-        """Calculate the total debt across all tenants (sum of positive balances)"""
+    def get_balances(self, tenant_ids=None, as_of_date=None, include_deleted=True):
+        """Get balances (rent due - payments) for many tenants at once.
+
+        Balances come from the in-memory balance cache, then from the
+        tenant_balances ledger when still valid.
+        Missing or stale ones are computed with SQL aggregates, so the number
+        of queries does not depend on the number of tenants or on the length
+        of their history.
+
+        Args:
+            tenant_ids (iterable, optional): Tenant IDs to include, all tenants if None
+            as_of_date (date, optional): Cut-off date, defaults to today
+            include_deleted (bool): Include soft-deleted tenants
+
+        Returns:
+            dict: {tenant_id: balance}
+        """
+        if as_of_date is None:
+            as_of_date = datetime.utcnow()
+
+        with self.Session() as session:
+            try:
+                balances = self.balance_cache.get_balances(
+                    session, tenant_ids, as_of_date, active_only=not include_deleted
+                )
+                session.commit()
+                return balances
+            except Exception as e:
+                logger.error(f"Error getting balances: {str(e)}")
+                logger.exception("Exception in get_balances")
+                return {}
+
+    def refresh_balances(self, tenant_ids):
+        """Recompute the ledger balances of tenants after their rent or entry date changed"""
+        with self.Session() as session:
+            try:
+                ledger.refresh_balances(session, tenant_ids)
+                session.commit()
+                self.balance_cache.invalidate(tenant_ids)
+                return True
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error refreshing balances: {str(e)}")
+                return False
+
+    def rebuild_balances(self):
+        """Recompute the whole balance ledger. Returns the number of rows written"""
+        with self.Session() as session:
+            try:
+                count = ledger.rebuild(session)
+                session.commit()
+                self.balance_cache.invalidate()
+                logger.info(f"Rebuilt {count} ledger balances")
+                return count
+            except Exception:
+                session.rollback()
+                logger.exception("Error rebuilding balance ledger")
+                raise
+
+    def close_period(self, month):
+        """Close a past month, writing a balance snapshot per tenant.
+
+        Returns the number of snapshots written; raises ValueError for a
+        month that has not ended.
+        """
+        with self.Session() as session:
+            try:
+                count = periods.close_period(session, month)
+                session.commit()
+                # Month-end balances are now read from the new snapshots
+                self.balance_cache.invalidate()
+                return count
+            except Exception:
+                session.rollback()
+                logger.exception(f"Error closing period {month}")
+                raise
+
+    def reopen_period(self, month):
+        """Reopen a month and the months after it. Returns the reopened months"""
+        with self.Session() as session:
+            try:
+                months = periods.reopen_period(session, month)
+                session.commit()
+                self.balance_cache.invalidate()
+                return months
+            except Exception:
+                session.rollback()
+                logger.exception(f"Error reopening period {month}")
+                raise
+
+    def backfill_periods(self, until=None):
+        """Close every month up to until (the last ended month by default)"""
+        with self.Session() as session:
+            try:
+                months = periods.backfill(session, until)
+                session.commit()
+                self.balance_cache.invalidate()
+                return months
+            except Exception:
+                session.rollback()
+                logger.exception("Error backfilling closed periods")
+                raise
+
+    def get_closed_periods(self):
+        """First days of the closed months, oldest first"""
+        with self.Session() as session:
+            return periods.closed_months(session)
+
+    def verify_periods(self):
+        """Check the snapshots of closed months against the payment history"""
+        with self.Session() as session:
+            return periods.verify(session)
+
+    def verify_balances(self):
+        """Check the balance ledger against the reference balance computation"""
+        with self.Session() as session:
+            return ledger.verify(session)
+
+    def get_total_debt(self, as_of_date=None, include_deleted=False):
+        """Calculate the total debt across tenants (sum of positive balances).
+
+        Soft-deleted tenants are left out unless include_deleted is set,
+        matching the payment overview and the aging report.
+        """
         if as_of_date is None:
             as_of_date = datetime.utcnow()
 
-        total_debt = 0.0
+        balances = self.get_balances(
+            as_of_date=as_of_date, include_deleted=include_deleted
+        )
+        # Only count positive balances (debts)
+        return sum(balance for balance in balances.values() if balance > 0)
+
+    def get_aging_report(self, as_of_date=None, include_deleted=False):
+        """Get outstanding rent by age (0-30/31-60/61-90/90+ days) in one query.
+
+        Args:
+            as_of_date (date, optional): Date the ages are counted to, defaults to today
+            include_deleted (bool): Include soft-deleted tenants
+
+        Returns:
+            aging.AgingReport: as_of_date, an AgingRow per tenant, a RoomAging
+                per room and a RoomAging total
+        """
         with self.Session() as session:
-            tenants = session.query(Tenant).all()
-            for tenant in tenants:
-                balance = tenant.get_balance(as_of_date)
-                if balance > 0:  # Only count positive balances (debts)
-                    total_debt += balance
-        return total_debt
+            try:
+                return aging.get_aging_report(session, as_of_date, include_deleted)
+            except Exception as e:
+                logger.error(f"Error building aging report: {str(e)}")
+                logger.exception("Exception in get_aging_report")
+                return aging.AgingReport(
+                    to_date(as_of_date), [], [], aging.summarize(None, None, [])
+                )
+
+    def iter_rent_statement(self, tenant_id, start_date, end_date=None):
+        """Stream a tenant's statement lines, see statements.iter_statements.
+
+        The session stays open until the generator is exhausted or closed.
+        """
+        with self.Session() as session:
+            yield from statements.iter_statement(session, tenant_id, start_date, end_date)
+
+    def export_statements(
+        self,
+        stream,
+        start_date,
+        end_date=None,
+        format="csv",
+        tenant_ids=None,
+        include_deleted=True,
+    ):
+        """Write the rent statements of all (or the given) tenants to a stream.
+
+        Lines are written as they are generated, so memory use does not
+        grow with the number of tenants.
+
+        Args:
+            stream: Text file object to write to
+            start_date (date): First day of the statements
+            end_date (date, optional): Last day, defaults to today
+            format (str): "csv", "jsonl" or "columnar", see export.WRITERS
+            tenant_ids (list, optional): Tenants to export, defaults to all
+            include_deleted (bool): Include soft-deleted tenants
+
+        Returns:
+            int: Number of statement lines written
+        """
+        writer = export.WRITERS[format]
+        with self.Session() as session:
+            lines = statements.iter_statements(
+                session,
+                start_date,
+                end_date,
+                tenant_ids=tenant_ids,
+                include_deleted=include_deleted,
+            )
+            return writer(lines, stream, statements.StatementLine._fields)
+
+    def export_tables(
+        self, directory, tables=None, format="csv", chunk_size=export.CHUNK_SIZE
+    ):
+        """Export tables (rooms, tenants, payments, rent_history) to files.
+
+        Rows are streamed from the database in chunks without building ORM
+        objects, see export.export_table.
+
+        Args:
+            directory (str): Directory the files are written to
+            tables (list, optional): Table names, defaults to all of export.TABLES
+            format (str): "csv", "jsonl" or "columnar"
+            chunk_size (int): Rows fetched and written at a time
+
+        Returns:
+            dict: {table: number of rows written}
+        """
+        with self.Session() as session:
+            return export.export_tables(session, directory, tables, format, chunk_size)
 
     def generate_rent_statement(self, tenant_id, start_date, end_date=None):
-        """Generate a rent statement for a tenant"""
-        if end_date is None:
-            end_date = datetime.utcnow()
+        """Generate a rent statement for a tenant.
+
+        The opening balance is the balance on the day before start_date.
+        Built from iter_rent_statement; use that to stream the lines.
+        """
+        start_date = to_date(start_date)
+        end_date = to_date(end_date)
 
         with self.Session() as session:
-            tenant = session.query(Tenant).get(tenant_id)
+            tenant = session.get(Tenant, tenant_id)
             if not tenant:
                 return None
 
-            # Get all rent periods in the date range
-            rent_periods = [
-                period
-                for period in tenant._get_rent_periods(end_date)
-                if start_date <= period["date"] <= end_date
-            ]
-
-            # Get all payments in the date range
-            payments = [
-                payment
-                for payment in tenant.payments
-                if start_date <= payment.payment_date <= end_date
-            ]
-
-            # Calculate running balance
-            running_balance = 0
             statement = {
                 "tenant": tenant,
                 "start_date": start_date,
@@ -642,43 +1423,33 @@ class DatabaseManager:
                 "total_rent_due": 0,
                 "total_payments": 0,
             }
-
-            # Calculate opening balance (balance before start_date)
-            statement["opening_balance"] = tenant.get_balance(start_date)
-            running_balance = statement["opening_balance"]
-
-            # Add rent charges
-            for period in rent_periods:
-                statement["total_rent_due"] += period["amount"]
-                running_balance += period["amount"]
-                statement["rent_charges"].append(
-                    {
-                        "date": period["date"],
-                        "amount": period["amount"],
-                        "balance": running_balance,
-                        "type": "rent",
-                    }
-                )
-
-            # Add payments
-            for payment in payments:
-                if payment.status == PaymentStatus.COMPLETED:
-                    statement["total_payments"] += payment.amount
-                    running_balance -= payment.amount
+            for line in statements.iter_statement(
+                session, tenant_id, start_date, end_date
+            ):
+                if line.kind == "opening":
+                    statement["opening_balance"] = line.balance
+                elif line.kind == "closing":
+                    statement["closing_balance"] = line.balance
+                elif line.kind == "rent":
+                    statement["total_rent_due"] += line.amount
+                    statement["rent_charges"].append(
+                        {
+                            "date": line.date,
+                            "amount": line.amount,
+                            "balance": line.balance,
+                            "type": "rent",
+                        }
+                    )
+                else:
+                    statement["total_payments"] -= line.amount
                     statement["payments"].append(
                         {
-                            "date": payment.payment_date,
-                            "amount": -payment.amount,  # Negative because it reduces the balance
-                            "balance": running_balance,
+                            "date": line.date,
+                            "amount": line.amount,  # Negative because it reduces the balance
+                            "balance": line.balance,
                             "type": "payment",
-                            "reference": (
-                                payment.reference_month.strftime("%Y-%m")
-                                if payment.reference_month
-                                else ""
-                            ),
-                            "description": payment.description or "",
+                            "reference": line.reference,
+                            "description": line.description,
                         }
                     )
-
-            statement["closing_balance"] = running_balance
             return statement
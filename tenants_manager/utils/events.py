@@ -0,0 +1,151 @@
+import logging
+import threading
+from collections import defaultdict
+from sqlalchemy import event, inspect
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Key in Session.info where flushed changes wait for the commit
+PENDING_KEY = "pending_changes"
+
+
+class ChangeSet:
+    """IDs of the rows one commit inserted, updated or deleted, by table.
+
+    Rows that point at a changed row's parents are recorded too: a payment
+    changes its tenant, a tenant moving rooms changes both rooms. These come
+    from the foreign keys of the changed rows, old and new values alike.
+    For updated rows the names of the changed columns are kept.
+    """
+
+    def __init__(self):
+        self.inserted = defaultdict(set)
+        self.updated = defaultdict(set)
+        self.deleted = defaultdict(set)
+        # (table, parent table) -> IDs of the parent rows
+        self.references = defaultdict(set)
+        # (table, id) -> names of the columns an update changed
+        self.columns = defaultdict(set)
+
+    def __bool__(self):
+        return any((self.inserted, self.updated, self.deleted))
+
+    def __contains__(self, table):
+        """Whether rows of the table itself changed"""
+        return bool(self.changed_ids(table))
+
+    def __repr__(self):
+        tables = sorted(set(self.inserted) | set(self.updated) | set(self.deleted))
+        return f"<ChangeSet {', '.join(tables)}>"
+
+    def ids(self, table):
+        """IDs of the table's rows that changed or have changed children"""
+        ids = set(self.changed_ids(table))
+        for (_, parent), parent_ids in self.references.items():
+            if parent == table:
+                ids.update(parent_ids)
+        return frozenset(ids)
+
+    def changed_ids(self, table):
+        """IDs of the table's rows inserted, updated or deleted"""
+        return frozenset(
+            self.inserted.get(table, set())
+            | self.updated.get(table, set())
+            | self.deleted.get(table, set())
+        )
+
+    def referenced_by(self, table, parent):
+        """IDs of the parent rows that changed rows of table point at"""
+        return frozenset(self.references.get((table, parent), set()))
+
+    def updated_columns(self, table, *columns):
+        """IDs of the table's rows updated in any of these columns"""
+        return frozenset(
+            row_id
+            for row_id in self.updated.get(table, set())
+            if self.columns[(table, row_id)].intersection(columns)
+        )
+
+    def add(self, kind, obj):
+        """Record an ORM object from a flush as inserted, updated or deleted"""
+        state = inspect(obj)
+        table = state.mapper.local_table
+        identity = state.mapper.primary_key_from_instance(obj)
+        row_id = identity[0] if len(identity) == 1 else None
+        if row_id is not None:
+            getattr(self, kind)[table.name].add(row_id)
+
+        # History does not load expired attributes, so no SQL is emitted
+        for column in table.columns:
+            attribute = state.mapper.get_property_by_column(column).key
+            history = state.attrs[attribute].history
+            if kind == "updated" and row_id is not None and history.has_changes():
+                self.columns[(table.name, row_id)].add(column.name)
+            for foreign_key in column.foreign_keys:
+                self.references[(table.name, foreign_key.column.table.name)].update(
+                    value for value in history.sum() if value is not None
+                )
+
+
+class EventBus:
+    """In-process publish/subscribe for committed ChangeSets.
+
+    Subscribers are called on the thread that committed, right after the
+    commit; views that touch widgets should hop to the GUI thread first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, changes):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception:
+                logger.exception(f"Error delivering {changes}")
+
+
+def watch_sessions(session_factory, bus):
+    """Publish on bus what every commit of the factory's sessions changed.
+
+    Changes are collected on after_flush, so rows written by several flushes
+    of one transaction are published together, and dropped on rollback.
+    Statements run outside the ORM unit of work (bulk updates, Core inserts)
+    are not seen.
+    """
+
+    def after_flush(session, flush_context):
+        changes = session.info.setdefault(PENDING_KEY, ChangeSet())
+        for obj in session.new:
+            changes.add("inserted", obj)
+        for obj in session.dirty:
+            if session.is_modified(obj, include_collections=False):
+                changes.add("updated", obj)
+        for obj in session.deleted:
+            changes.add("deleted", obj)
+
+    def after_commit(session):
+        changes = session.info.pop(PENDING_KEY, None)
+        if changes:
+            logger.debug(f"Publishing {changes}")
+            bus.publish(changes)
+
+    def after_rollback(session):
+        session.info.pop(PENDING_KEY, None)
+
+    event.listen(session_factory, "after_flush", after_flush)
+    event.listen(session_factory, "after_commit", after_commit)
+    event.listen(session_factory, "after_rollback", after_rollback)
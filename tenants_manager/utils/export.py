@@ -0,0 +1,200 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from datetime import date, datetime
+from enum import Enum
+from itertools import islice
+from sqlalchemy import select
+
+from ..models.tenant import Tenant, Payment, RentHistory, Room
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the cursor and written per chunk
+CHUNK_SIZE = 5000
+
+# Exported tables, in the order they are written by default
+TABLES = {
+    "rooms": Room.__table__,
+    "tenants": Tenant.__table__,
+    "payments": Payment.__table__,
+    "rent_history": RentHistory.__table__,
+}
+
+EXTENSIONS = {"csv": "csv", "jsonl": "jsonl", "columnar": "columns.jsonl"}
+
+
+def plain(value):
+    """Value as written to an export file"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _chunks(rows, chunk_size):
+    """Lists of up to chunk_size rows"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(rows, stream, fields, chunk_size=CHUNK_SIZE):
+    """Write rows (tuples in fields order) as CSV with a header, a chunk at a time.
+
+    Returns:
+        int: Number of rows written
+    """
+    writer = csv.writer(stream)
+    writer.writerow(fields)
+    count = 0
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows(
+            ["" if value is None else plain(value) for value in row] for row in chunk
+        )
+        count += len(chunk)
+    return count
+
+
+def write_jsonl(rows, stream, fields, chunk_size=CHUNK_SIZE):
+    """Write rows (tuples in fields order) as JSON Lines, a chunk at a time.
+
+    Returns:
+        int: Number of rows written
+    """
+    count = 0
+    for chunk in _chunks(rows, chunk_size):
+        stream.write(
+            "".join(
+                json.dumps(
+                    {field: plain(value) for field, value in zip(fields, row)},
+                    ensure_ascii=False,
+                )
+                + "\n"
+                for row in chunk
+            )
+        )
+        count += len(chunk)
+    return count
+
+
+def write_columnar(rows, stream, fields, chunk_size=CHUNK_SIZE):
+    """Write rows column by column, one JSON line per chunk.
+
+    The first line is {"columns": fields}; every other line is a row group
+    {"rows": n, "columns": {field: [values]}}, so a reader can load single
+    columns one row group at a time, as with Parquet.
+
+    Returns:
+        int: Number of rows written
+    """
+    stream.write(json.dumps({"columns": list(fields)}) + "\n")
+    count = 0
+    for chunk in _chunks(rows, chunk_size):
+        columns = {
+            field: [plain(value) for value in values]
+            for field, values in zip(fields, zip(*chunk))
+        }
+        stream.write(
+            json.dumps({"rows": len(chunk), "columns": columns}, ensure_ascii=False)
+            + "\n"
+        )
+        count += len(chunk)
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "columnar": write_columnar}
+
+
+def export_table(session, name, stream, format="csv", chunk_size=CHUNK_SIZE):
+    """Stream one table to a file in primary key order.
+
+    Rows are read as plain tuples with yield_per, so no ORM objects are
+    built and at most one chunk is held in memory.
+
+    Returns:
+        int: Number of rows written
+    """
+    table = TABLES[name]
+    query = select(table).order_by(*table.primary_key.columns)
+    result = session.execute(query, execution_options={"yield_per": chunk_size})
+    try:
+        return WRITERS[format](
+            result, stream, [column.name for column in table.columns], chunk_size
+        )
+    finally:
+        result.close()
+
+
+def export_tables(session, directory, tables=None, format="csv", chunk_size=CHUNK_SIZE):
+    """Export tables to <directory>/<table>.<extension>.
+
+    Each file is written under a temporary name and renamed when complete,
+    so a reader never sees a partial export.
+
+    Returns:
+        dict: {table: number of rows written}
+    """
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for name in tables or TABLES:
+        path = os.path.join(directory, f"{name}.{EXTENSIONS[format]}")
+        partial = path + ".part"
+        try:
+            with open(partial, "w", newline="", encoding="utf-8") as stream:
+                counts[name] = export_table(session, name, stream, format, chunk_size)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        logger.info(f"Exported {counts[name]} {name} rows to {path}")
+    return counts
+
+
+def main(argv=None):
+    """Command line entry point: export tables to CSV, JSON Lines or columnar files"""
+    from .database import DatabaseManager
+
+    parser = argparse.ArgumentParser(
+        prog="python -m tenants_manager export",
+        description="Export tables for accounting",
+    )
+    parser.add_argument(
+        "tables",
+        nargs="*",
+        metavar="table",
+        help=f"Tables to export ({', '.join(TABLES)}), default all",
+    )
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--output-dir", default=".", help="Directory for the files")
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="Rows fetched per chunk"
+    )
+    args = parser.parse_args(argv)
+    # Checked here: argparse rejects an empty list against choices
+    unknown = [name for name in args.tables if name not in TABLES]
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(unknown)}")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+
+    db = DatabaseManager()
+    counts = db.export_tables(
+        args.output_dir, args.tables, format=args.format, chunk_size=args.chunk_size
+    )
+    for name, count in counts.items():
+        print(f"{name}: {count} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
+
+from ..models.tenant import Tenant, Payment, PaymentStatus, TenantBalance
+from . import periods
+from .balances import get_balance_components, to_date
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Balances are stored for "today"; other dates are computed on demand
+LEDGER_FIELDS = (
+    "rent_due",
+    "total_paid",
+    "balance",
+    "computed_on",
+    "valid_until",
+    "is_active",
+    "updated_at",
+)
+
+
+def _next_rent_date(entry_date, as_of_date):
+    """Return the first rent charge date after as_of_date"""
+    if as_of_date < entry_date:
+        return entry_date
+    if as_of_date.month == 12:
+        return as_of_date.replace(year=as_of_date.year + 1, month=1, day=1)
+    return as_of_date.replace(month=as_of_date.month + 1, day=1)
+
+
+def compute_entries(session, tenant_ids=None, as_of_date=None):
+    """Compute ledger rows for the given tenants as of a date.
+
+    Uses a fixed number of queries regardless of the number of tenants.
+
+    Returns:
+        list: One dict per tenant with the TenantBalance column values
+    """
+    as_of_date = to_date(as_of_date)
+    if tenant_ids is not None:
+        tenant_ids = list(tenant_ids)
+        if not tenant_ids:
+            return []
+
+    components = get_balance_components(session, as_of_date, tenant_ids)
+
+    tenants_query = session.query(Tenant.id, Tenant.entry_date, Tenant.is_active)
+    payments_query = session.query(
+        Payment.tenant_id, func.min(Payment.payment_date)
+    ).filter(
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date >= as_of_date + timedelta(days=1),
+    )
+    if tenant_ids is not None:
+        tenants_query = tenants_query.filter(Tenant.id.in_(tenant_ids))
+        payments_query = payments_query.filter(Payment.tenant_id.in_(tenant_ids))
+
+    # The balance changes again on the next rent date or future-dated payment
+    next_payments = dict(payments_query.group_by(Payment.tenant_id).all())
+
+    now = datetime.utcnow()
+    entries = []
+    for tenant_id, entry_date, is_active in tenants_query.all():
+        rent_due, paid = components.get(tenant_id, (0.0, 0.0))
+        next_change = _next_rent_date(to_date(entry_date), as_of_date)
+        if tenant_id in next_payments:
+            next_change = min(next_change, to_date(next_payments[tenant_id]))
+
+        entries.append(
+            {
+                "tenant_id": tenant_id,
+                "rent_due": rent_due,
+                "total_paid": paid,
+                "balance": rent_due - paid,
+                "computed_on": as_of_date,
+                "valid_until": next_change - timedelta(days=1),
+                "is_active": is_active,
+                "updated_at": now,
+            }
+        )
+    return entries
+
+
+def _store_entries(session, entries):
+    """Upsert ledger rows made by compute_entries"""
+    if entries:
+        stmt = sqlite_insert(TenantBalance)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TenantBalance.tenant_id],
+            set_={field: stmt.excluded[field] for field in LEDGER_FIELDS},
+        )
+        session.execute(stmt, entries)
+
+
+def refresh_balances(session, tenant_ids=None, as_of_date=None):
+    """Recompute and upsert the ledger rows for the given tenants.
+
+    The caller is responsible for committing the session.
+
+    Returns:
+        dict: {tenant_id: balance} for the refreshed tenants
+    """
+    entries = compute_entries(session, tenant_ids, as_of_date)
+    _store_entries(session, entries)
+    return {entry["tenant_id"]: entry["balance"] for entry in entries}
+
+
+def active_tenant_ids(session, tenant_ids=None):
+    """IDs of the tenants (all or the given ones) that are not soft-deleted.
+
+    Read from the ledger, which mirrors soft deletes (see set_active);
+    tenants without a ledger row yet fall back to Tenant.is_active.
+    """
+    query = (
+        session.query(Tenant.id)
+        .outerjoin(TenantBalance, TenantBalance.tenant_id == Tenant.id)
+        .filter(func.coalesce(TenantBalance.is_active, Tenant.is_active) == True)
+    )
+    if tenant_ids is not None:
+        query = query.filter(Tenant.id.in_(list(tenant_ids)))
+    return [tenant_id for (tenant_id,) in query.order_by(Tenant.id)]
+
+
+def get_entries(session, tenant_ids=None, as_of_date=None, active_only=False):
+    """Get balances with the dates they hold for, see get_balances.
+
+    With active_only, soft-deleted tenants are left out (see active_tenant_ids).
+
+    Returns:
+        dict: {tenant_id: (balance, valid_from, valid_until)}; the balance
+              is the same on every date of the range
+    """
+    as_of_date = to_date(as_of_date)
+    if active_only:
+        tenant_ids = active_tenant_ids(session, tenant_ids)
+    if tenant_ids is not None:
+        tenant_ids = list(tenant_ids)
+        if not tenant_ids:
+            return {}
+
+    query = session.query(TenantBalance)
+    if tenant_ids is not None:
+        query = query.filter(TenantBalance.tenant_id.in_(tenant_ids))
+
+    entries = {
+        row.tenant_id: (row.balance, row.computed_on, row.valid_until)
+        for row in query.all()
+        if row.is_valid_for(as_of_date)
+    }
+
+    if tenant_ids is None:
+        tenant_ids = [tenant_id for (tenant_id,) in session.query(Tenant.id).all()]
+    stale = [tenant_id for tenant_id in tenant_ids if tenant_id not in entries]
+
+    if stale and as_of_date < to_date(None):
+        # The end of a closed month is read from its snapshots
+        entries.update(periods.get_closing_entries(session, stale, as_of_date))
+        stale = [tenant_id for tenant_id in stale if tenant_id not in entries]
+
+    if stale:
+        logger.debug(f"Recomputing {len(stale)} stale ledger balances")
+        computed = compute_entries(session, stale, as_of_date)
+        if as_of_date == to_date(None):
+            _store_entries(session, computed)
+        entries.update(
+            {
+                entry["tenant_id"]: (
+                    entry["balance"],
+                    entry["computed_on"],
+                    entry["valid_until"],
+                )
+                for entry in computed
+            }
+        )
+    return entries
+
+
+def get_balances(session, tenant_ids=None, as_of_date=None, active_only=False):
+    """Get balances from the ledger, recomputing missing or stale rows.
+
+    Rows still valid for as_of_date are read as-is, and balances as of the
+    last day of a closed month from its snapshots (see utils.periods). When as_of_date is today
+    the recomputed rows are written back, so the caller should commit.
+
+    Returns:
+        dict: {tenant_id: balance}
+    """
+    entries = get_entries(session, tenant_ids, as_of_date, active_only)
+    return {tenant_id: entry[0] for tenant_id, entry in entries.items()}
+
+
+def apply_payment(session, payment):
+    """Update the ledger row of a tenant after a new payment is recorded"""
+    if payment.status != PaymentStatus.COMPLETED:
+        return
+
+    entry = session.get(TenantBalance, payment.tenant_id)
+    if entry is None:
+        # Computed on the next read
+        return
+
+    payment_date = to_date(payment.payment_date)
+    if payment_date <= entry.computed_on:
+        entry.total_paid += payment.amount
+        entry.balance -= payment.amount
+    else:
+        # Future-dated payment: the stored balance is only good until the day before
+        entry.valid_until = min(entry.valid_until, payment_date - timedelta(days=1))
+
+
+def set_active(session, tenant_id, is_active):
+    """Mirror a tenant's soft-delete state in the ledger"""
+    entry = session.get(TenantBalance, tenant_id)
+    if entry is not None:
+        entry.is_active = is_active
+
+
+def remove_balance(session, tenant_id):
+    """Remove the ledger row of a permanently deleted tenant"""
+    session.query(TenantBalance).filter(TenantBalance.tenant_id == tenant_id).delete(
+        synchronize_session=False
+    )
+
+
+def rebuild(session, as_of_date=None):
+    """Drop and recompute every ledger row. Returns the number of rows written"""
+    session.query(TenantBalance).delete(synchronize_session=False)
+    return len(refresh_balances(session, None, as_of_date))
+
+
+def verify(session, tolerance=0.005):
+    """Check stored balances against the reference Tenant.get_balance computation.
+
+    Returns:
+        dict: checked row count, list of (tenant_id, stored, expected)
+              mismatches and IDs of tenants without a ledger row
+    """
+    report = {"checked": 0, "mismatches": [], "missing": []}
+    entries = {entry.tenant_id: entry for entry in session.query(TenantBalance).all()}
+
+    tenants = session.query(Tenant).options(
+        selectinload(Tenant.payments), selectinload(Tenant.rent_history)
+    )
+    for tenant in tenants.all():
+        entry = entries.get(tenant.id)
+        if entry is None:
+            report["missing"].append(tenant.id)
+            continue
+
+        report["checked"] += 1
+        expected = tenant.get_balance(entry.computed_on)
+        if abs(entry.balance - expected) > tolerance:
+            report["mismatches"].append((tenant.id, entry.balance, expected))
+    return report
+
+
+def main(argv=None):
+    """Command line entry point: rebuild or verify the balance ledger"""
+    from .database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Manage the tenant balance ledger")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()
+    if args.command == "rebuild":
+        count = db.rebuild_balances()
+        print(f"Rebuilt {count} tenant balances")
+        return 0
+
+    report = db.verify_balances()
+    print(f"Checked {report['checked']} tenant balances")
+    for tenant_id, stored, expected in report["mismatches"]:
+        print(f"  Tenant {tenant_id}: stored {stored:.2f}, expected {expected:.2f}")
+    if report["missing"]:
+        print(f"  {len(report['missing'])} tenants have no ledger row yet")
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
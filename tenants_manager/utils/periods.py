@@ -0,0 +1,386 @@
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, insert, inspect
+
+from ..models.tenant import (
+    Tenant,
+    RentHistory,
+    BalanceSnapshot,
+    ClosedPeriod,
+    iter_rent_charges,
+    rent_segments,
+)
+from .balances import get_balance_components, month_end, month_range, to_date
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Closing a month writes one snapshot per tenant with the balance movements of
+# the month. The closing balance is the balance on the month's last day, so a
+# balance as of the end of a closed month is read instead of computed.
+# Payments dated in a closed month are refused until the month is reopened,
+# and so are edits to entry dates, rents and rent history that would change
+# a closed month's balances (see guard_sessions). Changes made outside the
+# ORM need the month closed again to refresh its snapshots, see verify.
+
+
+def closed_months(session):
+    """First days of the closed months, oldest first"""
+    return [
+        month
+        for (month,) in session.query(ClosedPeriod.month).order_by(ClosedPeriod.month)
+    ]
+
+
+def is_closed(session, value):
+    """Check if the month of a date is closed"""
+    month = to_date(value).replace(day=1)
+    return session.get(ClosedPeriod, month) is not None
+
+
+def check_open(session, value):
+    """Raise ValueError if the month of a date is closed"""
+    if is_closed(session, value):
+        raise ValueError(
+            f"Period {to_date(value):%m/%Y} is closed, reopen it before changing it"
+        )
+
+
+def check_open_since(session, value):
+    """Raise ValueError if the month of a date or any later month is closed.
+
+    Balances carry forward, so a change from a date on alters every month
+    that ends after it.
+    """
+    month = to_date(value).replace(day=1)
+    last_closed = (
+        session.query(func.max(ClosedPeriod.month))
+        .filter(ClosedPeriod.month >= month)
+        .scalar()
+    )
+    if last_closed is not None:
+        raise ValueError(
+            f"Period {last_closed:%m/%Y} is closed and the change reaches back "
+            f"to {to_date(value):%d/%m/%Y}, reopen it before changing it"
+        )
+
+
+def _changed_values(obj, *names):
+    """Old and new values of the attributes a pending change sets"""
+    state = inspect(obj)
+    values = []
+    for name in names:
+        history = state.attrs[name].history
+        if history.has_changes():
+            values.extend(value for value in history.deleted + history.added if value)
+    return values
+
+
+def _first_default_rent_date(tenant):
+    """First rent date billed at Tenant.rent because no history covers it"""
+    segments = rent_segments(tenant.rent_history)
+    for charge_date, amount in iter_rent_charges(
+        tenant.entry_date, None, segments, None, to_date()
+    ):
+        if amount is None:
+            return charge_date
+    return None
+
+
+def changed_from(session):
+    """Earliest date whose balance the session's pending changes alter.
+
+    Only edits to existing tenants count: entry_date (old or new value),
+    rent where the rent history leaves months billed at it, and rent
+    history records. New tenants have no snapshots to contradict.
+
+    Returns:
+        date: or None when no balance changes
+    """
+    dates = []
+    for obj in session.dirty:
+        if isinstance(obj, Tenant):
+            dates.extend(to_date(value) for value in _changed_values(obj, "entry_date"))
+            if _changed_values(obj, "rent"):
+                first = _first_default_rent_date(obj)
+                if first is not None:
+                    dates.append(first)
+        elif isinstance(obj, RentHistory):
+            dates.extend(
+                to_date(value) for value in _changed_values(obj, "valid_from", "valid_to")
+            )
+            if _changed_values(obj, "amount"):
+                dates.append(to_date(obj.valid_from))
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, RentHistory) and obj.tenant_id is not None:
+            dates.append(to_date(obj.valid_from))
+    return min(dates) if dates else None
+
+
+def guard_sessions(session_factory):
+    """Refuse flushes of the factory's sessions that change closed months.
+
+    The flush raises ValueError (see check_open_since), so the transaction
+    is rolled back as a whole.
+    """
+
+    def before_flush(session, flush_context, instances):
+        first = changed_from(session)
+        if first is not None:
+            check_open_since(session, first)
+
+    event.listen(session_factory, "before_flush", before_flush)
+
+
+def _snapshot_rows(month, opening, closing, tenant_ids):
+    """Snapshot column values from the balance components on both month ends"""
+    now = datetime.utcnow()
+    rows = []
+    for tenant_id in tenant_ids:
+        due_before, paid_before = opening.get(tenant_id, (0.0, 0.0))
+        due, paid = closing.get(tenant_id, (0.0, 0.0))
+        rows.append(
+            {
+                "tenant_id": tenant_id,
+                "month": month,
+                "opening_balance": due_before - paid_before,
+                "charges": due - due_before,
+                "payments": paid - paid_before,
+                "closing_balance": due - paid,
+                "created_at": now,
+            }
+        )
+    return rows
+
+
+def compute_snapshots(session, month, opening=None):
+    """Compute the snapshot rows of every tenant, entered by then or not.
+
+    Args:
+        month (date): Any day of the month
+        opening (dict, optional): Balance components on the day before the
+            month, as returned by get_balance_components; queried if None
+
+    Returns:
+        tuple: (list of BalanceSnapshot column dicts, balance components on
+               the month's last day)
+    """
+    month, next_month = month_range(month)
+    if opening is None:
+        opening = get_balance_components(session, month - timedelta(days=1))
+    closing = get_balance_components(session, next_month - timedelta(days=1))
+    tenant_ids = [tenant_id for (tenant_id,) in session.query(Tenant.id)]
+    return _snapshot_rows(month, opening, closing, tenant_ids), closing
+
+
+def _write_period(session, month, rows):
+    session.query(BalanceSnapshot).filter(BalanceSnapshot.month == month).delete(
+        synchronize_session=False
+    )
+    if rows:
+        session.execute(insert(BalanceSnapshot), rows)
+    session.merge(ClosedPeriod(month=month, closed_at=datetime.utcnow()))
+
+
+def close_period(session, month):
+    """Close a past month, (re)writing its snapshots.
+
+    The caller is responsible for committing the session.
+
+    Returns:
+        int: Number of snapshots written
+    """
+    month = to_date(month).replace(day=1)
+    if month_end(month) >= to_date():
+        raise ValueError(f"Period {month:%m/%Y} has not ended yet")
+
+    rows, _ = compute_snapshots(session, month)
+    _write_period(session, month, rows)
+    logger.info(f"Closed {month:%m/%Y} with {len(rows)} snapshots")
+    return len(rows)
+
+
+def reopen_period(session, month):
+    """Reopen a month and every closed month after it.
+
+    Later months are reopened too, as their balances carry the month's
+    changes forward. The caller is responsible for committing the session.
+
+    Returns:
+        list: First days of the reopened months
+    """
+    month = to_date(month).replace(day=1)
+    reopened = [
+        value
+        for (value,) in session.query(ClosedPeriod.month)
+        .filter(ClosedPeriod.month >= month)
+        .order_by(ClosedPeriod.month)
+    ]
+    session.query(BalanceSnapshot).filter(BalanceSnapshot.month >= month).delete(
+        synchronize_session=False
+    )
+    session.query(ClosedPeriod).filter(ClosedPeriod.month >= month).delete(
+        synchronize_session=False
+    )
+    return reopened
+
+
+def backfill(session, until=None):
+    """Close every month from the first entry date up to until.
+
+    Months already closed are left as they are. Uses two queries per month,
+    the closing components of a month being the opening of the next.
+
+    Args:
+        until (date, optional): Any day of the last month to close,
+            defaults to the last month that has ended
+
+    Returns:
+        list: First days of the months closed
+    """
+    if until is None:
+        until = to_date().replace(day=1) - timedelta(days=1)
+    until = to_date(until).replace(day=1)
+    if month_end(until) >= to_date():
+        raise ValueError(f"Period {until:%m/%Y} has not ended yet")
+
+    first_entry = session.query(func.min(Tenant.entry_date)).scalar()
+    if first_entry is None:
+        return []
+
+    already_closed = set(closed_months(session))
+    month = to_date(first_entry).replace(day=1)
+    opening = get_balance_components(session, month - timedelta(days=1))
+    closed = []
+    while month <= until:
+        rows, opening = compute_snapshots(session, month, opening)
+        if month not in already_closed:
+            _write_period(session, month, rows)
+            closed.append(month)
+        month = month_range(month)[1]
+
+    logger.info(f"Backfilled {len(closed)} closed periods")
+    return closed
+
+
+def get_closing_entries(session, tenant_ids=None, as_of_date=None):
+    """Read balances as of the last day of a closed month from its snapshots.
+
+    Returns:
+        dict: {tenant_id: (balance, valid_from, valid_until)} like
+              ledger.get_entries; empty unless as_of_date is the last day
+              of a closed month
+    """
+    as_of_date = to_date(as_of_date)
+    if as_of_date != month_end(as_of_date):
+        return {}
+
+    query = session.query(
+        BalanceSnapshot.tenant_id, BalanceSnapshot.closing_balance
+    ).filter(BalanceSnapshot.month == as_of_date.replace(day=1))
+    if tenant_ids is not None:
+        query = query.filter(BalanceSnapshot.tenant_id.in_(list(tenant_ids)))
+    return {
+        tenant_id: (balance, as_of_date, as_of_date) for tenant_id, balance in query
+    }
+
+
+def remove_snapshots(session, tenant_id):
+    """Remove the snapshots of a permanently deleted tenant"""
+    session.query(BalanceSnapshot).filter(
+        BalanceSnapshot.tenant_id == tenant_id
+    ).delete(synchronize_session=False)
+
+
+def verify(session, tolerance=0.005):
+    """Check the snapshots of closed months against a fresh computation.
+
+    Returns:
+        dict: checked snapshot count and a list of
+              (month, tenant_id, stored, expected) closing balance mismatches
+    """
+    report = {"checked": 0, "mismatches": []}
+    for month in closed_months(session):
+        rows, _ = compute_snapshots(session, month)
+        expected = {row["tenant_id"]: row["closing_balance"] for row in rows}
+        stored = session.query(
+            BalanceSnapshot.tenant_id, BalanceSnapshot.closing_balance
+        ).filter(BalanceSnapshot.month == month)
+        for tenant_id, balance in stored:
+            report["checked"] += 1
+            computed = expected.pop(tenant_id, 0.0)
+            if abs(balance - computed) > tolerance:
+                report["mismatches"].append((month, tenant_id, balance, computed))
+        # Tenants added after the month was closed
+        for tenant_id, balance in expected.items():
+            report["mismatches"].append((month, tenant_id, None, balance))
+    return report
+
+
+def parse_month(value):
+    """Parse a YYYY-MM command line argument to the first day of the month"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a month as YYYY-MM, got {value!r}")
+
+
+def main(argv=None):
+    """Command line entry point: close, reopen, backfill or verify periods"""
+    from .database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Manage closed balance periods")
+    commands = parser.add_subparsers(dest="command", required=True)
+    close_parser = commands.add_parser("close", help="Close a month")
+    close_parser.add_argument("month", type=parse_month, help="YYYY-MM")
+    reopen_parser = commands.add_parser(
+        "reopen", help="Reopen a month and the months after it"
+    )
+    reopen_parser.add_argument("month", type=parse_month, help="YYYY-MM")
+    backfill_parser = commands.add_parser(
+        "backfill", help="Close every month up to the last one that ended"
+    )
+    backfill_parser.add_argument(
+        "--until", type=parse_month, help="Last month to close (YYYY-MM)"
+    )
+    commands.add_parser("list", help="List the closed months")
+    commands.add_parser("verify", help="Check the snapshots against the history")
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()
+    try:
+        if args.command == "close":
+            count = db.close_period(args.month)
+            print(f"Closed {args.month:%m/%Y} with {count} tenant snapshots")
+        elif args.command == "backfill":
+            months = db.backfill_periods(args.until)
+            print(f"Closed {len(months)} months")
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == "reopen":
+        months = db.reopen_period(args.month)
+        if not months:
+            print(f"{args.month:%m/%Y} is not closed")
+        for month in months:
+            print(f"Reopened {month:%m/%Y}")
+    elif args.command == "list":
+        for month in db.get_closed_periods():
+            print(f"{month:%m/%Y}")
+    elif args.command == "verify":
+        report = db.verify_periods()
+        print(f"Checked {report['checked']} balance snapshots")
+        for month, tenant_id, stored, expected in report["mismatches"]:
+            stored = "missing" if stored is None else f"{stored:.2f}"
+            print(
+                f"  {month:%m/%Y} tenant {tenant_id}: stored {stored}, "
+                f"expected {expected:.2f}"
+            )
+        return 1 if report["mismatches"] else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
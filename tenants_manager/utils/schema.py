@@ -0,0 +1,110 @@
+import ast
+import logging
+import re
+from functools import lru_cache
+from sqlalchemy import inspect, text
+
+from ..config.database import BASE_DIR
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Alembic migration scripts and the table where Alembic stamps the revisions
+# applied to a database. The revision identifiers are read from the scripts
+# as text, so checking the schema at startup does not import Alembic.
+VERSIONS_DIR = BASE_DIR / "migrations" / "versions"
+VERSION_TABLE = "alembic_version"
+
+_REVISION = re.compile(r"^(down_revision|revision)\b[^=\n]*=\s*(.+)$", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def get_head_revisions(versions_dir=VERSIONS_DIR):
+    """Revisions no other migration builds on, as a frozenset.
+
+    Empty when the migration scripts are not available.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        values = dict(_REVISION.findall(path.read_text(encoding="utf-8")))
+        if "revision" not in values:
+            continue
+        try:
+            revisions.add(ast.literal_eval(values["revision"]))
+            down_revision = ast.literal_eval(values.get("down_revision", "None"))
+        except (ValueError, SyntaxError):
+            logger.warning(f"Could not read the revision of {path.name}")
+            return frozenset()
+        if isinstance(down_revision, str):
+            parents.add(down_revision)
+        elif down_revision:
+            parents.update(down_revision)
+    return frozenset(revisions - parents)
+
+
+def get_stamped_revisions(connection):
+    """Revisions stamped in the database, empty if it was never stamped"""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return frozenset()
+    rows = connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}"))
+    return frozenset(version for version, in rows)
+
+
+def is_schema_current(engine):
+    """Whether the database is stamped with the head revisions"""
+    heads = get_head_revisions()
+    if not heads:
+        return False
+    with engine.connect() as connection:
+        return get_stamped_revisions(connection) == heads
+
+
+def matches_models(connection, metadata):
+    """Whether every table and column of the models exists in the database"""
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            return False
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        if not columns.issuperset(table.columns.keys()):
+            return False
+    return True
+
+
+def stamp_head(engine, metadata):
+    """Stamp the head revisions if the schema matches the models.
+
+    Used after creating the schema from the models, so later starts can
+    trust the stamp instead of checking the tables again. A database with
+    columns missing is left unstamped for the migrations to upgrade.
+
+    Returns:
+        bool: True if the database was stamped
+    """
+    heads = get_head_revisions()
+    if not heads:
+        return False
+    with engine.begin() as connection:
+        if get_stamped_revisions(connection):
+            return False
+        if not matches_models(connection, metadata):
+            logger.warning(
+                "Database schema is older than the models, run the migrations"
+            )
+            return False
+        # Same table Alembic creates for its version stamps
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+                "version_num VARCHAR(32) NOT NULL, "
+                f"CONSTRAINT {VERSION_TABLE}_pkc PRIMARY KEY (version_num))"
+            )
+        )
+        for head in sorted(heads):
+            connection.execute(
+                text(f"INSERT INTO {VERSION_TABLE} (version_num) VALUES (:head)"),
+                {"head": head},
+            )
+    logger.info(f"Database stamped at {', '.join(sorted(heads))}")
+    return True
@@ -0,0 +1,192 @@
+import logging
+import re
+import unicodedata
+from sqlalchemy import Float, Integer, text
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Full-text indexes over the searchable tenant and payment columns. The
+# rowid of each FTS row is the id of the tenant or payment it indexes and
+# triggers keep both tables in sync with their source rows. The same
+# statements are applied by the add_search_index migration.
+TENANT_COLUMNS = "name, bi, email, phone, address, room_name"
+
+TENANT_VALUES = (
+    "new.id, new.name, new.bi, new.email, new.phone, new.address, "
+    "(SELECT name FROM rooms WHERE id = new.room_id)"
+)
+
+SEARCH_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS tenants_fts USING fts5(
+        {TENANT_COLUMNS}, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    # Rank name and BI matches above contact details
+    """
+    INSERT INTO tenants_fts (tenants_fts, rank)
+    VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 1.0, 1.0, 2.0)')
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS payments_fts USING fts5(
+        description, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tenants_fts_insert AFTER INSERT ON tenants BEGIN
+        INSERT INTO tenants_fts (rowid, {TENANT_COLUMNS}) VALUES ({TENANT_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tenants_fts_update
+    AFTER UPDATE OF id, name, bi, email, phone, address, room_id ON tenants BEGIN
+        DELETE FROM tenants_fts WHERE rowid = old.id;
+        INSERT INTO tenants_fts (rowid, {TENANT_COLUMNS}) VALUES ({TENANT_VALUES});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tenants_fts_delete AFTER DELETE ON tenants BEGIN
+        DELETE FROM tenants_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS rooms_fts_update AFTER UPDATE OF name ON rooms BEGIN
+        UPDATE tenants_fts SET room_name = new.name
+        WHERE rowid IN (SELECT id FROM tenants WHERE room_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS payments_fts_insert AFTER INSERT ON payments BEGIN
+        INSERT INTO payments_fts (rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS payments_fts_update
+    AFTER UPDATE OF id, description ON payments BEGIN
+        DELETE FROM payments_fts WHERE rowid = old.id;
+        INSERT INTO payments_fts (rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS payments_fts_delete AFTER DELETE ON payments BEGIN
+        DELETE FROM payments_fts WHERE rowid = old.id;
+    END
+    """,
+]
+
+# Refill both indexes from the source tables
+SEARCH_REBUILD = [
+    "DELETE FROM tenants_fts",
+    f"""
+    INSERT INTO tenants_fts (rowid, {TENANT_COLUMNS})
+    SELECT tenants.id, tenants.name, tenants.bi, tenants.email, tenants.phone,
+           tenants.address, rooms.name
+    FROM tenants LEFT JOIN rooms ON rooms.id = tenants.room_id
+    """,
+    "DELETE FROM payments_fts",
+    """
+    INSERT INTO payments_fts (rowid, description)
+    SELECT id, description FROM payments
+    """,
+]
+
+
+def has_search_index(engine):
+    """Whether both full-text tables exist, without creating anything"""
+    if engine.dialect.name != "sqlite":
+        return False
+
+    with engine.connect() as connection:
+        existing = connection.execute(
+            text(
+                "SELECT COUNT(*) FROM sqlite_master "
+                "WHERE type = 'table' AND name IN ('tenants_fts', 'payments_fts')"
+            )
+        ).scalar()
+    return existing == 2
+
+
+def ensure_search_index(engine):
+    """Create the full-text indexes and triggers if they do not exist yet.
+
+    Databases upgraded with Alembic already have them; this covers databases
+    created directly from the models. Existing rows are indexed when the
+    tables are first created.
+
+    Returns:
+        bool: False when SQLite was built without FTS5
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+
+    try:
+        with engine.begin() as connection:
+            existing = connection.execute(
+                text(
+                    "SELECT COUNT(*) FROM sqlite_master "
+                    "WHERE type = 'table' AND name IN ('tenants_fts', 'payments_fts')"
+                )
+            ).scalar()
+            for statement in SEARCH_SCHEMA:
+                connection.execute(text(statement))
+            if existing < 2:
+                for statement in SEARCH_REBUILD:
+                    connection.execute(text(statement))
+        return True
+    except Exception as e:
+        logger.warning(f"Full-text search unavailable, using LIKE search: {str(e)}")
+        return False
+
+
+def _words(value):
+    """Lowercase words without diacritics, split like the unicode61 tokenizer"""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.findall(r"[^\W_]+", plain.lower())
+
+
+def build_match_query(search_term):
+    """Turn user input into an FTS5 query matching every word as a prefix.
+
+    Returns:
+        str: The MATCH expression, or None when the term has no words
+    """
+    words = _words(search_term)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def text_matches(search_term, value):
+    """Whether value matches build_match_query(search_term), evaluated in Python"""
+    terms = _words(search_term)
+    if not terms:
+        return False
+    words = _words(value)
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+def tenant_matches(match_query):
+    """Subquery of (id, rank) for tenants matching an FTS5 query, best first"""
+    return (
+        text(
+            "SELECT rowid AS id, rank FROM tenants_fts "
+            "WHERE tenants_fts MATCH :tenant_query"
+        )
+        .bindparams(tenant_query=match_query)
+        .columns(id=Integer, rank=Float)
+        .subquery("tenant_matches")
+    )
+
+
+def payment_matches(match_query):
+    """Select of payment ids whose description matches an FTS5 query"""
+    return (
+        text(
+            "SELECT rowid AS id FROM payments_fts "
+            "WHERE payments_fts MATCH :payment_query"
+        )
+        .bindparams(payment_query=match_query)
+        .columns(id=Integer)
+    )
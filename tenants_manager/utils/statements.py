@@ -0,0 +1,236 @@
+import argparse
+import heapq
+import logging
+import sys
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from itertools import groupby
+
+from ..models.tenant import (
+    Tenant,
+    Payment,
+    PaymentStatus,
+    RentHistory,
+    iter_rent_charges,
+    rent_segments,
+)
+from . import ledger
+from .export import WRITERS
+from .balances import to_date
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Tenants read per round of queries; memory use is bounded by one chunk
+CHUNK_SIZE = 500
+
+# One line of a statement. kind is "opening", "rent", "payment" or "closing";
+# amount is signed (payments are negative) and None on the opening and
+# closing lines, balance is the running balance after the line.
+StatementLine = namedtuple(
+    "StatementLine", "tenant_id date kind amount balance reference description"
+)
+
+# Rent is charged before payments made on the same day
+_RENT, _PAYMENT = 0, 1
+
+
+def _rent_lines(tenant, history, start_date, end_date):
+    """(date, order, amount, reference, description) for the rent charges"""
+    segments = rent_segments(history)
+    for charge_date, amount in iter_rent_charges(
+        tenant.entry_date, tenant.rent, segments, start_date, end_date
+    ):
+        yield charge_date, _RENT, amount, charge_date.strftime("%Y-%m"), ""
+
+
+def _payment_lines(payments):
+    """(date, order, amount, reference, description) for the payments"""
+    for payment in payments:
+        yield (
+            payment.payment_date,
+            _PAYMENT,
+            -payment.amount,
+            payment.reference_month.strftime("%Y-%m") if payment.reference_month else "",
+            payment.description or "",
+        )
+
+
+def _sort_key(line):
+    # Rent dates are dates and payment dates datetimes: compare days first
+    return to_date(line[0]), line[1], line[0]
+
+
+def _history_by_tenant(session, tenant_ids):
+    """Rent history records of the given tenants, grouped per tenant"""
+    rows = (
+        session.query(
+            RentHistory.tenant_id,
+            RentHistory.valid_from,
+            RentHistory.valid_to,
+            RentHistory.amount,
+        )
+        .filter(RentHistory.tenant_id.in_(tenant_ids))
+        .order_by(RentHistory.tenant_id, RentHistory.valid_from, RentHistory.id)
+    )
+    return {
+        tenant_id: list(records)
+        for tenant_id, records in groupby(rows, key=lambda row: row.tenant_id)
+    }
+
+
+def _payments_by_tenant(session, tenant_ids, start_date, end_date):
+    """Completed payments in the range, streamed in (tenant_id, payment_date) order.
+
+    The order matches ix_payments_tenant_id_payment_date, so SQLite walks
+    the index instead of sorting. Yields (tenant_id, payments) pairs.
+    """
+    rows = (
+        session.query(
+            Payment.tenant_id,
+            Payment.payment_date,
+            Payment.amount,
+            Payment.reference_month,
+            Payment.description,
+        )
+        .filter(
+            Payment.tenant_id.in_(tenant_ids),
+            Payment.status == PaymentStatus.COMPLETED,
+            Payment.payment_date >= datetime.combine(start_date, time()),
+            # Half-open upper bound so the whole end_date day is included
+            Payment.payment_date < datetime.combine(end_date + timedelta(days=1), time()),
+        )
+        .order_by(Payment.tenant_id, Payment.payment_date, Payment.id)
+        .yield_per(CHUNK_SIZE)
+    )
+    return groupby(rows, key=lambda row: row.tenant_id)
+
+
+def _tenant_lines(tenant, opening, history, payments, start_date, end_date):
+    """Statement lines of one tenant, merging charges and payments by date"""
+    # Balances are shown to the cent; the running total itself is not rounded
+    balance = opening
+    yield StatementLine(tenant.id, start_date, "opening", None, round(balance, 2), "", "")
+    for line_date, order, amount, reference, description in heapq.merge(
+        _rent_lines(tenant, history, start_date, end_date),
+        _payment_lines(payments),
+        key=_sort_key,
+    ):
+        balance += amount
+        yield StatementLine(
+            tenant.id,
+            line_date,
+            "rent" if order == _RENT else "payment",
+            amount,
+            round(balance, 2),
+            reference,
+            description,
+        )
+    yield StatementLine(tenant.id, end_date, "closing", None, round(balance, 2), "", "")
+
+
+def iter_statements(
+    session,
+    start_date,
+    end_date=None,
+    tenant_ids=None,
+    include_deleted=True,
+    chunk_size=CHUNK_SIZE,
+):
+    """Stream the rent statements of many tenants between two dates.
+
+    Tenants are read in id order, chunk_size at a time. Per chunk the
+    opening balances (the balance on the day before start_date) come from
+    the ledger, and the rent history and the payments in the range are
+    each read with one ordered query, so only one chunk of tenants is held
+    in memory however many are exported.
+
+    Yields:
+        StatementLine: per tenant an opening line, the rent charges and
+        completed payments in date order, and a closing line
+    """
+    start_date = to_date(start_date)
+    end_date = to_date(end_date)
+
+    query = session.query(Tenant.id, Tenant.entry_date, Tenant.rent).order_by(Tenant.id)
+    if tenant_ids is not None:
+        query = query.filter(Tenant.id.in_(list(tenant_ids)))
+    if not include_deleted:
+        query = query.filter(Tenant.is_active == True)
+
+    last_id = None
+    while True:
+        # Keyset pagination on the primary key, so no cursor is left open
+        # between chunks and each chunk starts with an index seek
+        page = query if last_id is None else query.filter(Tenant.id > last_id)
+        chunk = page.limit(chunk_size).all()
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+        ids = [tenant.id for tenant in chunk]
+        openings = ledger.get_entries(session, ids, start_date - timedelta(days=1))
+        history = _history_by_tenant(session, ids)
+        payments = {
+            tenant_id: list(rows)
+            for tenant_id, rows in _payments_by_tenant(session, ids, start_date, end_date)
+        }
+
+        for tenant in chunk:
+            yield from _tenant_lines(
+                tenant,
+                openings[tenant.id][0],
+                history.get(tenant.id, []),
+                payments.get(tenant.id, []),
+                start_date,
+                end_date,
+            )
+
+
+def iter_statement(session, tenant_id, start_date, end_date=None):
+    """Stream the rent statement of one tenant, see iter_statements"""
+    return iter_statements(session, start_date, end_date, tenant_ids=[tenant_id])
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD command line argument"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a date as YYYY-MM-DD, got {value!r}")
+
+
+def main(argv=None):
+    """Command line entry point: export rent statements to stdout or a file"""
+    from .database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Export rent statements")
+    parser.add_argument("start", type=parse_date, help="First day (YYYY-MM-DD)")
+    parser.add_argument("end", type=parse_date, nargs="?", help="Last day, default today")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--tenant", type=int, action="append", help="Tenant id, repeatable")
+    parser.add_argument("--active", action="store_true", help="Skip deleted tenants")
+    parser.add_argument("--output", help="Output file, default stdout")
+    args = parser.parse_args(argv)
+    if args.end and args.end < args.start:
+        parser.error("end is before start")
+
+    db = DatabaseManager()
+    stream = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = db.export_statements(
+            stream,
+            args.start,
+            args.end,
+            format=args.format,
+            tenant_ids=args.tenant,
+            include_deleted=not args.active,
+        )
+    finally:
+        if args.output:
+            stream.close()
+    print(f"Wrote {count} statement lines", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
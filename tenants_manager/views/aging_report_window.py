@@ -0,0 +1,148 @@
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QTableView,
+    QAbstractItemView,
+    QPushButton,
+    QLabel,
+    QMessageBox,
+    QHeaderView,
+    QDateEdit,
+    QComboBox,
+)
+from PyQt6.QtCore import Qt, QDate
+
+from tenants_manager.utils.aging import BUCKETS
+from tenants_manager.utils.database import get_database_manager
+from tenants_manager.views.payment_history_window import PaymentHistoryWindow
+from tenants_manager.views.query_runner import QueryRunner, fetch_aging_report
+from tenants_manager.views.table_models import AgingTableModel, RoomAgingModel
+
+
+class AgingReportWindow(QDialog):
+    """Outstanding rent by age, per tenant or per room"""
+
+    def __init__(self, as_of_date=None, parent_widget=None):
+        super().__init__(parent_widget)
+        self.db = get_database_manager()
+        self.setWindowTitle("Antiguidade da Dívida")
+        self.setMinimumSize(900, 600)
+
+        self.queries = QueryRunner(self)
+        self.init_ui(as_of_date)
+        self.load_report()
+
+    def init_ui(self, as_of_date):
+        layout = QVBoxLayout(self)
+
+        # Date and grouping
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Data:"))
+        self.as_of_date = QDateEdit()
+        self.as_of_date.setCalendarPopup(True)
+        self.as_of_date.setDisplayFormat("dd/MM/yyyy")
+        self.as_of_date.setDate(QDate(as_of_date) if as_of_date else QDate.currentDate())
+        self.as_of_date.dateChanged.connect(self.load_report)
+        filter_layout.addWidget(self.as_of_date)
+
+        filter_layout.addWidget(QLabel("Agrupar por:"))
+        self.group_by = QComboBox()
+        self.group_by.addItems(["Inquilino", "Quarto"])
+        self.group_by.currentIndexChanged.connect(self.on_group_changed)
+        filter_layout.addWidget(self.group_by)
+        filter_layout.addStretch()
+
+        refresh_btn = QPushButton("Atualizar")
+        refresh_btn.clicked.connect(self.load_report)
+        filter_layout.addWidget(refresh_btn)
+        layout.addLayout(filter_layout)
+
+        # Portfolio totals
+        self.total_label = QLabel()
+        self.total_label.setStyleSheet("font-weight: bold; font-size: 14px; padding: 5px;")
+        layout.addWidget(self.total_label)
+
+        # Table; the models are swapped when the grouping changes
+        self.tenant_model = AgingTableModel(self)
+        self.room_model = RoomAgingModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.tenant_model)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(AgingTableModel.HEADERS)):
+            self.table.setColumnWidth(column, 110)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.doubleClicked.connect(self.view_payment_history)
+        layout.addWidget(self.table)
+
+        # Bottom buttons
+        button_box = QHBoxLayout()
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.accept)
+        button_box.addStretch()
+        button_box.addWidget(close_btn)
+        layout.addLayout(button_box)
+
+    def load_report(self):
+        """Load the report for the selected date in the background"""
+        self.total_label.setText("A calcular...")
+        self.queries.submit(
+            "aging",
+            fetch_aging_report,
+            self.db,
+            self.as_of_date.date().toPyDate(),
+            on_result=self.show_report,
+            on_error=self.show_error,
+        )
+
+    def show_report(self, report):
+        """Fill both tables and the totals from an aging.AgingReport"""
+        self.tenant_model.set_rows(report.tenants)
+        self.room_model.set_rows(report.rooms)
+
+        total = report.total
+        amounts = (
+            total.days_0_30,
+            total.days_31_60,
+            total.days_61_90,
+            total.days_over_90,
+        )
+        buckets = " | ".join(
+            f"{label} dias: {amount:.2f} €" for label, amount in zip(BUCKETS, amounts)
+        )
+        self.total_label.setText(
+            f"Em dívida: {sum(amounts):.2f} € ({total.in_arrears} de "
+            f"{total.tenants} inquilinos) | {buckets}"
+        )
+
+    def show_error(self, message):
+        self.total_label.setText("")
+        QMessageBox.critical(self, "Erro", f"Erro ao calcular a antiguidade: {message}")
+
+    def on_group_changed(self, index):
+        self.table.setModel(self.room_model if index == 1 else self.tenant_model)
+        self.table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+
+    def view_payment_history(self, index):
+        """Open the payment history of a tenant row"""
+        if self.table.model() is not self.tenant_model:
+            return
+        row = self.tenant_model.row(index.row())
+        if row is None:
+            return
+        dialog = PaymentHistoryWindow(row.tenant_id, parent_widget=self)
+        dialog.exec()
+
+    def done(self, result):
+        # Drop a pending load; a running one finishes in the background
+        self.queries.cancel()
+        super().done(result)
@@ -4,8 +4,6 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QVBoxLayout,
     QWidget,
-    QTableWidget,
-    QTableWidgetItem,
     QMessageBox,
     QHBoxLayout,
     QStatusBar,
@@ -23,7 +21,7 @@ from PyQt6.QtWidgets import (
     QSplitter,
     QGroupBox,
 )
-from PyQt6.QtCore import Qt, QDate, QLocale
+from PyQt6.QtCore import Qt, QDate, QLocale, QTimer
 from PyQt6.QtGui import QAction
 
 import sys
@@ -44,8 +42,25 @@ if project_root not in sys.path:
 
 from tenants_manager.views.tenant_dialog import TenantDialog
 from tenants_manager.views.payment_history_window import PaymentHistoryWindow
+from tenants_manager.views.aging_report_window import AgingReportWindow
 from tenants_manager.models.tenant import Tenant, PaymentType, PaymentStatus, Room
-from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils.database import get_database_manager
+from tenants_manager.views.query_runner import (
+    QueryRunner,
+    ChangeNotifier,
+    balance_date,
+    fetch_tenant_page,
+    fetch_tenant_rows,
+    fetch_payment_overview,
+    fetch_rooms,
+    fetch_room_tenants,
+)
+from tenants_manager.views.table_models import (
+    TenantTableModel,
+    PaymentOverviewModel,
+    RoomTableModel,
+    RoomTenantModel,
+)
 
 
 class MainWindow(QMainWindow):
@@ -56,21 +71,29 @@ class MainWindow(QMainWindow):
             self.setWindowTitle("Gestor de Inquilinos")
             self.setMinimumSize(1024, 768)
 
-            logger.debug("Creating DatabaseManager...")
-            self.db_manager = DatabaseManager()
-            logger.debug("Getting database session...")
-            self.session = self.db_manager.get_session()
-
-            # Pagination variables
-            self.current_page = 1
-            self.rows_per_page = 20
+            logger.debug("Getting shared DatabaseManager...")
+            self.db_manager = get_database_manager()
+            # Table loads run on worker threads with their own sessions;
+            # everything else opens a db_manager.session_scope() per action
+            self.queries = QueryRunner(self)
+            # Committed changes patch the loaded tables, see on_data_changed
+            self.change_notifier = ChangeNotifier(self.db_manager, self)
+            self.change_notifier.changed.connect(self.on_data_changed)
+            # Tenant and room IDs of patches not applied yet, per tab
+            self.pending_patches = {}
+
+            # Tenant list: fetched in keyset chunks as the table scrolls
+            self.rows_per_page = 100
+            # Keyset cursor of the next chunk, None once everything is loaded
+            self.next_cursor = None
             self.total_tenants = 0
             self.search_term = ""
 
+            # Tables are filled once the window is on screen, see showEvent
+            self.data_loaded = False
+
             logger.debug("Initializing UI...")
             self.init_ui()
-            logger.debug("Loading tenants...")
-            self.load_tenants()
             logger.info("Application started successfully")
 
         except Exception as e:
@@ -82,12 +105,26 @@ class MainWindow(QMainWindow):
             )
             raise  # Re-raise the exception to see the full traceback
 
+    def showEvent(self, event):
+        """Start loading the tables the first time the window is shown"""
+        super().showEvent(event)
+        if not self.data_loaded:
+            self.data_loaded = True
+            # Let the window paint before the loads are queued
+            QTimer.singleShot(0, self.load_data)
+
+    def load_data(self):
+        """Load the tab on screen; the others load when first selected"""
+        self.refresh_if_stale(self.current_tab())
+
     def closeEvent(self, event):
         """Handle window close event"""
         try:
-            # Close database session
-            if self.session is not None:
-                self.session.close()
+            # Drop pending loads and let running ones finish
+            self.change_notifier.close()
+            self.queries.cancel()
+            self.queries.pool.waitForDone()
+
             event.accept()
         except Exception as e:
             logger.error(f"Error closing window: {str(e)}")
@@ -100,12 +137,35 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(main_widget)
         layout = QVBoxLayout(main_widget)
 
-        # Tab widget
+        # Tab widget. Each tab starts as an empty page and is built, then
+        # loaded, the first time it is selected; see ensure_tab.
         self.tabs = QTabWidget()
-        self.tabs.addTab(self.create_tenants_tab(), "Inquilinos")
-        self.tabs.addTab(self.create_contracts_tab(), "Contratos")
-        self.tabs.addTab(self.create_payments_tab(), "Pagamentos")
-        self.tabs.addTab(self.create_rooms_tab(), "Quartos")
+        self.tab_builders = {
+            "tenants": ("Inquilinos", self.create_tenants_tab),
+            "contracts": ("Contratos", self.create_contracts_tab),
+            "payments": ("Pagamentos", self.create_payments_tab),
+            "rooms": ("Quartos", self.create_rooms_tab),
+        }
+        self.tab_loaders = {
+            "tenants": self.load_tenants,
+            "payments": self.load_payments,
+            "rooms": self.load_rooms,
+        }
+        self.tab_patchers = {
+            "tenants": self.patch_tenants,
+            "payments": self.patch_payments,
+            "rooms": self.patch_rooms,
+        }
+        self.tab_keys = list(self.tab_builders)
+        self.built_tabs = set()
+        # Tabs whose data must be loaded before they are shown again
+        self.stale_tabs = set(self.tab_loaders)
+        for title, _ in self.tab_builders.values():
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, title)
+        self.ensure_tab(self.current_tab())
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         layout.addWidget(self.tabs)
 
@@ -119,6 +179,83 @@ class MainWindow(QMainWindow):
         separator.setFrameShadow(QFrame.Shadow.Sunken)
         layout.addWidget(separator)
 
+    def current_tab(self):
+        """Key of the selected tab in tab_builders"""
+        return self.tab_keys[self.tabs.currentIndex()]
+
+    def ensure_tab(self, key):
+        """Build the tab for key if it was not built yet"""
+        if key in self.built_tabs:
+            return
+        title, build = self.tab_builders[key]
+        logger.debug(f"Building tab {title}")
+        self.tabs.widget(self.tab_keys.index(key)).layout().addWidget(build())
+        self.built_tabs.add(key)
+
+    def on_tab_changed(self, index):
+        key = self.tab_keys[index]
+        self.ensure_tab(key)
+        self.refresh_if_stale(key)
+
+    def refresh_if_stale(self, key):
+        """Reload the tab for key if its data changed since it was loaded"""
+        # Nothing is loaded before the window is first shown
+        if not self.data_loaded or key not in self.stale_tabs:
+            return
+        self.stale_tabs.discard(key)
+        self.tab_loaders[key]()
+
+    def notify_data_changed(self, *keys):
+        """Mark the tabs for keys as stale after a change to their data.
+
+        The tab on screen reloads now, the others when next selected. Only
+        needed for changes the ChangeNotifier does not see; committed ORM
+        changes are patched in by on_data_changed.
+        """
+        self.stale_tabs.update(key for key in keys if key in self.tab_loaders)
+        self.refresh_if_stale(self.current_tab())
+
+    def on_data_changed(self, changes):
+        """Patch the loaded tables with the rows a commit changed"""
+        tenant_ids = changes.ids("tenants")
+        # Rooms changed themselves, their names show in the tenant lists
+        updated_rooms = changes.updated.get("rooms", set())
+        if tenant_ids or updated_rooms:
+            if self.search_term and changes.inserted.get("tenants"):
+                # Search results are ranked, a new match cannot be placed
+                self.notify_data_changed("tenants")
+            else:
+                self.patch_tab("tenants", tenant_ids, updated_rooms)
+            self.patch_tab("payments", tenant_ids, updated_rooms)
+        room_ids = changes.ids("rooms")
+        if room_ids:
+            self.patch_tab("rooms", (), room_ids)
+
+    def patch_tab(self, key, tenant_ids, room_ids):
+        """Update the rows of these tenants and rooms in a loaded tab
+
+        Tabs not loaded yet, or stale, load in full when shown instead.
+        Patches that have not arrived yet are merged with this one.
+        """
+        if not self.data_loaded or key not in self.built_tabs or key in self.stale_tabs:
+            return
+        if self.queries.is_pending(key):
+            # The full load on its way may have read the data before the change
+            self.tab_loaders[key]()
+            return
+        pending_tenants, pending_rooms = self.pending_patches.setdefault(
+            key, (set(), set())
+        )
+        pending_tenants.update(tenant_ids)
+        pending_rooms.update(room_ids)
+        self.tab_patchers[key](frozenset(pending_tenants), frozenset(pending_rooms))
+
+    def patch_error(self, key, message):
+        # Fall back to loading the tab in full
+        logger.error(f"Error patching {key}: {message}")
+        self.pending_patches.pop(key, None)
+        self.notify_data_changed(key)
+
     def create_rooms_tab(self):
         """Create the rooms management tab"""
         widget = QWidget()
@@ -153,14 +290,14 @@ class MainWindow(QMainWindow):
         rooms_layout = QVBoxLayout(rooms_widget)
         
         # Rooms table
-        self.rooms_table = QTableWidget()
-        self.rooms_table.setColumnCount(4)
-        self.rooms_table.setHorizontalHeaderLabels(["ID", "Nome", "Capacidade", "Ocupação"])
+        self.rooms_model = RoomTableModel(self)
+        self.rooms_table = QTableView()
+        self.rooms_table.setModel(self.rooms_model)
         self.rooms_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.rooms_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.rooms_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.rooms_table.doubleClicked.connect(self.edit_room)
-        self.rooms_table.itemSelectionChanged.connect(self.load_room_tenants)
+        self.rooms_table.selectionModel().selectionChanged.connect(self.load_room_tenants)
         
         # Set column widths
         self.rooms_table.setColumnWidth(0, 50)  # ID
@@ -179,9 +316,9 @@ class MainWindow(QMainWindow):
         tenants_layout = QVBoxLayout()
         
         # Tenants table
-        self.room_tenants_table = QTableWidget()
-        self.room_tenants_table.setColumnCount(3)
-        self.room_tenants_table.setHorizontalHeaderLabels(["Nome", "BI", "Telefone"])
+        self.room_tenants_model = RoomTenantModel(self)
+        self.room_tenants_table = QTableView()
+        self.room_tenants_table.setModel(self.room_tenants_model)
         self.room_tenants_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.room_tenants_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.room_tenants_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -203,9 +340,6 @@ class MainWindow(QMainWindow):
         # Add splitter to main layout
         layout.addWidget(splitter)
         
-        # Load rooms data
-        self.load_rooms()
-        
         return widget
         
     def show_room_context_menu(self, position):
@@ -243,24 +377,20 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            room = Room(name=name.strip(), capacity=capacity)
-            self.session.add(room)
-            self.session.commit()
-            self.load_rooms()
+            with self.db_manager.session_scope() as session:
+                session.add(Room(name=name.strip(), capacity=capacity))
             QMessageBox.information(self, "Sucesso", "Quarto adicionado com sucesso!")
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Error adding room: {str(e)}")
             QMessageBox.critical(self, "Erro", f"Erro ao adicionar quarto: {str(e)}")
     
     def edit_room(self):
         """Edit selected room"""
-        selected = self.rooms_table.currentRow()
-        if selected < 0:
+        room_id = self.selected_room_id()
+        if room_id is None:
             return
-            
-        room_id = int(self.rooms_table.item(selected, 0).text())
-        room = self.session.get(Room, room_id)
+
+        room = self.db_manager.get_room(room_id)
         
         if not room:
             QMessageBox.warning(self, "Aviso", "Quarto não encontrado!")
@@ -289,31 +419,31 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            room.name = name.strip()
-            room.capacity = capacity
-            self.session.commit()
-            self.load_rooms()
+            with self.db_manager.session_scope() as session:
+                record = session.get(Room, room.id)
+                if record is None:
+                    raise ValueError("Quarto não encontrado")
+                record.name = name.strip()
+                record.capacity = capacity
             QMessageBox.information(self, "Sucesso", "Quarto atualizado com sucesso!")
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Error updating room: {str(e)}")
             QMessageBox.critical(self, "Erro", f"Erro ao atualizar quarto: {str(e)}")
     
     def delete_room(self):
         """Delete selected room"""
-        selected = self.rooms_table.currentRow()
-        if selected < 0:
+        room_id = self.selected_room_id()
+        if room_id is None:
             return
-            
-        room_id = int(self.rooms_table.item(selected, 0).text())
-        room = self.session.get(Room, room_id)
+
+        room = self.db_manager.get_room(room_id)
         
         if not room:
             QMessageBox.warning(self, "Aviso", "Quarto não encontrado!")
             return
             
         # Check if room has tenants
-        if room.tenants:
+        if room.tenant_count:
             QMessageBox.warning(
                 self, 
                 "Aviso", 
@@ -333,127 +463,112 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                self.session.delete(room)
-                self.session.commit()
-                self.load_rooms()
+                with self.db_manager.session_scope() as session:
+                    record = session.get(Room, room.id)
+                    if record is not None:
+                        session.delete(record)
                 QMessageBox.information(self, "Sucesso", "Quarto removido com sucesso!")
             except Exception as e:
-                self.session.rollback()
                 logger.error(f"Error deleting room: {str(e)}")
                 QMessageBox.critical(self, "Erro", f"Erro ao remover quarto: {str(e)}")
     
     def load_rooms(self):
-        """Load rooms from the database"""
+        """Load rooms from the database in the background"""
+        self.queries.cancel("rooms_patch")
+        self.pending_patches.pop("rooms", None)
+        # Get search term
+        search_term = self.room_search_input.text().strip().lower()
+        self.queries.submit(
+            "rooms",
+            fetch_rooms,
+            self.db_manager,
+            search_term,
+            on_result=self.show_rooms,
+            on_error=self.show_rooms_error,
+        )
+
+    def patch_rooms(self, tenant_ids, room_ids):
+        self.queries.submit(
+            "rooms_patch",
+            fetch_rooms,
+            self.db_manager,
+            self.room_search_input.text().strip().lower(),
+            room_ids,
+            on_result=lambda rooms: self.apply_rooms_patch(room_ids, rooms),
+            on_error=lambda message: self.patch_error("rooms", message),
+        )
+
+    def apply_rooms_patch(self, room_ids, rooms):
+        """Patch the rooms table with rows from fetch_rooms"""
+        self.pending_patches.pop("rooms", None)
+        self.rooms_model.patch_rows(room_ids, rooms, lambda room: (room.name, room.id))
+        # Occupancy changed, so may have the tenants of the selected room
+        if self.selected_room_id() in room_ids:
+            self.load_room_tenants()
+
+    def show_rooms_error(self, message):
+        QMessageBox.critical(self, "Erro", f"Erro ao carregar quartos: {message}")
+
+    def selected_room_id(self):
+        """ID of the selected room, or None"""
+        room = self.rooms_model.row(self.rooms_table.currentIndex().row())
+        return room.id if room else None
+
+    def show_rooms(self, rooms):
+        """Fill the rooms table with rows from fetch_rooms"""
         try:
-            from tenants_manager.models.tenant import Room
-            
-            # Get search term
-            search_term = self.room_search_input.text().strip().lower()
-            
-            # Query rooms
-            query = self.session.query(Room)
-            
-            # Apply search filter
-            if search_term:
-                query = query.filter(Room.name.ilike(f"%{search_term}%"))
-            
-            # Order by name
-            query = query.order_by(Room.name)
-            
-            rooms = query.all()
-            
             # Store current selection
-            current_selection = None
-            if self.rooms_table.currentRow() >= 0:
-                current_selection = self.rooms_table.item(self.rooms_table.currentRow(), 0).text()
-            
+            current_selection = self.selected_room_id()
+
             # Update table
-            self.rooms_table.setRowCount(len(rooms))
-            
-            selected_row = -1
-            for row, room in enumerate(rooms):
-                # ID
-                self.rooms_table.setItem(row, 0, QTableWidgetItem(str(room.id)))
-                
-                # Name
-                self.rooms_table.setItem(row, 1, QTableWidgetItem(room.name))
-                
-                # Capacity
-                self.rooms_table.setItem(row, 2, QTableWidgetItem(str(room.capacity)))
-                
-                # Current occupancy
-                active_tenants = [t for t in room.tenants if t.is_active]
-                occupancy = len(active_tenants)
-                occupancy_item = QTableWidgetItem(f"{occupancy}/{room.capacity}")
-                
-                # Color code based on occupancy
-                if occupancy >= room.capacity:
-                    occupancy_item.setBackground(Qt.GlobalColor.red)
-                    occupancy_item.setForeground(Qt.GlobalColor.white)
-                elif occupancy == 0:
-                    occupancy_item.setBackground(Qt.GlobalColor.green)
-                else:
-                    occupancy_item.setBackground(Qt.GlobalColor.yellow)
-                
-                self.rooms_table.setItem(row, 3, occupancy_item)
-                
-                # Check if this was the previously selected room
-                if current_selection and str(room.id) == current_selection:
-                    selected_row = row
-            
+            self.rooms_model.set_rows(rooms)
+
             # Restore selection if possible
+            selected_row = (
+                self.rooms_model.find_row(current_selection)
+                if current_selection is not None
+                else -1
+            )
             if selected_row >= 0:
                 self.rooms_table.selectRow(selected_row)
-            elif self.rooms_table.rowCount() > 0:
+            elif self.rooms_model.rowCount() > 0:
                 self.rooms_table.selectRow(0)
-            
+
             # Load tenants for the selected room
             self.load_room_tenants()
-                
+
         except Exception as e:
             logger.error(f"Error loading rooms: {str(e)}")
             QMessageBox.critical(self, "Erro", f"Erro ao carregar quartos: {str(e)}")
-            return []
-    
+
     def load_room_tenants(self):
-        """Load tenants for the currently selected room"""
-        try:
-            from tenants_manager.models.tenant import Tenant
-            
-            # Clear the table
-            self.room_tenants_table.setRowCount(0)
-            
-            # Get selected room
-            selected_row = self.rooms_table.currentRow()
-            if selected_row < 0:
-                return
-                
-            room_id = int(self.rooms_table.item(selected_row, 0).text())
-            
-            # Query active tenants for this room
-            tenants = self.session.query(Tenant).filter(
-                Tenant.room_id == room_id,
-                Tenant.is_active == True
-            ).order_by(Tenant.name).all()
-            
-            # Update table
-            self.room_tenants_table.setRowCount(len(tenants))
-            
-            for row, tenant in enumerate(tenants):
-                # Name
-                self.room_tenants_table.setItem(row, 0, QTableWidgetItem(tenant.name))
-                
-                # BI
-                bi_item = QTableWidgetItem(tenant.bi or "")
-                self.room_tenants_table.setItem(row, 1, bi_item)
-                
-                # Phone
-                phone_item = QTableWidgetItem(tenant.phone or "")
-                self.room_tenants_table.setItem(row, 2, phone_item)
-                
-        except Exception as e:
-            logger.error(f"Error loading room tenants: {str(e)}")
-            QMessageBox.critical(self, "Erro", f"Erro ao carregar inquilinos do quarto: {str(e)}")
+        """Load tenants for the currently selected room in the background"""
+        # Clear the table
+        self.room_tenants_model.clear()
+
+        # Get selected room
+        room_id = self.selected_room_id()
+        if room_id is None:
+            self.queries.cancel("room_tenants")
+            return
+
+        self.queries.submit(
+            "room_tenants",
+            fetch_room_tenants,
+            self.db_manager,
+            room_id,
+            on_result=self.show_room_tenants,
+            on_error=self.show_room_tenants_error,
+        )
+
+    def show_room_tenants_error(self, message):
+        QMessageBox.critical(
+            self, "Erro", f"Erro ao carregar inquilinos do quarto: {message}"
+        )
+
+    def show_room_tenants(self, tenants):
+        """Fill the room tenants table with rows from fetch_room_tenants"""
+        self.room_tenants_model.set_rows(tenants)
 
     def create_tenants_tab(self):
         """Create the tenants management tab"""
@@ -474,7 +589,9 @@ class MainWindow(QMainWindow):
         # Search bar
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Pesquisar inquilino...")
+        self.search_input.setPlaceholderText(
+            "Pesquisar por nome, BI, email, telefone, morada ou quarto..."
+        )
         self.search_input.returnPressed.connect(self.on_search)
         search_btn = QPushButton("Pesquisar")
         search_btn.clicked.connect(self.on_search)
@@ -508,29 +625,15 @@ class MainWindow(QMainWindow):
         self.delete_tenant_btn.clicked.connect(self.delete_tenant)
         self.restore_tenant_btn.clicked.connect(self.restore_tenant)
 
-        # Create tenant table
-        self.tenant_table = QTableWidget()
-        self.tenant_table.setColumnCount(9)  # Added one more column for status
-        self.tenant_table.setHorizontalHeaderLabels(
-            [
-                "Nome",
-                "Quarto",
-                "Renda (€)",
-                "BI",
-                "Email",
-                "Telefone",
-                "Endereço",
-                "Data de Nascimento",
-                "Status",
-            ]
-        )
+        # Create tenant table; rows are fetched as it scrolls
+        self.tenant_model = TenantTableModel(self)
+        self.tenant_table = QTableView()
+        self.tenant_table.setModel(self.tenant_model)
 
         # Update button states when selection changes
-        self.tenant_table.itemSelectionChanged.connect(self.update_action_buttons)
-
-        # Enable context menu
-        self.tenant_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.tenant_table.customContextMenuRequested.connect(self.show_tenant_context_menu)
+        self.tenant_table.selectionModel().selectionChanged.connect(
+            self.update_action_buttons
+        )
 
         # Pagination controls
         pagination_layout = QHBoxLayout()
@@ -553,25 +656,41 @@ class MainWindow(QMainWindow):
 
         # Enable single row selection
         self.tenant_table.setSelectionBehavior(
-            QTableWidget.SelectionBehavior.SelectRows
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.tenant_table.setSelectionMode(
+            QAbstractItemView.SelectionMode.SingleSelection
         )
-        self.tenant_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
         self.tenant_table.setEditTriggers(
-            QTableWidget.EditTrigger.NoEditTriggers
+            QAbstractItemView.EditTrigger.NoEditTriggers
         )  # Make table read-only
 
-        # Configure table
+        # The scroll bar counts rows, so the pagination buttons can page with it
+        self.tenant_table.setVerticalScrollMode(
+            QAbstractItemView.ScrollMode.ScrollPerItem
+        )
+        self.tenant_table.verticalScrollBar().valueChanged.connect(
+            self.update_page_controls
+        )
+        # The page step is set right after the range, so read both afterwards
+        self.tenant_table.verticalScrollBar().rangeChanged.connect(
+            lambda *args: QTimer.singleShot(0, self.update_page_controls)
+        )
+
+        # Configure table; fixed widths so the header never measures every row
         header = self.tenant_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)  # Name
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Room
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # Rent
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # BI
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Email
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # Phone
         header.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)  # Address
-        header.setSectionResizeMode(
-            7, QHeaderView.ResizeMode.ResizeToContents
-        )  # Birth Date
+        self.tenant_table.setColumnWidth(1, 90)  # Room
+        self.tenant_table.setColumnWidth(2, 90)  # Rent
+        self.tenant_table.setColumnWidth(3, 110)  # BI
+        self.tenant_table.setColumnWidth(5, 110)  # Phone
+        self.tenant_table.setColumnWidth(7, 130)  # Birth Date
+        self.tenant_table.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Fixed
+        )
 
         # Enable context menu
         self.tenant_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -594,6 +713,10 @@ class MainWindow(QMainWindow):
         refresh_btn.clicked.connect(self.load_payments)
         button_layout.addWidget(refresh_btn)
 
+        aging_btn = QPushButton("Antiguidade da Dívida")
+        aging_btn.clicked.connect(self.view_aging_report)
+        button_layout.addWidget(aging_btn)
+
         # Add date range filter
         date_layout = QHBoxLayout()
         date_layout.addWidget(QLabel("Mês de Referência:"))
@@ -643,28 +766,27 @@ class MainWindow(QMainWindow):
         layout.addLayout(totals_layout)
 
         # Create payments table
-        self.payments_table = QTableWidget()
-        self.payments_table.setColumnCount(6)
-        self.payments_table.setHorizontalHeaderLabels(
-            ["Inquilino", "Quarto", "Renda", "Status", "Valor Pago", "Saldo"]
-        )
+        self.payments_model = PaymentOverviewModel(self)
+        self.payments_table = QTableView()
+        self.payments_table.setModel(self.payments_model)
 
-        # Configure table
+        # Configure table; fixed widths so the header never measures every row
         header = self.payments_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)  # Name
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Room
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # Rent
-        header.setSectionResizeMode(
-            3, QHeaderView.ResizeMode.ResizeToContents
-        )  # Status
-        header.setSectionResizeMode(
-            4, QHeaderView.ResizeMode.ResizeToContents
-        )  # Amount Paid
-        header.setSectionResizeMode(
-            5, QHeaderView.ResizeMode.ResizeToContents
-        )  # Balance
-
-        # Enable sorting
+        self.payments_table.setColumnWidth(1, 100)  # Room
+        self.payments_table.setColumnWidth(2, 100)  # Rent
+        self.payments_table.setColumnWidth(3, 120)  # Status
+        self.payments_table.setColumnWidth(4, 100)  # Amount Paid
+        self.payments_table.setColumnWidth(5, 100)  # Balance
+        self.payments_table.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Fixed
+        )
+
+        # Enable sorting; rows keep the database order until a column is clicked
+        self.payments_table.horizontalHeader().setSortIndicator(
+            -1, Qt.SortOrder.AscendingOrder
+        )
         self.payments_table.setSortingEnabled(True)
 
         # Enable selection
@@ -680,9 +802,6 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(self.payments_table)
 
-        # Load initial data
-        self.load_payments()
-
         return widget
 
     def create_contracts_tab(self):
@@ -712,52 +831,45 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             tenant_data = dialog.get_tenant_data()
             if tenant_data:
-                session = self.db_manager.get_session()
                 try:
-                    # Import models here to avoid circular imports
-                    from tenants_manager.models.tenant import Tenant, EmergencyContact
-                    
-                    # Create Tenant instance
-                    tenant = Tenant(
-                        name=tenant_data['name'],
-                        room_id=tenant_data['room_id'],
-                        bi=tenant_data['bi'],
-                        email=tenant_data['email'],
-                        phone=tenant_data['phone'],
-                        rent=tenant_data['rent'],
-                        address=tenant_data['address'],
-                        birth_date=tenant_data['birth_date'],
-                        entry_date=tenant_data['entry_date']
-                    )
-                    
-                    # Add tenant to session first to get an ID
-                    session.add(tenant)
-                    session.flush()  # This assigns an ID to the tenant
+                    with self.db_manager.session_scope() as session:
+                        # Import models here to avoid circular imports
+                        from tenants_manager.models.tenant import Tenant, EmergencyContact
                     
-                    # Handle emergency contact if provided
-                    if tenant_data.get('emergency_contact'):
-                        ec_data = tenant_data['emergency_contact']
-                        if any(ec_data.values()):  # Only create if at least one field is filled
-                            emergency_contact = EmergencyContact(
-                                name=ec_data.get('name'),
-                                phone=ec_data.get('phone'),
-                                email=ec_data.get('email'),
-                                tenant_id=tenant.id
-                            )
-                            session.add(emergency_contact)
+                        # Create Tenant instance
+                        tenant = Tenant(
+                            name=tenant_data['name'],
+                            room_id=tenant_data['room_id'],
+                            bi=tenant_data['bi'],
+                            email=tenant_data['email'],
+                            phone=tenant_data['phone'],
+                            rent=tenant_data['rent'],
+                            address=tenant_data['address'],
+                            birth_date=tenant_data['birth_date'],
+                            entry_date=tenant_data['entry_date']
+                        )
                     
-                    # Commit the transaction
-                    session.commit()
+                        # Add tenant to session first to get an ID
+                        session.add(tenant)
+                        session.flush()  # This assigns an ID to the tenant
                     
-                    # Refresh the UI
-                    self.load_tenants()
-                    self.load_payments()
+                        # Handle emergency contact if provided
+                        if tenant_data.get('emergency_contact'):
+                            ec_data = tenant_data['emergency_contact']
+                            if any(ec_data.values()):  # Only create if at least one field is filled
+                                emergency_contact = EmergencyContact(
+                                    name=ec_data.get('name'),
+                                    phone=ec_data.get('phone'),
+                                    email=ec_data.get('email'),
+                                    tenant_id=tenant.id
+                                )
+                                session.add(emergency_contact)
+
                     QMessageBox.information(
                         self, "Sucesso", "Inquilino adicionado com sucesso!"
                     )
                     
                 except Exception as e:
-                    session.rollback()
                     if "UNIQUE constraint failed: tenants.bi" in str(e):
                         QMessageBox.critical(
                             self,
@@ -769,153 +881,126 @@ class MainWindow(QMainWindow):
                             self, "Erro", f"Erro ao adicionar inquilino: {str(e)}"
                         )
                         logger.exception("Error adding tenant:")
-                finally:
-                    session.close()
 
     def edit_tenant(self):
         try:
             logger.debug("Starting edit_tenant method")
-            # Get the selected row
-            selected_rows = self.tenant_table.selectionModel().selectedRows()
+            # Get the selected tenant
+            selected = self.selected_tenant()
 
-            if not selected_rows:
+            if selected is None:
                 QMessageBox.warning(
                     self, "Aviso", "Por favor, selecione um inquilino para editar."
                 )
                 return
 
-            # Get the selected row index
-            row = selected_rows[0].row()
-            logger.debug(f"Selected row: {row}")
+            tenant_id = selected.id
+            logger.debug(f"Editing tenant ID: {tenant_id}")
 
-            # Get the tenant's BI (unique identifier) from the table
-            bi_item = self.tenant_table.item(row, 3)
-            if not bi_item:
-                logger.error("No BI found in the selected row")
-                QMessageBox.critical(self, "Erro", "Não foi possível identificar o inquilino selecionado.")
+            # Detached copy for the dialog; no session stays open while it shows
+            tenant = self.db_manager.get_tenant(tenant_id)
+            if not tenant:
+                logger.error(f"Tenant {tenant_id} not found in database")
+                QMessageBox.critical(self, "Erro", "Inquilino não encontrado!")
                 return
-                
-            bi = bi_item.text()
-            logger.debug(f"Editing tenant with BI: {bi}")
 
-            session = None
-            try:
-                # Get the session
-                session = self.db_manager.get_session()
-                logger.debug("Database session created")
-
-                # Find the tenant by BI
-                tenant = session.query(Tenant).filter_by(bi=bi).first()
-                if not tenant:
-                    logger.error(f"Tenant with BI {bi} not found in database")
-                    QMessageBox.critical(self, "Erro", "Inquilino não encontrado!")
-                    return
-
-                logger.debug(f"Found tenant: {tenant.name} (ID: {tenant.id})")
-
-                # Create and show the edit dialog with the tenant's data
-                dialog = TenantDialog(
-                    tenant=tenant, parent=self, is_deleted=not tenant.is_active
-                )
-                logger.debug("Created TenantDialog")
+            logger.debug(f"Found tenant: {tenant.name} (ID: {tenant.id})")
 
-                if dialog.exec() == QDialog.DialogCode.Accepted:
-                    logger.debug("Dialog accepted, getting tenant data...")
-                    # Get the updated tenant data
-                    tenant_data = dialog.get_tenant_data()
-                    
-                    # Debug: Log the tenant data
-                    from pprint import pformat
-                    logger.debug(f"Tenant data from dialog: {pformat(tenant_data)}")
-
-                    if not tenant_data:
-                        logger.error("No tenant data returned from dialog")
-                        QMessageBox.critical(self, "Erro", "Nenhum dado de inquilino foi retornado.")
-                        return
-
-                    try:
-                        # Update the tenant's properties
-                        logger.debug("Updating tenant properties...")
-                        if 'name' in tenant_data and tenant_data['name'] is not None:
-                            tenant.name = tenant_data['name']
-                        if 'room_id' in tenant_data and tenant_data['room_id'] is not None:
-                            tenant.room_id = tenant_data['room_id']
-                        if 'rent' in tenant_data and tenant_data['rent'] is not None and tenant.rent != tenant_data['rent']:
-                            # Use the update_rent method to properly handle rent changes and history
-                            if not tenant.update_rent(tenant_data['rent'], changed_by="System"):
-                                logger.error(f"Failed to update rent for tenant {tenant.id}")
-                                QMessageBox.warning(self, "Aviso", "Ocorreu um erro ao atualizar a renda. O histórico pode não ter sido atualizado corretamente.")
-                            # Still update the rent value in case the history update failed but the rent changed
-                            tenant.rent = tenant_data['rent']
-                        if 'bi' in tenant_data and tenant_data['bi'] is not None:
-                            tenant.bi = tenant_data['bi']
-                        if 'email' in tenant_data:
-                            tenant.email = tenant_data['email']
-                        if 'phone' in tenant_data:
-                            tenant.phone = tenant_data['phone']
-                        if 'address' in tenant_data:
-                            tenant.address = tenant_data['address']
-                        if 'birth_date' in tenant_data and tenant_data['birth_date'] is not None:
-                            tenant.birth_date = tenant_data['birth_date']
-                        if 'entry_date' in tenant_data and tenant_data['entry_date'] is not None:
-                            tenant.entry_date = tenant_data['entry_date']
-
-                        logger.debug("Tenant properties updated")
-
-                        # Handle emergency contact
-                        if 'emergency_contact' in tenant_data and tenant_data['emergency_contact']:
-                            logger.debug("Updating emergency contact...")
-                            if not tenant.emergency_contact:
-                                from tenants_manager.models.tenant import EmergencyContact
-                                tenant.emergency_contact = EmergencyContact(
-                                    name=tenant_data['emergency_contact'].get('name'),
-                                    phone=tenant_data['emergency_contact'].get('phone'),
-                                    email=tenant_data['emergency_contact'].get('email')
-                                )
-                                logger.debug("Created new emergency contact")
-                            else:
-                                if 'name' in tenant_data['emergency_contact']:
-                                    tenant.emergency_contact.name = tenant_data['emergency_contact']['name']
-                                if 'phone' in tenant_data['emergency_contact']:
-                                    tenant.emergency_contact.phone = tenant_data['emergency_contact']['phone']
-                                if 'email' in tenant_data['emergency_contact']:
-                                    tenant.emergency_contact.email = tenant_data['emergency_contact']['email']
-                                logger.debug("Updated existing emergency contact")
-                        elif tenant.emergency_contact:
-                            # Remove existing emergency contact if it exists but was cleared
-                            logger.debug("Removing emergency contact...")
-                            session.delete(tenant.emergency_contact)
-                            tenant.emergency_contact = None
-
-                        logger.debug("Committing changes to database...")
-                        session.commit()
-                        logger.debug("Changes committed successfully")
-
-                        # Refresh the table
-                        self.load_tenants()
-                        self.load_payments()
-                        
-                        logger.info("Tenant updated successfully")
-                        QMessageBox.information(
-                            self, "Sucesso", "Inquilino atualizado com sucesso!"
-                        )
+            # Create and show the edit dialog with the tenant's data
+            dialog = TenantDialog(
+                tenant=tenant, parent=self, is_deleted=not tenant.is_active
+            )
+            logger.debug("Created TenantDialog")
 
-                    except Exception as e:
-                        logger.exception("Error updating tenant:")
-                        if session:
-                            session.rollback()
-                        QMessageBox.critical(self, "Erro", f"Erro ao atualizar inquilino: {str(e)}")
-                        raise
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                return
+
+            logger.debug("Dialog accepted, getting tenant data...")
+            # Get the updated tenant data
+            tenant_data = dialog.get_tenant_data()
+
+            # Debug: Log the tenant data
+            from pprint import pformat
+            logger.debug(f"Tenant data from dialog: {pformat(tenant_data)}")
+
+            if not tenant_data:
+                logger.error("No tenant data returned from dialog")
+                QMessageBox.critical(self, "Erro", "Nenhum dado de inquilino foi retornado.")
+                return
+
+            try:
+                with self.db_manager.session_scope() as session:
+                    tenant = session.get(Tenant, tenant_id)
+                    if tenant is None:
+                        raise ValueError("Inquilino não encontrado")
+
+                    # Update the tenant's properties
+                    logger.debug("Updating tenant properties...")
+                    if 'name' in tenant_data and tenant_data['name'] is not None:
+                        tenant.name = tenant_data['name']
+                    if 'room_id' in tenant_data and tenant_data['room_id'] is not None:
+                        tenant.room_id = tenant_data['room_id']
+                    if 'rent' in tenant_data and tenant_data['rent'] is not None and tenant.rent != tenant_data['rent']:
+                        # Use the update_rent method to properly handle rent changes and history
+                        if not tenant.update_rent(tenant_data['rent'], changed_by="System", session=session):
+                            logger.error(f"Failed to update rent for tenant {tenant.id}")
+                            QMessageBox.warning(self, "Aviso", "Ocorreu um erro ao atualizar a renda. O histórico pode não ter sido atualizado corretamente.")
+                        # Still update the rent value in case the history update failed but the rent changed
+                        tenant.rent = tenant_data['rent']
+                    if 'bi' in tenant_data and tenant_data['bi'] is not None:
+                        tenant.bi = tenant_data['bi']
+                    if 'email' in tenant_data:
+                        tenant.email = tenant_data['email']
+                    if 'phone' in tenant_data:
+                        tenant.phone = tenant_data['phone']
+                    if 'address' in tenant_data:
+                        tenant.address = tenant_data['address']
+                    if 'birth_date' in tenant_data and tenant_data['birth_date'] is not None:
+                        tenant.birth_date = tenant_data['birth_date']
+                    if 'entry_date' in tenant_data and tenant_data['entry_date'] is not None:
+                        tenant.entry_date = tenant_data['entry_date']
+
+                    logger.debug("Tenant properties updated")
+
+                    # Handle emergency contact
+                    if 'emergency_contact' in tenant_data and tenant_data['emergency_contact']:
+                        logger.debug("Updating emergency contact...")
+                        if not tenant.emergency_contact:
+                            from tenants_manager.models.tenant import EmergencyContact
+                            tenant.emergency_contact = EmergencyContact(
+                                name=tenant_data['emergency_contact'].get('name'),
+                                phone=tenant_data['emergency_contact'].get('phone'),
+                                email=tenant_data['emergency_contact'].get('email')
+                            )
+                            logger.debug("Created new emergency contact")
+                        else:
+                            if 'name' in tenant_data['emergency_contact']:
+                                tenant.emergency_contact.name = tenant_data['emergency_contact']['name']
+                            if 'phone' in tenant_data['emergency_contact']:
+                                tenant.emergency_contact.phone = tenant_data['emergency_contact']['phone']
+                            if 'email' in tenant_data['emergency_contact']:
+                                tenant.emergency_contact.email = tenant_data['emergency_contact']['email']
+                            logger.debug("Updated existing emergency contact")
+                    elif tenant.emergency_contact:
+                        # Remove existing emergency contact if it exists but was cleared
+                        logger.debug("Removing emergency contact...")
+                        session.delete(tenant.emergency_contact)
+                        tenant.emergency_contact = None
+
+                    logger.debug("Committing changes to database...")
+                logger.debug("Changes committed successfully")
+
+                # Rent and entry date feed into the stored balance
+                self.db_manager.refresh_balances([tenant_id])
+
+                logger.info("Tenant updated successfully")
+                QMessageBox.information(
+                    self, "Sucesso", "Inquilino atualizado com sucesso!"
+                )
 
             except Exception as e:
-                logger.exception("Error in edit_tenant:")
-                if session:
-                    session.rollback()
-                QMessageBox.critical(self, "Erro", f"Erro ao processar edição do inquilino: {str(e)}")
-            finally:
-                if session:
-                    session.close()
-                    logger.debug("Database session closed")
+                logger.exception("Error updating tenant:")
+                QMessageBox.critical(self, "Erro", f"Erro ao atualizar inquilino: {str(e)}")
 
         except Exception as e:
             logger.exception("Unexpected error in edit_tenant:")
@@ -927,11 +1012,9 @@ class MainWindow(QMainWindow):
 
     def delete_tenant(self):
         """Soft delete the selected tenant"""
-        current_row = self.tenant_table.currentRow()
-        if current_row >= 0:
-            tenant_id = self.tenant_table.item(current_row, 0).data(
-                Qt.ItemDataRole.UserRole
-            )
+        selected = self.selected_tenant()
+        if selected is not None:
+            tenant_id = selected.id
 
             reply = QMessageBox.question(
                 self,
@@ -944,7 +1027,6 @@ class MainWindow(QMainWindow):
 
             if reply == QMessageBox.StandardButton.Yes:
                 if self.db_manager.delete_tenant(tenant_id, hard_delete=False):
-                    self.load_tenants()
                     QMessageBox.information(
                         self,
                         "Sucesso",
@@ -958,11 +1040,9 @@ class MainWindow(QMainWindow):
 
     def restore_tenant(self):
         """Restore a soft-deleted tenant"""
-        current_row = self.tenant_table.currentRow()
-        if current_row >= 0:
-            tenant_id = self.tenant_table.item(current_row, 0).data(
-                Qt.ItemDataRole.UserRole
-            )
+        selected = self.selected_tenant()
+        if selected is not None:
+            tenant_id = selected.id
 
             reply = QMessageBox.question(
                 self,
@@ -975,7 +1055,6 @@ class MainWindow(QMainWindow):
 
             if reply == QMessageBox.StandardButton.Yes:
                 if self.db_manager.restore_tenant(tenant_id):
-                    self.load_tenants()
                     QMessageBox.information(
                         self,
                         "Sucesso",
@@ -990,7 +1069,6 @@ class MainWindow(QMainWindow):
     def toggle_deleted_tenants(self, state):
         """Toggle visibility of deleted tenants"""
         try:
-            self.current_page = 1  # Reset to first page
             self.load_tenants()
 
             # Update the status bar message
@@ -1012,205 +1090,195 @@ class MainWindow(QMainWindow):
             )
 
     def load_tenants(self):
-        """Load tenants from the database"""
-        logger.debug("Starting load_tenants")
-        try:
-            logger.debug("1. Calculating pagination...")
-            # Get the current page and rows per page
-            offset = (self.current_page - 1) * self.rows_per_page
-            show_deleted = self.show_deleted_checkbox.isChecked()
-            logger.debug(
-                f"   - Page: {self.current_page}, Offset: {offset}, Rows per page: {self.rows_per_page}"
-            )
-            logger.debug(f"   - Show deleted: {show_deleted}")
-
-            logger.debug("2. Getting tenant count...")
-            # Get total count of tenants (for pagination)
-            try:
-                total = self.db_manager.get_tenants_count(
-                    search_term=self.search_term, include_deleted=show_deleted
-                )
-                logger.debug(f"   - Got tenant count: {total}")
-            except Exception as e:
-                logger.error(f"ERROR getting tenant count: {str(e)}")
-                import traceback
-
-                traceback.print_exc()
-                total = 0
-
-            self.total_tenants = total
-
-            logger.debug("3. Fetching paginated tenants...")
-            # Get paginated list of tenants
-            try:
-                tenants = self.db_manager.get_tenants_paginated(
-                    offset=offset,
-                    limit=self.rows_per_page,
-                    search_term=self.search_term,
-                    include_deleted=show_deleted,
-                )
-                logger.debug(f"   - Retrieved {len(tenants)} tenants")
-            except Exception as e:
-                logger.error(f"ERROR getting paginated tenants: {str(e)}")
-                import traceback
-
-                traceback.print_exc()
-                tenants = []
-
-            self.total_tenants = total
-            total_pages = (
-                (total + self.rows_per_page - 1) // self.rows_per_page
-                if total > 0
-                else 1
-            )
+        """Load the first chunk of tenants from the database in the background"""
+        # The new list has every change
+        self.queries.cancel("tenants_patch")
+        self.pending_patches.pop("tenants", None)
+        show_deleted = self.show_deleted_checkbox.isChecked()
+        logger.debug(
+            f"Loading tenants: {self.rows_per_page} per chunk, show deleted: {show_deleted}"
+        )
+        # Chunks still loading belong to the old list
+        self.queries.cancel("tenants_more")
+        self.queries.submit(
+            "tenants",
+            fetch_tenant_page,
+            self.db_manager,
+            None,
+            self.rows_per_page,
+            self.search_term,
+            show_deleted,
+            on_result=self.show_tenants,
+            on_error=self.show_tenants_error,
+        )
 
-            # Update pagination controls
-            self.prev_btn.setEnabled(self.current_page > 1)
-            self.next_btn.setEnabled(self.current_page < total_pages)
-            self.page_label.setText(
-                f"Página {self.current_page} de {max(1, total_pages)}"
-            )
+    def fetch_more_tenants(self, deliver):
+        """Loader for TenantTableModel: fetch the chunk after next_cursor"""
+        self.queries.submit(
+            "tenants_more",
+            fetch_tenant_page,
+            self.db_manager,
+            self.next_cursor,
+            self.rows_per_page,
+            self.search_term,
+            self.show_deleted_checkbox.isChecked(),
+            with_total=False,
+            on_result=lambda page: self.append_tenants(page, deliver),
+            on_error=lambda message: self.append_tenants_error(message, deliver),
+        )
 
-            start_item = (self.current_page - 1) * self.rows_per_page + 1
-            end_item = min(start_item + len(tenants) - 1, total) if total > 0 else 0
-            self.rows_label.setText(
-                f"Mostrando {start_item}-{end_item} de {total} inquilinos"
-            )
+    def patch_tenants(self, tenant_ids, room_ids):
+        self.queries.submit(
+            "tenants_patch",
+            fetch_tenant_rows,
+            self.db_manager,
+            tenant_ids,
+            room_ids,
+            self.search_term,
+            self.show_deleted_checkbox.isChecked(),
+            on_result=lambda page: self.apply_tenants_patch(tenant_ids, page),
+            on_error=lambda message: self.patch_error("tenants", message),
+        )
 
-            # Clear existing rows
-            self.tenant_table.setRowCount(0)
+    def apply_tenants_patch(self, tenant_ids, page):
+        """Patch the tenant list with a TenantPage from fetch_tenant_rows"""
+        self.pending_patches.pop("tenants", None)
+        self.total_tenants = page.total
+        # Searches are ordered by rank, which the rows do not carry
+        order_key = None if self.search_term else (lambda row: (row.name, row.id))
+        self.tenant_model.patch_rows(tenant_ids, page.rows, order_key)
+        self.update_page_controls()
+        self.update_action_buttons()
+
+    def show_tenants_error(self, message):
+        QMessageBox.critical(
+            self, "Erro", f"Erro ao carregar lista de inquilinos: {message}"
+        )
 
-            # Debug: Print info about the tenants we received
-            logger.debug(
-                f"Loading {len(tenants)} tenants (page {self.current_page}, {self.rows_per_page} per page)"
+    def show_tenants(self, page):
+        """Fill the tenant table with a TenantPage from fetch_tenant_page"""
+        try:
+            self.total_tenants = page.total
+            self.next_cursor = page.next_cursor
+            logger.debug(f"Loaded {len(page.rows)} of {page.total} tenants")
+
+            # Later chunks are fetched by the model as the table scrolls
+            self.tenant_model.set_rows(
+                page.rows,
+                loader=self.fetch_more_tenants if page.next_cursor else None,
             )
-
-            # Add rows for each tenant
-            for i, tenant in enumerate(tenants, 1):
-                logger.debug(
-                    f"Tenant {i}: Type={type(tenant)}, ID={getattr(tenant, 'id', 'N/A')}, Name={getattr(tenant, 'name', 'N/A')}"
-                )
-
-                if not hasattr(tenant, "id"):
-                    logger.warning(f"Tenant object has no 'id' attribute: {tenant}")
-                    continue
-
-                row = self.tenant_table.rowCount()
-                self.tenant_table.insertRow(row)
-
-                try:
-                    # Ensure we're passing a valid tenant ID
-                    tenant_id = getattr(tenant, "id", None)
-                    if tenant_id is None:
-                        logger.warning(f"Tenant object has no 'id' attribute: {tenant}")
-                        balance = 0.0
-                    else:
-                        logger.debug(f"Getting balance for tenant ID: {tenant_id}")
-                        balance = self.db_manager.get_tenant_balance(tenant_id)
-                except Exception as e:
-                    logger.error(
-                        f"Error getting balance for tenant {getattr(tenant, 'id', 'N/A')}: {str(e)}"
-                    )
-                    import traceback
-
-                    traceback.print_exc()
-                    balance = 0.0
-
-                # Add tenant data to each column
-                name_item = QTableWidgetItem(tenant.name)
-                # Get room name from the relationship
-                room_name = tenant.room_ref.name if tenant.room_ref else ""
-                room_item = QTableWidgetItem(room_name)
-                room_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                # Style deleted tenants with strikethrough and red color
-                is_deleted = not getattr(tenant, "is_active", True)
-                if is_deleted:
-                    font = name_item.font()
-                    font.setStrikeOut(True)
-                    name_item.setFont(font)
-                    room_item.setFont(font)
-                    name_item.setForeground(Qt.GlobalColor.red)
-                    room_item.setForeground(Qt.GlobalColor.red)
-
-                self.tenant_table.setItem(row, 0, name_item)
-                self.tenant_table.setItem(row, 1, room_item)
-
-                # Format rent with balance information
-                rent_item = QTableWidgetItem(f"{tenant.rent:.2f} €")
-                if balance > 0:
-                    rent_item.setForeground(Qt.GlobalColor.red)
-                self.tenant_table.setItem(row, 2, rent_item)
-
-                self.tenant_table.setItem(row, 3, QTableWidgetItem(tenant.bi))
-                self.tenant_table.setItem(row, 4, QTableWidgetItem(tenant.email or ""))
-                self.tenant_table.setItem(row, 5, QTableWidgetItem(tenant.phone or ""))
-                self.tenant_table.setItem(
-                    row, 6, QTableWidgetItem(tenant.address or "")
-                )
-                self.tenant_table.setItem(
-                    row,
-                    7,
-                    QTableWidgetItem(
-                        tenant.birth_date.strftime("%d/%m/%Y")
-                        if tenant.birth_date
-                        else ""
-                    ),
-                )
-
-                # Add status as hidden data (is_deleted)
-                status_item = QTableWidgetItem(
-                    str(not getattr(tenant, "is_active", True))
-                )
-                self.tenant_table.setItem(row, 8, status_item)
-
-                # Store the tenant ID in the first column for easy access
-                self.tenant_table.item(row, 0).setData(
-                    Qt.ItemDataRole.UserRole, tenant.id
-                )
-
-            # Resize columns to fit content
-            self.tenant_table.resizeColumnsToContents()
-
-            # Hide the status column
-            self.tenant_table.setColumnHidden(8, True)
+            self.tenant_table.scrollToTop()
+            self.update_page_controls()
+            self.update_action_buttons()
 
         except Exception as e:
             QMessageBox.critical(
                 self, "Erro", f"Erro ao carregar lista de inquilinos: {str(e)}"
             )
 
+    def append_tenants(self, page, deliver):
+        """Hand a further chunk of tenants to the table model"""
+        self.next_cursor = page.next_cursor
+        deliver(page.rows, page.next_cursor is not None)
+        self.update_page_controls()
+
+    def append_tenants_error(self, message, deliver):
+        # Stop fetching; the list shows what was loaded so far
+        deliver([], False)
+        self.show_tenants_error(message)
+
+    def update_page_controls(self, *args):
+        """Update the pagination buttons and labels from the scroll position"""
+        bar = self.tenant_table.verticalScrollBar()
+        loaded = self.tenant_model.rowCount()
+        step = max(1, bar.pageStep())
+        more = self.tenant_model.canFetchMore() or self.tenant_model.is_loading()
+
+        total_pages = max(1, (self.total_tenants + step - 1) // step)
+        current_page = bar.value() // step + 1
+        if bar.value() >= bar.maximum() and not more:
+            current_page = total_pages
+        self.page_label.setText(
+            f"Página {min(current_page, total_pages)} de {total_pages}"
+        )
+        self.prev_btn.setEnabled(bar.value() > 0)
+        self.next_btn.setEnabled(bar.value() < bar.maximum() or more)
+
+        first = bar.value() + 1 if loaded else 0
+        last = min(bar.value() + step, loaded)
+        self.rows_label.setText(
+            f"Mostrando {first}-{last} de {self.total_tenants} inquilinos"
+        )
+
     def on_search(self):
         """Handle search action"""
-        self.current_page = 1
         self.search_term = self.search_input.text().strip()
         self.load_tenants()
 
     def prev_page(self):
-        """Go to previous page"""
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.load_tenants()
+        """Scroll up by one page"""
+        bar = self.tenant_table.verticalScrollBar()
+        bar.setValue(bar.value() - bar.pageStep())
 
     def next_page(self):
-        """Go to next page"""
-        total_pages = (
-            self.total_tenants + self.rows_per_page - 1
-        ) // self.rows_per_page
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.load_tenants()
+        """Scroll down by one page, fetching more tenants at the end"""
+        bar = self.tenant_table.verticalScrollBar()
+        if bar.value() >= bar.maximum() and self.tenant_model.canFetchMore():
+            self.tenant_model.fetchMore()
+        bar.setValue(bar.value() + bar.pageStep())
 
     def load_payments(self):
-        """Load payment overview for all tenants"""
-        self.payments_table.setRowCount(0)
-
+        """Load payment overview for all tenants in the background"""
+        self.queries.cancel("payments_patch")
+        self.pending_patches.pop("payments", None)
         # Get the reference month
         ref_date = self.reference_month.date().toPyDate()
+        self.queries.submit(
+            "payments",
+            fetch_payment_overview,
+            self.db_manager,
+            ref_date,
+            on_result=lambda overview: self.show_payments(ref_date, overview),
+            on_error=self.show_payments_error,
+        )
+
+    def show_payments_error(self, message):
+        QMessageBox.critical(self, "Erro", f"Erro ao carregar pagamentos: {message}")
 
-        # Update total rent collected
-        total_rent = self.db_manager.get_total_rent_collected(ref_date) or 0.0
+    def patch_payments(self, tenant_ids, room_ids):
+        ref_date = self.reference_month.date().toPyDate()
+        self.queries.submit(
+            "payments_patch",
+            fetch_payment_overview,
+            self.db_manager,
+            ref_date,
+            tenant_ids,
+            room_ids,
+            # Totals only move when tenants or their payments change
+            with_totals=bool(tenant_ids),
+            on_result=lambda overview: self.apply_payments_patch(
+                ref_date, tenant_ids, overview
+            ),
+            on_error=lambda message: self.patch_error("payments", message),
+        )
 
+    def apply_payments_patch(self, ref_date, tenant_ids, overview):
+        """Patch the payments tab with a partial PaymentOverview"""
+        self.pending_patches.pop("payments", None)
+        if overview.total_rent is not None:
+            self.show_payment_totals(ref_date, overview)
+        self.payments_model.patch_rows(
+            tenant_ids, overview.rows, lambda entry: (entry.name, entry.tenant_id)
+        )
+
+    def show_payments(self, ref_date, overview):
+        """Fill the payments tab with a PaymentOverview from fetch_payment_overview"""
+        self.show_payment_totals(ref_date, overview)
+
+        # Keeps the column the table is sorted by
+        self.payments_model.set_rows(overview.rows)
+
+    def show_payment_totals(self, ref_date, overview):
         # Format date in Portuguese
         month_year = ref_date.strftime("%B %Y").lower()
         # Capitalize the first letter of the month
@@ -1218,79 +1286,9 @@ class MainWindow(QMainWindow):
 
         # Update the total rent label with the formatted amount
         self.total_rent_label.setText(
-            f"Total Arrecadado em {month_year}: {total_rent:.2f} €"
+            f"Total Arrecadado em {month_year}: {overview.total_rent:.2f} €"
         )
-
-        # Calculate and display total debt
-        total_debt = self.db_manager.get_total_debt(ref_date) or 0.0
-        self.total_debt_label.setText(f"Dívida Total: {total_debt:.2f} €")
-
-        # Get all tenants - now returns (tenants, total_count)
-        tenants, _ = self.db_manager.get_tenants()
-
-        for tenant in tenants:
-            if not hasattr(tenant, "id"):
-                logger.warning(f"Invalid tenant object in load_payments: {tenant}")
-                continue
-            # Get payment status for the reference month
-            payments, _ = self.db_manager.get_tenant_payments(
-                tenant_id=tenant.id,
-                reference_month=ref_date,
-                page=1,  # Get all payments for the month
-                per_page=1000,  # Arbitrarily large number to get all payments
-            )
-
-            # Calculate total paid for the reference month
-            amount_paid = sum(
-                p.amount for p in payments if p.status == PaymentStatus.COMPLETED
-            )
-
-            # Get current balance
-            balance = self.db_manager.get_tenant_balance(tenant.id, as_of_date=ref_date)
-
-            # Determine status
-            if amount_paid >= tenant.rent:
-                status = "Pago"
-                status_color = Qt.GlobalColor.darkGreen
-            elif amount_paid > 0:
-                status = f"Parcial ({amount_paid/tenant.rent:.0%})"
-                status_color = Qt.GlobalColor.darkYellow
-            else:
-                status = "Pendente"
-                status_color = Qt.GlobalColor.red
-
-            # Add row to table
-            row = self.payments_table.rowCount()
-            self.payments_table.insertRow(row)
-
-            # Add data to table
-            self.payments_table.setItem(row, 0, QTableWidgetItem(tenant.name))
-            # Get room name from the relationship
-            room_name = tenant.room_ref.name if tenant.room_ref else ""
-            self.payments_table.setItem(row, 1, QTableWidgetItem(room_name))
-            self.payments_table.setItem(
-                row, 2, QTableWidgetItem(f"{tenant.rent:.2f} €")
-            )
-
-            status_item = QTableWidgetItem(status)
-            status_item.setForeground(status_color)
-            self.payments_table.setItem(row, 3, status_item)
-
-            self.payments_table.setItem(
-                row, 4, QTableWidgetItem(f"{amount_paid:.2f} €")
-            )
-
-            balance_item = QTableWidgetItem(f"{balance:.2f} €")
-            if balance > 0:
-                balance_item.setForeground(Qt.GlobalColor.red)
-            elif balance < 0:
-                balance_item.setForeground(Qt.GlobalColor.darkGreen)
-            self.payments_table.setItem(row, 5, balance_item)
-
-            # Store tenant ID in the row
-            self.payments_table.item(row, 0).setData(
-                Qt.ItemDataRole.UserRole, tenant.id
-            )
+        self.total_debt_label.setText(f"Dívida Total: {overview.total_debt:.2f} €")
 
     def view_payment_history(self):
         """View payment history for the selected tenant"""
@@ -1298,41 +1296,39 @@ class MainWindow(QMainWindow):
         if not selected_rows:
             return
 
-        row = selected_rows[0].row()
-        tenant_id = self.payments_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        entry = self.payments_model.row(selected_rows[0].row())
+
+        dialog = PaymentHistoryWindow(entry.tenant_id, parent_widget=self)
+        dialog.exec()
 
-        dialog = PaymentHistoryWindow(tenant_id, parent_widget=self)
+    def view_aging_report(self):
+        """View outstanding rent by age as of the selected reference month"""
+        ref_date = self.reference_month.date().toPyDate()
+        dialog = AgingReportWindow(balance_date(ref_date), parent_widget=self)
         dialog.exec()
 
+    def selected_tenant(self):
+        """TenantRow of the selected tenant, or None"""
+        selected_rows = self.tenant_table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return self.tenant_model.row(selected_rows[0].row())
+
     def update_action_buttons(self):
         """Update the visibility of action buttons based on the selected tenant's status"""
         try:
-            if not hasattr(self, "tenant_table") or self.tenant_table.rowCount() == 0:
-                self.delete_tenant_btn.setEnabled(False)
-                self.restore_tenant_btn.setEnabled(False)
-                return
-
-            selected_rows = self.tenant_table.selectionModel().selectedRows()
-            if not selected_rows:
+            if not hasattr(self, "tenant_table"):
                 self.delete_tenant_btn.setEnabled(False)
                 self.restore_tenant_btn.setEnabled(False)
                 return
 
-            row = selected_rows[0].row()
-
-            # Make sure the row is valid
-            if row < 0 or row >= self.tenant_table.rowCount():
+            tenant = self.selected_tenant()
+            if tenant is None:
                 self.delete_tenant_btn.setEnabled(False)
                 self.restore_tenant_btn.setEnabled(False)
                 return
 
-            # Get the status item safely
-            status_item = self.tenant_table.item(row, 8)  # Status column
-            if not status_item:
-                # If status column is not available, assume tenant is active
-                is_deleted = False
-            else:
-                is_deleted = status_item.text().lower() == "true"
+            is_deleted = not tenant.is_active
 
             # Update button visibility and enabled state
             self.delete_tenant_btn.setEnabled(not is_deleted)
@@ -1349,37 +1345,16 @@ class MainWindow(QMainWindow):
     def show_tenant_context_menu(self, position):
         """Show context menu for tenant row with appropriate actions"""
         try:
-            if not hasattr(self, "tenant_table") or self.tenant_table.rowCount() == 0:
-                return
-
-            # Get the selected row
-            selected_rows = self.tenant_table.selectionModel().selectedRows()
-            if not selected_rows:
+            if not hasattr(self, "tenant_table"):
                 return
 
-            row = selected_rows[0].row()
-
-            # Make sure the row is valid
-            if row < 0 or row >= self.tenant_table.rowCount():
-                return
-
-            # Get the tenant ID and status
-            tenant_id_item = self.tenant_table.item(
-                row, 0
-            )  # First column has tenant ID as UserRole
-            status_item = self.tenant_table.item(row, 8)  # Status column
-
-            if not tenant_id_item:
+            # Get the selected tenant
+            tenant = self.selected_tenant()
+            if tenant is None:
                 return
 
-            tenant_id = tenant_id_item.data(Qt.ItemDataRole.UserRole)
-
-            # Get the status safely
-            if not status_item:
-                # If status column is not available, assume tenant is active
-                is_deleted = False
-            else:
-                is_deleted = status_item.text().lower() == "true"
+            tenant_id = tenant.id
+            is_deleted = not tenant.is_active
 
             # Create the context menu
             menu = QMenu()
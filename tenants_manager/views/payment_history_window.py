@@ -2,8 +2,8 @@ from PyQt6 import QtWidgets
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QPushButton,
     QHBoxLayout,
     QLabel,
@@ -14,12 +14,24 @@ from PyQt6.QtWidgets import (
     QGroupBox,
     QComboBox,
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtGui import QFont, QColor, QAction
 from datetime import datetime, date
-from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils.database import get_database_manager
 from tenants_manager.models.tenant import Payment, PaymentType, PaymentStatus, Tenant
 from tenants_manager.views.payment_dialog import PaymentDialog
+from tenants_manager.views.query_runner import (
+    QueryRunner,
+    fetch_payment_search,
+    payment_history_row,
+)
+from tenants_manager.views.table_models import PaymentHistoryModel
+
+# Wait this long after the last keystroke before searching
+SEARCH_DEBOUNCE_MS = 300
+# Searches matching more payments than this are paged from the database
+# instead of being kept in memory for narrowing
+SEARCH_CACHE_LIMIT = 1000
 
 
 class PaymentHistoryWindow(QDialog):
@@ -27,7 +39,7 @@ class PaymentHistoryWindow(QDialog):
         super().__init__(parent_widget)
         self.parent_widget = parent_widget
         self.tenant_id = tenant_id
-        self.db = DatabaseManager()
+        self.db = get_database_manager()
         self.setWindowTitle("Histórico de Pagamentos")
         self.setMinimumSize(1000, 700)
 
@@ -36,6 +48,14 @@ class PaymentHistoryWindow(QDialog):
         self.items_per_page = 20
         self.total_payments = 0
 
+        # Payments fetched for the last search term; longer terms narrow them
+        self.search_results = None
+        self.queries = QueryRunner(self)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+
         self.init_ui()
         self.load_tenant_data()
         self.load_payments_count()
@@ -96,7 +116,7 @@ class PaymentHistoryWindow(QDialog):
 
         # Update button
         update_btn = QPushButton("Atualizar")
-        update_btn.clicked.connect(self.load_payments)
+        update_btn.clicked.connect(self.refresh)
         filter_layout.addWidget(update_btn)
 
         date_layout.addStretch()
@@ -124,20 +144,27 @@ class PaymentHistoryWindow(QDialog):
         )
 
         # Payments table
-        self.payments_table = QTableWidget()
-        self.payments_table.setColumnCount(6)
-        self.payments_table.setHorizontalHeaderLabels(
-            ["Data", "Tipo", "Referência", "Valor", "Status", "Descrição"]
+        self.payments_model = PaymentHistoryModel(self)
+        self.payments_table = QTableView()
+        self.payments_table.setModel(self.payments_model)
+        self.payments_table.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        # Rows keep the database order until a column is clicked
+        self.payments_table.horizontalHeader().setSortIndicator(
+            -1, Qt.SortOrder.AscendingOrder
         )
+        self.payments_table.setSortingEnabled(True)
 
-        # Configure table
+        # Configure table; fixed widths so the header never measures every row
         header = self.payments_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        self.payments_table.setColumnWidth(0, 100)  # Date
+        self.payments_table.setColumnWidth(1, 120)  # Type
+        self.payments_table.setColumnWidth(2, 90)  # Reference
+        self.payments_table.setColumnWidth(3, 100)  # Amount
+        self.payments_table.setColumnWidth(4, 100)  # Status
 
         # Pagination controls
         pagination_layout = QHBoxLayout()
@@ -186,21 +213,51 @@ class PaymentHistoryWindow(QDialog):
         start_date = self.start_date.date().toPyDate()
         end_date = self.end_date.date().toPyDate()
 
-        # This will update self.total_payments
-        payments, self.total_payments = self.db.get_tenant_payments(
-            tenant_id=self.tenant_id,
-            start_date=start_date,
-            end_date=end_date,
-            page=1,  # Just get the first page for now
-            per_page=self.items_per_page,
-            search_term=search_text,
-        )
+        narrowed = self.get_narrowed_payments()
+        if narrowed is not None:
+            self.total_payments = len(narrowed)
+        else:
+            self.total_payments = self.db.count_tenant_payments(
+                tenant_id=self.tenant_id,
+                start_date=start_date,
+                end_date=end_date,
+                search_term=search_text,
+            )
 
         self.total_label.setText(f"Total: {self.total_payments}")
         self.update_pagination_controls()
 
+    def get_narrowed_payments(self):
+        """Current search applied to the payments fetched for a shorter term
+
+        Returns:
+            list: Payments and expected entries in display order, or None when
+                  there is no fetched result the current filters can narrow
+        """
+        results = self.search_results
+        search_text = self.search_input.text().strip()
+        if (
+            results is None
+            or not search_text.startswith(results.search_term)
+            or results.start_date != self.start_date.date().toPyDate()
+            or results.end_date != self.end_date.date().toPyDate()
+        ):
+            return None
+
+        payments = [
+            payment
+            for payment in results.payments
+            if self.db.payment_matches_search(payment, search_text)
+        ]
+        return self.db.merge_expected_entries(payments, results.expected)
+
     def get_payments_query(self):
         """Get payments with filters applied"""
+        narrowed = self.get_narrowed_payments()
+        if narrowed is not None:
+            offset = (self.current_page - 1) * self.items_per_page
+            return narrowed[offset : offset + self.items_per_page]
+
         search_text = self.search_input.text().strip()
         start_date = self.start_date.date().toPyDate()
         end_date = self.end_date.date().toPyDate()
@@ -218,111 +275,11 @@ class PaymentHistoryWindow(QDialog):
     def load_payments(self):
         """Load payments for the selected page and filters"""
         try:
-            # Clear the table first and disable sorting to prevent issues
-            self.payments_table.setSortingEnabled(False)
-            self.payments_table.setRowCount(0)
-
             # Get the payments for the current page
             payments = self.get_payments_query()
-
-            # Set row count in one go for better performance
-            self.payments_table.setRowCount(len(payments))
-
-            for row, payment in enumerate(payments):
-                # Create items for each cell in the row
-
-                # Date
-                date_str = (
-                    payment.payment_date.strftime("%d/%m/%Y")
-                    if hasattr(payment, "payment_date") and payment.payment_date
-                    else ""
-                )
-                date_item = QTableWidgetItem(date_str)
-
-                # Type
-                type_str = (
-                    str(payment.payment_type.value)
-                    if hasattr(payment, "payment_type") and payment.payment_type
-                    else ""
-                )
-                type_item = QTableWidgetItem(type_str)
-
-                # Reference month
-                ref_month = ""
-                if hasattr(payment, "reference_month") and payment.reference_month:
-                    ref_month = payment.reference_month.strftime("%m/%Y")
-                ref_item = QTableWidgetItem(ref_month)
-
-                # Amount
-                amount = getattr(payment, "amount", 0)
-                amount_item = QTableWidgetItem(f"{amount:.2f} €")
-
-                # Status
-                status = getattr(payment, "status", "")
-                if isinstance(status, str):
-                    status_str = status
-                elif hasattr(status, "value"):
-                    status_str = status.value
-                else:
-                    status_str = str(status) if status is not None else ""
-                status_item = QTableWidgetItem(status_str)
-
-                # Description
-                description = getattr(payment, "description", "")
-                desc_item = QTableWidgetItem(description or "")
-
-                # Add items to the table
-                self.payments_table.setItem(row, 0, date_item)
-                self.payments_table.setItem(row, 1, type_item)
-                self.payments_table.setItem(row, 2, ref_item)
-                self.payments_table.setItem(row, 3, amount_item)
-                self.payments_table.setItem(row, 4, status_item)
-                self.payments_table.setItem(row, 5, desc_item)
-
-                # Store the payment ID in the row for reference
-                if hasattr(payment, "id") and payment.id:
-                    date_item.setData(Qt.ItemDataRole.UserRole, payment.id)
-
-                # Color code the row based on payment status
-                if hasattr(payment, "is_expected") and payment.is_expected:
-                    color = QColor(230, 230, 230)  # Light gray for expected
-                    # Make the text italic for expected payments
-                    for col in range(self.payments_table.columnCount()):
-                        item = self.payments_table.item(row, col)
-                        if item:
-                            font = item.font()
-                            font.setItalic(True)
-                            item.setFont(font)
-                elif status == PaymentStatus.PENDING:
-                    color = QColor(255, 255, 200)  # Light yellow for pending
-                elif status == PaymentStatus.CANCELLED:
-                    color = QColor(255, 200, 200)  # Light red for cancelled
-                elif status == PaymentStatus.REFUNDED:
-                    color = QColor(200, 255, 200)  # Light green for refunded
-                else:
-                    color = QColor(255, 255, 255)  # White for completed
-
-                for col in range(self.payments_table.columnCount()):
-                    item = self.payments_table.item(row, col)
-                    if item:
-                        item.setBackground(color)
-
-            # Enable sorting after populating the table
-            self.payments_table.setSortingEnabled(True)
-
-            # Resize columns to fit content
-            self.payments_table.resizeColumnsToContents()
-
-            # Make the description column take remaining space
-            header = self.payments_table.horizontalHeader()
-            for i in range(header.count()):
-                if i != 5:  # Don't stretch the description column
-                    header.setSectionResizeMode(
-                        i, QHeaderView.ResizeMode.ResizeToContents
-                    )
-            header.setSectionResizeMode(
-                5, QHeaderView.ResizeMode.Stretch
-            )  # Stretch description
+            self.payments_model.set_rows(
+                payment_history_row(payment) for payment in payments
+            )
 
             # Update pagination controls
             self.update_pagination_controls()
@@ -360,18 +317,67 @@ class PaymentHistoryWindow(QDialog):
     def on_date_changed(self):
         """Handle date range change"""
         self.current_page = 1
+        if self.search_input.text().strip():
+            # Fetch the search again for the new range
+            self.search_results = None
+            self.apply_search()
+            return
         self.load_payments_count()
         self.load_payments()
 
     def on_search_changed(self, text):
-        """Handle search text change"""
+        """Handle search text change, searching once typing pauses"""
+        self.search_timer.start()
+
+    def apply_search(self):
+        """Show the payments matching the search box.
+
+        A term that extends the previous one narrows the payments already
+        fetched in memory. Other terms are fetched in the background, and a
+        newer search replaces one still running.
+        """
+        self.search_timer.stop()
         self.current_page = 1
+        search_text = self.search_input.text().strip()
+
+        if not search_text or self.get_narrowed_payments() is not None:
+            if not search_text:
+                self.search_results = None
+                self.queries.cancel("search")
+            self.load_payments_count()
+            self.load_payments()
+            return
+
+        self.queries.submit(
+            "search",
+            fetch_payment_search,
+            self.db,
+            self.tenant_id,
+            self.start_date.date().toPyDate(),
+            self.end_date.date().toPyDate(),
+            search_text,
+            SEARCH_CACHE_LIMIT,
+            on_result=self.on_search_results,
+            on_error=lambda message: QMessageBox.critical(
+                self, "Erro", f"Erro ao pesquisar pagamentos: {message}"
+            ),
+        )
+
+    def refresh(self):
+        """Reload from the database, dropping payments kept for narrowing"""
+        self.search_results = None
+        self.apply_search()
+
+    def on_search_results(self, results):
+        """Keep fetched search results and show them"""
+        # None means too many matches: page them from the database instead
+        self.search_results = results
         self.load_payments_count()
         self.load_payments()
 
     def get_tenant_entry_date(self):
         """Get the tenant's entry date from the database"""
-        with self.db.Session() as session:
+        with self.db.session_scope() as session:
             tenant = session.get(Tenant, self.tenant_id)
             if tenant and tenant.entry_date:
                 if hasattr(tenant.entry_date, "date"):
@@ -381,69 +387,67 @@ class PaymentHistoryWindow(QDialog):
 
     def load_tenant_data(self):
         """Load tenant data and update the balance"""
-        with self.db.Session() as session:
+        with self.db.session_scope() as session:
             tenant = session.get(Tenant, self.tenant_id)
-            if tenant:
-                self.setWindowTitle(f"Histórico de Pagamentos - {tenant.name}")
-                self.update_balance()
+            tenant_name = tenant.name if tenant else None
+        if tenant_name:
+            self.setWindowTitle(f"Histórico de Pagamentos - {tenant_name}")
+            self.update_balance()
 
     def update_balance(self):
         """Update the balance label"""
-        with self.db.Session() as session:
-            tenant = session.get(Tenant, self.tenant_id)
-            if tenant:
-                balance = tenant.get_balance()
-                if balance > 0:
-                    self.balance_label.setText(
-                        f"Saldo em dívida: <span style='color:red'>{balance:.2f} €</span>"
-                    )
-                else:
-                    self.balance_label.setText(
-                        f"Crédito: <span style='color:green'>{-balance:.2f} €</span>"
-                    )
+        balances = self.db.get_balances([self.tenant_id])
+        if self.tenant_id in balances:
+            balance = balances[self.tenant_id]
+            if balance > 0:
+                self.balance_label.setText(
+                    f"Saldo em dívida: <span style='color:red'>{balance:.2f} €</span>"
+                )
             else:
-                self.balance_label.setText("Inquilino não encontrado")
+                self.balance_label.setText(
+                    f"Crédito: <span style='color:green'>{-balance:.2f} €</span>"
+                )
+        else:
+            self.balance_label.setText("Inquilino não encontrado")
 
     def register_payment(self):
         """Open dialog to register a new payment"""
-        with self.db.Session() as session:
-            tenant = session.query(Tenant).get(self.tenant_id)
-            if not tenant:
-                QMessageBox.warning(self, "Erro", "Inquilino não encontrado!")
-                return
-
-            payment_data = PaymentDialog.get_payment(tenant.name, self.db, self)
-            if payment_data:
-                try:
-                    # Add tenant_id to payment data
-                    payment_data["tenant_id"] = self.tenant_id
-
-                    # Record the payment
-                    payment = self.db.record_payment(**payment_data)
-
-                    if payment:
-                        QMessageBox.information(
-                            self,
-                            "Sucesso",
-                            f"Pagamento de {payment_data['amount']} € registado com sucesso!",
-                        )
-                        # Refresh the view
-                        self.load_payments()
-                        self.update_balance()
-                        # Notify parent to refresh payments tab if needed
-                        if self.parent_widget:
-                            self.parent_widget.load_payments()
-                    else:
-                        QMessageBox.critical(
-                            self, "Erro", "Falha ao registrar o pagamento!"
-                        )
-
-                except Exception as e:
-                    QMessageBox.critical(
+        with self.db.session_scope() as session:
+            tenant = session.get(Tenant, self.tenant_id)
+            tenant_name = tenant.name if tenant else None
+        if not tenant_name:
+            QMessageBox.warning(self, "Erro", "Inquilino não encontrado!")
+            return
+
+        payment_data = PaymentDialog.get_payment(tenant_name, self.db, self)
+        if payment_data:
+            try:
+                # Add tenant_id to payment data
+                payment_data["tenant_id"] = self.tenant_id
+
+                # Record the payment
+                payment = self.db.record_payment(**payment_data)
+
+                if payment:
+                    QMessageBox.information(
                         self,
-                        "Erro",
-                        f"Ocorreu um erro ao registrar o pagamento:\n{str(e)}",
+                        "Sucesso",
+                        f"Pagamento de {payment_data['amount']} € registado com sucesso!",
                     )
+                    # Refresh the view
+                    self.refresh()
+                    self.update_balance()
+                else:
+                    QMessageBox.critical(
+                        self, "Erro", "Falha ao registrar o pagamento!"
+                    )
+
+            except Exception as e:
+                QMessageBox.critical(
+                    self,
+                    "Erro",
+                    f"Ocorreu um erro ao registrar o pagamento:\n{str(e)}",
+                )
 
 
 class QDateEdit(QtWidgets.QDateEdit):
@@ -0,0 +1,340 @@
+import logging
+import threading
+from collections import namedtuple
+
+from PyQt6.QtCore import (
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QCoreApplication,
+    Qt,
+    pyqtSignal,
+)
+
+from tenants_manager.models.tenant import Tenant
+from tenants_manager.utils.balances import month_end, to_date
+from tenants_manager.utils.database import RoomOccupancy
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Rows handed to the GUI thread; plain tuples, no ORM objects or sessions
+TenantRow = namedtuple(
+    "TenantRow",
+    "id name room rent bi email phone address birth_date is_active balance",
+)
+TenantPage = namedtuple("TenantPage", "total rows next_cursor prev_cursor")
+PaymentOverviewRow = namedtuple(
+    "PaymentOverviewRow", "tenant_id name room rent amount_paid status balance"
+)
+PaymentOverview = namedtuple("PaymentOverview", "total_rent total_debt rows")
+RoomRow = RoomOccupancy
+RoomTenantRow = namedtuple("RoomTenantRow", "name bi phone")
+PaymentSearch = namedtuple(
+    "PaymentSearch", "search_term start_date end_date payments expected"
+)
+PaymentHistoryRow = namedtuple(
+    "PaymentHistoryRow",
+    "id payment_date payment_type reference_month amount status description "
+    "is_expected",
+)
+
+
+def payment_history_row(payment):
+    """PaymentHistoryRow for a Payment or an expected rent entry"""
+    return PaymentHistoryRow(
+        getattr(payment, "id", None),
+        getattr(payment, "payment_date", None),
+        getattr(payment, "payment_type", None),
+        getattr(payment, "reference_month", None),
+        getattr(payment, "amount", 0) or 0,
+        getattr(payment, "status", ""),
+        getattr(payment, "description", "") or "",
+        bool(getattr(payment, "is_expected", False)),
+    )
+
+
+def tenant_row(tenant):
+    """TenantRow for a Tenant loaded with its room and balance"""
+    return TenantRow(
+        tenant.id,
+        tenant.name,
+        tenant.room_ref.name if tenant.room_ref else "",
+        tenant.rent,
+        tenant.bi,
+        tenant.email,
+        tenant.phone,
+        tenant.address,
+        tenant.birth_date,
+        tenant.is_active,
+        getattr(tenant, "balance", 0.0),
+    )
+
+
+def fetch_tenant_page(
+    db_manager, cursor, limit, search_term, include_deleted, with_total=True
+):
+    """Count and page of the tenant list, with balances
+
+    The count is skipped (total is None) with with_total=False, for pages
+    appended to a list that was already counted.
+    """
+    total = None
+    if with_total:
+        total = db_manager.get_tenants_count(
+            search_term=search_term, include_deleted=include_deleted
+        )
+    tenants, next_cursor, prev_cursor = db_manager.get_tenants_page(
+        cursor=cursor,
+        limit=limit,
+        search_term=search_term,
+        include_deleted=include_deleted,
+        with_balances=True,
+    )
+    rows = [tenant_row(tenant) for tenant in tenants]
+    return TenantPage(total, rows, next_cursor, prev_cursor)
+
+
+def fetch_tenant_rows(db_manager, tenant_ids, room_ids, search_term, include_deleted):
+    """Current rows of changed tenants, for patching a loaded list
+
+    Returns:
+        TenantPage: the new total and the rows of the tenants still in the
+        list; no cursors
+    """
+    total = db_manager.get_tenants_count(
+        search_term=search_term, include_deleted=include_deleted
+    )
+    tenants = db_manager.get_tenants_by_id(
+        tenant_ids,
+        room_ids,
+        search_term=search_term,
+        include_deleted=include_deleted,
+        with_balances=True,
+    )
+    return TenantPage(total, [tenant_row(tenant) for tenant in tenants], None, None)
+
+
+def balance_date(reference_month):
+    """Date of the balances shown for a month: its last day once it has ended"""
+    as_of_date = month_end(reference_month)
+    if as_of_date >= to_date():
+        return reference_month
+    return as_of_date
+
+
+def fetch_payment_overview(
+    db_manager, reference_month, tenant_ids=None, room_ids=None, with_totals=True
+):
+    """Monthly totals and per-tenant payment status
+
+    Balances of a month that has ended are its closing balances, read from
+    the snapshots once the month is closed (see utils.periods).
+    With tenant_ids or room_ids only the rows of those tenants (or rooms)
+    are fetched, for patching a loaded overview. The totals are None with
+    with_totals=False, when the changes cannot have moved them.
+    """
+    as_of_date = balance_date(reference_month)
+    rows = [
+        PaymentOverviewRow(
+            entry["tenant_id"],
+            entry["name"],
+            entry["room"],
+            entry["rent"],
+            entry["amount_paid"],
+            entry["status"],
+            entry["balance"],
+        )
+        for entry in db_manager.get_monthly_payment_overview(
+            reference_month, tenant_ids, room_ids, as_of_date
+        )
+    ]
+    if not with_totals:
+        return PaymentOverview(None, None, rows)
+    return PaymentOverview(
+        db_manager.get_total_rent_collected(reference_month) or 0.0,
+        db_manager.get_total_debt(as_of_date) or 0.0,
+        rows,
+    )
+
+
+def fetch_aging_report(db_manager, as_of_date, include_deleted=False):
+    """Outstanding rent by age for every tenant and room, see utils.aging"""
+    return db_manager.get_aging_report(as_of_date, include_deleted)
+
+
+def fetch_rooms(db_manager, search_term, room_ids=None):
+    """Rooms matching the search with their active tenant count"""
+    return db_manager.get_rooms_with_occupancy(search_term, room_ids)
+
+
+def fetch_room_tenants(db_manager, room_id):
+    """Active tenants of a room"""
+    with db_manager.session_scope() as session:
+        rows = (
+            session.query(Tenant.name, Tenant.bi, Tenant.phone)
+            .filter(Tenant.room_id == room_id, Tenant.is_active == True)
+            .order_by(Tenant.name)
+        )
+        return [RoomTenantRow(*row) for row in rows]
+
+
+def fetch_payment_search(
+    db_manager, tenant_id, start_date, end_date, search_term, limit
+):
+    """Every payment of a tenant matching a search, for narrowing in memory
+
+    Expected rent entries are fetched without the search applied; which of
+    them show depends on the payments left after narrowing, see
+    DatabaseManager.merge_expected_entries.
+
+    Returns:
+        PaymentSearch, or None when more than limit payments match
+    """
+    payments, total = db_manager.get_tenant_payments(
+        tenant_id,
+        start_date,
+        end_date,
+        per_page=limit,
+        search_term=search_term,
+        include_expected=False,
+    )
+    if total > limit:
+        return None
+    expected = db_manager.get_expected_rent_entries(tenant_id, start_date, end_date)
+    return PaymentSearch(search_term, start_date, end_date, payments, expected)
+
+
+class _QueryTask(QRunnable):
+    """Runs one load on a pool thread and reports back through the runner"""
+
+    def __init__(self, runner, key, request_id, func, args, kwargs):
+        super().__init__()
+        self.runner = runner
+        self.key = key
+        self.request_id = request_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # Superseded while waiting in the queue, skip the query entirely
+        if not self.runner.is_current(self.key, self.request_id):
+            return
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.exception(f"Background load '{self.key}' failed")
+            self.runner._failed.emit(self.key, self.request_id, str(e))
+        else:
+            self.runner._finished.emit(self.key, self.request_id, result)
+
+
+class QueryRunner(QObject):
+    """Runs database loads off the GUI thread.
+
+    Loads are grouped by key ("tenants", "payments", ...). Submitting a new
+    load for a key supersedes the previous one: if it has not started it is
+    skipped, and if it has its result is dropped. Callbacks run on the GUI
+    thread, only for the latest load of each key.
+
+    The loaders open their own sessions through DatabaseManager and return
+    plain tuples, so nothing bound to a worker session reaches the GUI.
+    """
+
+    _finished = pyqtSignal(str, int, object)
+    _failed = pyqtSignal(str, int, str)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._callbacks = {}
+        self._finished.connect(self._deliver_result)
+        self._failed.connect(self._deliver_error)
+
+    def submit(self, key, func, *args, on_result=None, on_error=None, **kwargs):
+        """Queue func(*args, **kwargs), superseding any pending load for key
+
+        Returns:
+            int: ID of the request
+        """
+        with self._lock:
+            request_id = self._latest.get(key, 0) + 1
+            self._latest[key] = request_id
+        self._callbacks[key] = (request_id, on_result, on_error)
+        self.pool.start(_QueryTask(self, key, request_id, func, args, kwargs))
+        return request_id
+
+    def is_current(self, key, request_id):
+        """Whether request_id is still the latest load for key"""
+        with self._lock:
+            return self._latest.get(key) == request_id
+
+    def cancel(self, key=None):
+        """Drop the pending load for key, or for every key"""
+        with self._lock:
+            keys = list(self._latest) if key is None else [key]
+            for name in keys:
+                self._latest[name] = self._latest.get(name, 0) + 1
+        for name in keys:
+            self._callbacks.pop(name, None)
+
+    def is_pending(self, key):
+        """Whether a load for key was submitted and not delivered yet"""
+        return key in self._callbacks
+
+    def wait(self, msecs=-1):
+        """Block until pending loads, and loads their callbacks start, are delivered"""
+        while self._callbacks:
+            if not self.pool.waitForDone(msecs):
+                return False
+            QCoreApplication.processEvents()
+        return True
+
+    def _deliver_result(self, key, request_id, result):
+        callback = self._take_callback(key, request_id)
+        if callback and callback[1]:
+            callback[1](result)
+
+    def _deliver_error(self, key, request_id, message):
+        callback = self._take_callback(key, request_id)
+        if callback and callback[2]:
+            callback[2](message)
+
+    def _take_callback(self, key, request_id):
+        callback = self._callbacks.get(key)
+        if callback is None or callback[0] != request_id:
+            logger.debug(f"Dropping stale result for '{key}' ({request_id})")
+            return None
+        del self._callbacks[key]
+        return callback
+
+
+class ChangeNotifier(QObject):
+    """Delivers the ChangeSets of a DatabaseManager on the GUI thread.
+
+    Commits publish on whichever thread made them, inside commit(); changed
+    is always queued, so slots run from the event loop once the commit and
+    the code around it have finished.
+    """
+
+    changed = pyqtSignal(object)
+    _published = pyqtSignal(object)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.bus = db_manager.changes
+        self._published.connect(
+            self.changed.emit, Qt.ConnectionType.QueuedConnection
+        )
+        self.bus.subscribe(self._publish)
+
+    def close(self):
+        """Stop listening; call before the notifier is deleted"""
+        self.bus.unsubscribe(self._publish)
+
+    def _publish(self, changes):
+        self._published.emit(changes)
@@ -0,0 +1,579 @@
+import logging
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor, QFont
+
+from tenants_manager.models.tenant import PaymentStatus
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Shared by every cell that uses them; data() never builds colours per cell
+RED = QColor(Qt.GlobalColor.red)
+DARK_GREEN = QColor(Qt.GlobalColor.darkGreen)
+DARK_YELLOW = QColor(Qt.GlobalColor.darkYellow)
+WHITE = QColor(Qt.GlobalColor.white)
+GREEN = QColor(Qt.GlobalColor.green)
+YELLOW = QColor(Qt.GlobalColor.yellow)
+
+# Payment history row backgrounds
+EXPECTED_BACKGROUND = QColor(230, 230, 230)  # Light gray for expected
+STATUS_BACKGROUNDS = {
+    PaymentStatus.PENDING: QColor(255, 255, 200),  # Light yellow for pending
+    PaymentStatus.CANCELLED: QColor(255, 200, 200),  # Light red for cancelled
+    PaymentStatus.REFUNDED: QColor(200, 255, 200),  # Light green for refunded
+}
+COMPLETED_BACKGROUND = QColor(255, 255, 255)  # White for completed
+
+CENTER = int(Qt.AlignmentFlag.AlignCenter)
+
+
+class RowTableModel(QAbstractTableModel):
+    """Read-only table model over a list of row tuples.
+
+    Subclasses name their columns in HEADERS and turn a row into cell values
+    in display(); colours, fonts and alignment come from the other role hooks.
+    Nothing is created per cell: rows stay plain tuples and the hooks return
+    shared QColor/QFont instances.
+
+    Rows reach the view through canFetchMore/fetchMore. Rows already held are
+    exposed FETCH_BATCH at a time as the view scrolls, and once they run out
+    an optional loader is asked for the next chunk. The loader is called with
+    a deliver(rows, more) callback, which it may call later (for example
+    from a QueryRunner result); more=False marks the end of the data.
+    """
+
+    HEADERS = ()
+    FETCH_BATCH = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._visible = 0
+        self._loader = None
+        self._loading = False
+        # Bumped on every reset so deliveries for older rows are ignored
+        self._generation = 0
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_rows(self, rows, loader=None):
+        """Replace the rows, optionally with a loader for further chunks"""
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = list(rows)
+        self._loader = loader
+        self._loading = False
+        self._sort_rows()
+        self._visible = min(len(self._rows), self.FETCH_BATCH)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_rows([])
+
+    def patch_rows(self, ids, rows, order_key=None):
+        """Bring changed rows up to date without resetting the model.
+
+        rows are the current versions of the changed rows that still belong
+        in the table. Held rows whose ID is in ids but not in rows are
+        removed. New rows are inserted where they sort: by the column the
+        view is sorted on, otherwise by order_key, the order the rows were
+        loaded in. While the loader has rows to come, new rows past the last
+        loaded one are left for it, and without an order_key new rows are
+        not inserted at all.
+        """
+        ids = set(ids)
+        fresh = {self.row_id(row): row for row in rows}
+        order = self._order(order_key)
+        for position in reversed(range(len(self._rows))):
+            row_id = self.row_id(self._rows[position])
+            if row_id in fresh:
+                row = fresh.pop(row_id)
+                if self._in_order(position, row, order):
+                    self._replace(position, row)
+                    continue
+                # Moved: take it out and insert it again below
+                fresh[row_id] = row
+                self._remove(position)
+            elif row_id in ids:
+                self._remove(position)
+
+        for row in fresh.values():
+            position = self._insert_position(row, order, order_key)
+            if position is not None:
+                self._insert(position, row)
+
+    def row(self, row):
+        """Row tuple at a view row, or None if out of range"""
+        if 0 <= row < self._visible:
+            return self._rows[row]
+        return None
+
+    def rows(self):
+        """Every row loaded so far, exposed to the view or not"""
+        return list(self._rows)
+
+    def find_row(self, row_id):
+        """View row of the row with this ID, or -1"""
+        for row in range(self._visible):
+            if self.row_id(self._rows[row]) == row_id:
+                return row
+        return -1
+
+    def is_loading(self):
+        return self._loading
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self.HEADERS)
+        ):
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._visible:
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(row, column)
+        if role == Qt.ItemDataRole.UserRole:
+            return self.row_id(row)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.foreground(row, column)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.background(row, column)
+        if role == Qt.ItemDataRole.FontRole:
+            return self.font(row, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignment(row, column)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self._visible < len(self._rows):
+            return True
+        return self._loader is not None and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._visible < len(self._rows):
+            self._expose(min(len(self._rows), self._visible + self.FETCH_BATCH))
+        elif self._loader is not None and not self._loading:
+            self._loading = True
+            generation = self._generation
+            self._loader(
+                lambda rows, more: self._deliver(generation, rows, more)
+            )
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._sort_rows()
+        self.layoutChanged.emit()
+
+    # Hooks for subclasses
+
+    def display(self, row, column):
+        raise NotImplementedError
+
+    def row_id(self, row):
+        return row[0]
+
+    def foreground(self, row, column):
+        return None
+
+    def background(self, row, column):
+        return None
+
+    def font(self, row, column):
+        return None
+
+    def alignment(self, row, column):
+        return None
+
+    def sort_key(self, row, column):
+        return self.display(row, column)
+
+    # Internals
+
+    def _expose(self, visible):
+        self.beginInsertRows(QModelIndex(), self._visible, visible - 1)
+        self._visible = visible
+        self.endInsertRows()
+
+    def _deliver(self, generation, rows, more):
+        if generation != self._generation:
+            logger.debug("Dropping rows fetched for a previous reset")
+            return
+        self._loading = False
+        if not more:
+            self._loader = None
+        if rows:
+            self._rows.extend(rows)
+            self._expose(len(self._rows))
+
+    def _replace(self, position, row):
+        self._rows[position] = row
+        if position < self._visible:
+            self.dataChanged.emit(
+                self.index(position, 0), self.index(position, len(self.HEADERS) - 1)
+            )
+
+    def _remove(self, position):
+        if position >= self._visible:
+            del self._rows[position]
+            return
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self._rows[position]
+        self._visible -= 1
+        self.endRemoveRows()
+
+    def _insert(self, position, row):
+        if position > self._visible:
+            self._rows.insert(position, row)
+            return
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, row)
+        self._visible += 1
+        self.endInsertRows()
+
+    def _order(self, order_key):
+        """(key, reverse) the held rows are in, or None if not known"""
+        if self._sort_column is not None and 0 <= self._sort_column < len(self.HEADERS):
+            column = self._sort_column
+            return (
+                lambda row: self.sort_key(row, column),
+                self._sort_order == Qt.SortOrder.DescendingOrder,
+            )
+        if order_key is not None:
+            return order_key, False
+        return None
+
+    def _in_order(self, position, row, order):
+        """Whether row can replace the row at position and keep the order"""
+        if order is None:
+            return True
+        key, reverse = order
+        value = key(row)
+        if position > 0:
+            previous = key(self._rows[position - 1])
+            if (value > previous) if reverse else (value < previous):
+                return False
+        if position + 1 < len(self._rows):
+            following = key(self._rows[position + 1])
+            if (value < following) if reverse else (value > following):
+                return False
+        return True
+
+    def _insert_position(self, row, order, order_key):
+        """Position for a new row, or None to leave it out"""
+        if order is None:
+            return None
+        if self._loader is not None:
+            # Rows past the last loaded one come with the next chunks
+            if order_key is None or not self._rows:
+                return None
+            if order_key(row) > max(order_key(held) for held in self._rows):
+                return None
+        key, reverse = order
+        value = key(row)
+        for position, held in enumerate(self._rows):
+            other = key(held)
+            if (value > other) if reverse else (value < other):
+                return position
+        return len(self._rows)
+
+    def _sort_rows(self):
+        if self._sort_column is None or not 0 <= self._sort_column < len(self.HEADERS):
+            return
+        column = self._sort_column
+        self._rows.sort(
+            key=lambda row: self.sort_key(row, column),
+            reverse=self._sort_order == Qt.SortOrder.DescendingOrder,
+        )
+
+
+class TenantTableModel(RowTableModel):
+    """Tenant list over TenantRow tuples"""
+
+    HEADERS = (
+        "Nome",
+        "Quarto",
+        "Renda (€)",
+        "BI",
+        "Email",
+        "Telefone",
+        "Endereço",
+        "Data de Nascimento",
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.deleted_font = QFont()
+        self.deleted_font.setStrikeOut(True)
+
+    def display(self, tenant, column):
+        if column == 0:
+            return tenant.name
+        if column == 1:
+            return tenant.room
+        if column == 2:
+            return f"{tenant.rent:.2f} €"
+        if column == 3:
+            return tenant.bi
+        if column == 4:
+            return tenant.email or ""
+        if column == 5:
+            return tenant.phone or ""
+        if column == 6:
+            return tenant.address or ""
+        if column == 7:
+            return tenant.birth_date.strftime("%d/%m/%Y") if tenant.birth_date else ""
+        return None
+
+    def foreground(self, tenant, column):
+        # Deleted tenants in red, rent in red while the tenant owes money
+        if column in (0, 1) and not tenant.is_active:
+            return RED
+        if column == 2 and tenant.balance > 0:
+            return RED
+        return None
+
+    def font(self, tenant, column):
+        if column in (0, 1) and not tenant.is_active:
+            return self.deleted_font
+        return None
+
+    def alignment(self, tenant, column):
+        return CENTER if column == 1 else None
+
+
+class PaymentOverviewModel(RowTableModel):
+    """Monthly payment status over PaymentOverviewRow tuples"""
+
+    HEADERS = ("Inquilino", "Quarto", "Renda", "Status", "Valor Pago", "Saldo")
+
+    def display(self, entry, column):
+        if column == 0:
+            return entry.name
+        if column == 1:
+            return entry.room
+        if column == 2:
+            return f"{entry.rent:.2f} €"
+        if column == 3:
+            if entry.status == "paid":
+                return "Pago"
+            if entry.status == "partial":
+                return f"Parcial ({entry.amount_paid/entry.rent:.0%})"
+            return "Pendente"
+        if column == 4:
+            return f"{entry.amount_paid:.2f} €"
+        if column == 5:
+            return f"{entry.balance:.2f} €"
+        return None
+
+    def foreground(self, entry, column):
+        if column == 3:
+            if entry.status == "paid":
+                return DARK_GREEN
+            if entry.status == "partial":
+                return DARK_YELLOW
+            return RED
+        if column == 5:
+            if entry.balance > 0:
+                return RED
+            if entry.balance < 0:
+                return DARK_GREEN
+        return None
+
+    def sort_key(self, entry, column):
+        # Amounts sort by value rather than by their formatted text
+        if column == 2:
+            return entry.rent
+        if column == 4:
+            return entry.amount_paid
+        if column == 5:
+            return entry.balance
+        return self.display(entry, column)
+
+
+class RoomTableModel(RowTableModel):
+    """Rooms over RoomRow tuples"""
+
+    HEADERS = ("ID", "Nome", "Capacidade", "Ocupação")
+
+    def display(self, room, column):
+        if column == 0:
+            return str(room.id)
+        if column == 1:
+            return room.name
+        if column == 2:
+            return str(room.capacity)
+        if column == 3:
+            return f"{room.occupancy}/{room.capacity}"
+        return None
+
+    def background(self, room, column):
+        # Color code based on occupancy
+        if column != 3:
+            return None
+        if room.occupancy >= room.capacity:
+            return RED
+        if room.occupancy == 0:
+            return GREEN
+        return YELLOW
+
+    def foreground(self, room, column):
+        if column == 3 and room.occupancy >= room.capacity:
+            return WHITE
+        return None
+
+
+class RoomTenantModel(RowTableModel):
+    """Tenants of one room over RoomTenantRow tuples"""
+
+    HEADERS = ("Nome", "BI", "Telefone")
+
+    def display(self, tenant, column):
+        if column == 0:
+            return tenant.name
+        if column == 1:
+            return tenant.bi or ""
+        if column == 2:
+            return tenant.phone or ""
+        return None
+
+    def row_id(self, tenant):
+        return tenant.bi
+
+
+class PaymentHistoryModel(RowTableModel):
+    """Payment history over PaymentHistoryRow tuples"""
+
+    HEADERS = ("Data", "Tipo", "Referência", "Valor", "Status", "Descrição")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.expected_font = QFont()
+        self.expected_font.setItalic(True)
+
+    def display(self, payment, column):
+        if column == 0:
+            return (
+                payment.payment_date.strftime("%d/%m/%Y")
+                if payment.payment_date
+                else ""
+            )
+        if column == 1:
+            return str(payment.payment_type.value) if payment.payment_type else ""
+        if column == 2:
+            return (
+                payment.reference_month.strftime("%m/%Y")
+                if payment.reference_month
+                else ""
+            )
+        if column == 3:
+            return f"{payment.amount:.2f} €"
+        if column == 4:
+            status = payment.status
+            if isinstance(status, str):
+                return status
+            if hasattr(status, "value"):
+                return status.value
+            return str(status) if status is not None else ""
+        if column == 5:
+            return payment.description or ""
+        return None
+
+    def background(self, payment, column):
+        # Color code the row based on payment status
+        if payment.is_expected:
+            return EXPECTED_BACKGROUND
+        return STATUS_BACKGROUNDS.get(payment.status, COMPLETED_BACKGROUND)
+
+    def font(self, payment, column):
+        # Make the text italic for expected payments
+        return self.expected_font if payment.is_expected else None
+
+    def sort_key(self, payment, column):
+        if column == 0:
+            return payment.payment_date.timetuple() if payment.payment_date else ()
+        if column == 2:
+            return (
+                payment.reference_month.timetuple() if payment.reference_month else ()
+            )
+        if column == 3:
+            return payment.amount
+        return self.display(payment, column)
+
+
+class AgingTableModel(RowTableModel):
+    """Outstanding rent by age over aging.AgingRow tuples"""
+
+    LABELS = ("Inquilino", "Quarto")
+    HEADERS = LABELS + (
+        "0-30 dias",
+        "31-60 dias",
+        "61-90 dias",
+        "+90 dias",
+        "Total em Dívida",
+    )
+
+    def label(self, row, column):
+        return row.name if column == 0 else row.room or ""
+
+    def amount(self, row, column):
+        """Bucket amount, or the total owed for the last column"""
+        amounts = (row.days_0_30, row.days_31_60, row.days_61_90, row.days_over_90)
+        bucket = column - len(self.LABELS)
+        return amounts[bucket] if bucket < len(amounts) else sum(amounts)
+
+    def display(self, row, column):
+        if column < len(self.LABELS):
+            return self.label(row, column)
+        if column < len(self.HEADERS):
+            return f"{self.amount(row, column):.2f} €"
+        return None
+
+    def foreground(self, row, column):
+        # Rent owed for more than 90 days, and whoever owes it
+        if column >= len(self.HEADERS) - 2 and self.amount(row, column) > 0:
+            return RED
+        return None
+
+    def alignment(self, row, column):
+        return CENTER if column == 1 else None
+
+    def sort_key(self, row, column):
+        if len(self.LABELS) <= column < len(self.HEADERS):
+            return self.amount(row, column)
+        return self.display(row, column)
+
+
+class RoomAgingModel(AgingTableModel):
+    """Outstanding rent by age per room over aging.RoomAging tuples"""
+
+    LABELS = ("Quarto", "Inquilinos em Dívida")
+    HEADERS = LABELS + AgingTableModel.HEADERS[2:]
+
+    def label(self, room, column):
+        return room.room if column == 0 else f"{room.in_arrears}/{room.tenants}"
+
+    def sort_key(self, room, column):
+        if column == 1:
+            return room.in_arrears
+        return super().sort_key(room, column)
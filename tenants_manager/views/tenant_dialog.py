@@ -14,7 +14,7 @@ from PyQt6.QtWidgets import (
 from sqlalchemy.orm import joinedload
 from PyQt6.QtCore import Qt, QDate
 from tenants_manager.models.tenant import Tenant, EmergencyContact
-from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils.database import get_database_manager
 
 
 class TenantDialog(QDialog):
@@ -58,8 +58,8 @@ class TenantDialog(QDialog):
         
         # Load existing rooms from database
         self.rooms = {}
-        db_manager = DatabaseManager()
-        with db_manager.get_session() as session:
+        db_manager = get_database_manager()
+        with db_manager.session_scope() as session:
             from tenants_manager.models.tenant import Room
             rooms = session.query(Room).order_by(Room.name).all()
             for room in rooms:
@@ -206,6 +206,37 @@ class TenantDialog(QDialog):
                 self.emergency_phone_input.setText(self.tenant.emergency_contact.phone)
                 self.emergency_email_input.setText(self.tenant.emergency_contact.email)
 
+    def accept(self):
+        """Close the dialog unless the selected room is already full."""
+        if not self.is_deleted and not self.check_room_capacity():
+            return
+        super().accept()
+
+    def check_room_capacity(self):
+        """Check the selected room has space for this tenant.
+
+        Active tenants are counted in SQL through Room.current_occupancy,
+        without loading them.
+        """
+        room_id = self.room_combo.currentData() or self.rooms.get(
+            self.room_combo.currentText().strip().lower()
+        )
+        if not room_id:
+            return True
+        if self.tenant and self.tenant.room_id == room_id:
+            # The tenant is already counted in the room they stay in
+            return True
+
+        room = get_database_manager().get_room_occupancy(room_id)
+        if room and room.occupancy >= room.capacity:
+            QMessageBox.warning(
+                self,
+                "Aviso",
+                f"O quarto {room.name} está cheio ({room.occupancy}/{room.capacity}).",
+            )
+            return False
+        return True
+
     def validate_room_name(self):
         """Validate room name format."""
         room_name = self.room_combo.currentText().strip()
@@ -224,8 +255,8 @@ class TenantDialog(QDialog):
             from tenants_manager.models.tenant import Room
             from sqlalchemy.exc import IntegrityError
             
-            db_manager = DatabaseManager()
-            with db_manager.get_session() as session:
+            db_manager = get_database_manager()
+            with db_manager.session_scope() as session:
                 try:
                     room = Room(name=room_name, capacity=1)  # Default capacity of 1
                     session.add(room)
@@ -1,10 +1,20 @@
 import time
 import random
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
-from tenants_manager.models.tenant import Tenant, Payment, RentHistory
+from sqlalchemy import func, and_, text
+from tenants_manager.models.tenant import (
+    Tenant,
+    Payment,
+    RentHistory,
+    PaymentStatus,
+    PaymentType,
+)
+from tenants_manager.models.tenant import Room
+from tenants_manager.utils.balances import month_range
 from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.config.database import get_sqlite_pragmas
 import statistics
+import tempfile
 import os
 import sys
 
@@ -45,6 +55,16 @@ class PerformanceTester:
             
             time_taken, _ = self.measure_query_time(query)
             print(f"Page {page} (offset={offset}, limit={page_size}): {time_taken:.4f} seconds")
+
+        # Keyset pagination: every page is a seek on the (name, id) index
+        cursor = None
+        for page in range(1, 6):
+            time_taken, (_, cursor, _) = self.measure_query_time(
+                self.db.get_tenants_page, cursor, limit=page_size
+            )
+            print(f"Keyset page {page} (limit={page_size}): {time_taken:.4f} seconds")
+            if cursor is None:
+                break
     
     def test_tenant_search(self, search_terms):
         """Test performance of tenant search"""
@@ -59,6 +79,12 @@ class PerformanceTester:
             
             time_taken, results = self.measure_query_time(query)
             print(f"Search for '{term}': {len(results)} results in {time_taken:.4f} seconds")
+
+            # Full-text search over name, BI, contacts and room
+            time_taken, results = self.measure_query_time(
+                self.db.get_tenants_paginated, limit=50, search_term=term
+            )
+            print(f"FTS search for '{term}': {len(results)} results in {time_taken:.4f} seconds")
     
     def test_payment_reporting(self, start_date, end_date):
         """Test performance of payment reporting"""
@@ -87,6 +113,47 @@ class PerformanceTester:
         time_taken, results = self.measure_query_time(monthly_payments_query)
         print(f"Monthly breakdown ({len(results)} months) in {time_taken:.4f} seconds")
     
+    def test_reference_month_filter(self, reference_month, repeat=20):
+        """Compare strftime() month filtering with half-open date ranges"""
+        print("\n=== Testing reference month filtering ===")
+        month_start, next_month = month_range(reference_month)
+
+        def before():
+            return self.session.query(func.sum(Payment.amount))\
+                .filter(
+                    Payment.payment_type == PaymentType.RENT,
+                    Payment.status == PaymentStatus.COMPLETED,
+                    func.strftime('%Y-%m', Payment.reference_month)
+                    == reference_month.strftime('%Y-%m'),
+                )\
+                .scalar() or 0
+
+        def after():
+            return self.session.query(func.sum(Payment.amount))\
+                .filter(
+                    Payment.payment_type == PaymentType.RENT,
+                    Payment.status == PaymentStatus.COMPLETED,
+                    Payment.reference_month >= month_start,
+                    Payment.reference_month < next_month,
+                )\
+                .scalar() or 0
+
+        for label, query in (("strftime", before), ("date range", after)):
+            times = [self.measure_query_time(query)[0] for _ in range(repeat)]
+            print(f"{label:>10}: avg {statistics.mean(times):.5f}s over {repeat} runs")
+
+        # Show whether SQLite can use the composite index
+        plan = self.session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT SUM(amount) FROM payments "
+                "WHERE payment_type = 'RENT' AND status = 'COMPLETED' "
+                "AND reference_month >= :start AND reference_month < :end"
+            ),
+            {"start": month_start, "end": next_month},
+        ).all()
+        for row in plan:
+            print(f"  plan: {row[-1]}")
+
     def test_rent_calculation(self, sample_size=100):
         """Test performance of rent calculation for tenants"""
         print("\n=== Testing rent calculation performance ===")
@@ -118,6 +185,82 @@ class PerformanceTester:
             print(f"  Avg: {statistics.mean(times):.4f}s")
             print(f"  P95: {statistics.quantiles(times, n=20)[-1]:.4f}s")
     
+    def test_bulk_balances(self):
+        """Compare per-tenant balance calculation with the bulk SQL version"""
+        print("\n=== Testing bulk balance calculation ===")
+
+        def per_tenant():
+            return {
+                tenant.id: tenant.get_balance()
+                for tenant in self.session.query(Tenant).all()
+            }
+
+        time_taken, balances = self.measure_query_time(per_tenant)
+        print(f"Per-tenant get_balance ({len(balances)} tenants): {time_taken:.4f} seconds")
+
+        time_taken, balances = self.measure_query_time(self.db.get_balances)
+        print(f"Bulk get_balances ({len(balances)} tenants): {time_taken:.4f} seconds")
+
+    def test_sqlite_pragmas(self, num_tenants=50, num_payments=2000, num_reads=200):
+        """Compare SQLite's default settings with the connection profile.
+
+        Runs on fresh database files, one per profile: payments are recorded
+        one transaction each, like the payment dialog does, then the tenant
+        list and payment history are read back.
+        """
+        print("\n=== Testing SQLite connection profile ===")
+        rng = random.Random(42)
+        profiles = [
+            ("defaults", {}),
+            ("dev", get_sqlite_pragmas("dev")),
+            ("prod", get_sqlite_pragmas("prod")),
+        ]
+
+        for label, pragmas in profiles:
+            with tempfile.TemporaryDirectory() as tmp:
+                db = DatabaseManager(
+                    f"sqlite:///{os.path.join(tmp, 'bench.db')}", pragmas=pragmas
+                )
+                with db.session_scope() as session:
+                    room = Room(name="Quarto 1", capacity=4)
+                    session.add(room)
+                    session.flush()
+                    session.add_all(
+                        Tenant(
+                            name=f"Tenant {i:04d}",
+                            room_id=room.id,
+                            rent=500.0,
+                            bi=f"BENCH{i:06d}",
+                            birth_date=datetime(1990, 1, 1).date(),
+                            entry_date=datetime(2022, 1, 1).date(),
+                        )
+                        for i in range(num_tenants)
+                    )
+                with db.session_scope() as session:
+                    tenant_ids = [tenant_id for tenant_id, in session.query(Tenant.id)]
+
+                start = time.time()
+                for _ in range(num_payments):
+                    db.record_payment(
+                        rng.choice(tenant_ids),
+                        round(rng.uniform(50, 500), 2),
+                        payment_date=datetime(2023, 1, 1)
+                        + timedelta(days=rng.randint(0, 700)),
+                    )
+                write_time = time.time() - start
+
+                start = time.time()
+                for i in range(num_reads):
+                    db.get_tenants_page(limit=20, with_balances=True)
+                    db.get_tenant_payments(tenant_ids[i % len(tenant_ids)])
+                read_time = time.time() - start
+
+                db.engine.dispose()
+                print(
+                    f"{label:>8}: {num_payments / write_time:8.0f} payments/s, "
+                    f"{num_reads / read_time:6.0f} page reads/s"
+                )
+
     def run_all_tests(self):
         """Run all performance tests"""
         print("=== Starting Performance Tests ===")
@@ -131,7 +274,10 @@ class PerformanceTester:
         self.test_get_tenants_pagination()
         self.test_tenant_search(search_terms)
         self.test_payment_reporting(start_date, end_date)
+        self.test_reference_month_filter(end_date.date())
         self.test_rent_calculation()
+        self.test_bulk_balances()
+        self.test_sqlite_pragmas()
         
         print("\n=== Performance Tests Complete ===")
 
@@ -0,0 +1,156 @@
+import unittest
+import os
+import sys
+from datetime import datetime, date
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import (
+    Tenant,
+    Room,
+    Payment,
+    RentHistory,
+    PaymentStatus,
+    PaymentType,
+)
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils import aging
+
+
+def fifo_buckets(tenant, as_of_date):
+    """Reference aging: payments settle the oldest charges first"""
+    paid = sum(
+        payment.amount
+        for payment in tenant.payments
+        if payment.status == PaymentStatus.COMPLETED
+        and payment.payment_date.date() <= as_of_date
+    )
+    buckets = [0.0] * 4
+    for period in tenant._get_rent_periods(as_of_date):
+        settled = min(paid, period["amount"])
+        paid -= settled
+        age = (as_of_date - period["date"]).days
+        bucket = 0 if age <= 30 else 1 if age <= 60 else 2 if age <= 90 else 3
+        buckets[bucket] += period["amount"] - settled
+    return buckets
+
+
+class TestAgingReport(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+
+        self.rooms = [Room(name="Quarto 1", capacity=2), Room(name="Quarto 2", capacity=2)]
+        self.session.add_all(self.rooms)
+        self.session.flush()
+
+        # Owes January to April, except what two payments covered
+        self.ana = self.add_tenant("Ana", self.rooms[0], 400.0, date(2024, 1, 15))
+        self.add_payment(self.ana, 400.0, datetime(2024, 1, 20))
+        self.add_payment(self.ana, 250.0, datetime(2024, 3, 5))
+        # Rent went up in March
+        self.session.add(
+            RentHistory(
+                tenant_id=self.ana.id,
+                amount=400.0,
+                valid_from=datetime(2024, 1, 15),
+                valid_to=datetime(2024, 2, 29, 23, 59),
+            )
+        )
+        self.session.add(
+            RentHistory(
+                tenant_id=self.ana.id, amount=450.0, valid_from=datetime(2024, 3, 1)
+            )
+        )
+        # Paid ahead
+        self.rui = self.add_tenant("Rui", self.rooms[0], 300.0, date(2024, 3, 1))
+        self.add_payment(self.rui, 900.0, datetime(2024, 3, 2))
+        # Never paid
+        self.eva = self.add_tenant("Eva", self.rooms[1], 350.0, date(2023, 10, 1))
+        self.gone = self.add_tenant("Zé", self.rooms[1], 500.0, date(2024, 1, 1))
+        self.gone.soft_delete()
+        self.session.commit()
+
+    def add_tenant(self, name, room, rent, entry_date):
+        tenant = Tenant(
+            name=name,
+            room_id=room.id,
+            rent=rent,
+            bi=f"BI{name}",
+            birth_date=date(1990, 1, 1),
+            entry_date=entry_date,
+        )
+        self.session.add(tenant)
+        self.session.flush()
+        return tenant
+
+    def add_payment(self, tenant, amount, payment_date):
+        self.session.add(
+            Payment(
+                tenant_id=tenant.id,
+                amount=amount,
+                payment_date=payment_date,
+                payment_type=PaymentType.RENT,
+                status=PaymentStatus.COMPLETED,
+                reference_month=payment_date.date().replace(day=1),
+            )
+        )
+
+    def test_buckets(self):
+        """Unpaid charges are bucketed by age, newest owed first"""
+        report = self.db_manager.get_aging_report(date(2024, 4, 20))
+        self.assertEqual([row.name for row in report.tenants], ["Ana", "Eva", "Rui"])
+        rows = {row.name: row for row in report.tenants}
+
+        # Charges: 15/01 400, 01/02 400, 01/03 450, 01/04 450; 650 paid
+        ana = rows["Ana"]
+        self.assertAlmostEqual(ana.balance, 1050.0)
+        self.assertEqual(
+            (ana.days_0_30, ana.days_31_60, ana.days_61_90, ana.days_over_90),
+            (450.0, 450.0, 150.0, 0.0),
+        )
+
+        # In credit: nothing owed
+        self.assertLess(rows["Rui"].balance, 0)
+        self.assertEqual(rows["Rui"][5:], (0.0, 0.0, 0.0, 0.0))
+
+        # Seven months unpaid, four of them more than 90 days old
+        eva = rows["Eva"]
+        self.assertEqual(
+            (eva.days_0_30, eva.days_31_60, eva.days_61_90, eva.days_over_90),
+            (350.0, 350.0, 350.0, 1400.0),
+        )
+
+    def test_matches_reference(self):
+        """Buckets match a charge-by-charge allocation of the payments"""
+        for as_of_date in [date(2024, 1, 31), date(2024, 3, 1), date(2024, 6, 30)]:
+            rows = aging.get_aging_rows(self.session, as_of_date, include_deleted=True)
+            for row in rows:
+                tenant = self.session.get(Tenant, row.tenant_id)
+                expected = fifo_buckets(tenant, as_of_date)
+                for value, reference in zip(row[5:], expected):
+                    self.assertAlmostEqual(value, reference, places=6)
+                self.assertAlmostEqual(
+                    row.balance, tenant.get_balance(as_of_date), places=6
+                )
+
+    def test_rooms_and_total(self):
+        """Rooms and the portfolio add up their tenants"""
+        report = self.db_manager.get_aging_report(date(2024, 4, 20))
+        first, second = report.rooms
+        self.assertEqual((first.room, first.tenants, first.in_arrears), ("Quarto 1", 2, 1))
+        self.assertAlmostEqual(first.days_0_30, 450.0)
+        self.assertEqual((second.room, second.tenants), ("Quarto 2", 1))
+
+        self.assertEqual((report.total.tenants, report.total.in_arrears), (3, 2))
+        self.assertAlmostEqual(report.total.days_over_90, 1400.0)
+
+        # Soft-deleted tenants only on request
+        report = self.db_manager.get_aging_report(date(2024, 4, 20), include_deleted=True)
+        self.assertEqual(report.total.tenants, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import os
+import sys
+from datetime import date
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import Tenant, Room, RentHistory
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils import ledger
+
+
+class TestBalanceCache(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.cache = self.db_manager.balance_cache
+        with self.db_manager.session_scope() as session:
+            room = Room(name="Quarto 1", capacity=2)
+            session.add(room)
+            session.flush()
+            tenants = [
+                Tenant(
+                    name=name,
+                    room_id=room.id,
+                    rent=400.0,
+                    bi=f"BI00000{i}",
+                    birth_date=date(1990, 1, 1),
+                    entry_date=date(2024, 1, 1),
+                )
+                for i, name in enumerate(["Ana", "Rui"])
+            ]
+            session.add_all(tenants)
+            session.flush()
+            self.ana, self.rui = [tenant.id for tenant in tenants]
+
+    def reference(self, tenant_id, as_of_date=None):
+        with self.db_manager.Session() as session:
+            [entry] = ledger.compute_entries(session, [tenant_id], as_of_date)
+            return entry["balance"]
+
+    def test_hits_and_misses(self):
+        """A second lookup in the same month is served from memory"""
+        first = self.db_manager.get_balances()
+        self.assertEqual(self.cache.stats()["misses"], 2)
+        self.assertEqual(self.db_manager.get_balances(), first)
+        self.assertEqual(self.db_manager.get_tenant_balance(self.ana), first[self.ana])
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (3, 2, 2))
+
+    def test_grows_to_hold_all_tenant_reads(self):
+        """Reads larger than maxsize still hit the second time"""
+        self.cache.maxsize = 1
+        first = self.db_manager.get_balances()
+        self.assertEqual(self.db_manager.get_balances(), first)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 2, 2))
+        self.assertGreaterEqual(stats["maxsize"], 2)
+
+    def test_entries_hold_for_their_dates_only(self):
+        """Past dates of a cached month are recomputed, not guessed"""
+        balance = self.db_manager.get_tenant_balance(self.ana, date(2024, 3, 20))
+        self.assertEqual(balance, self.reference(self.ana, date(2024, 3, 20)))
+        self.assertEqual(
+            self.db_manager.get_tenant_balance(self.ana, date(2024, 3, 25)), balance
+        )
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        self.assertEqual(
+            self.db_manager.get_tenant_balance(self.ana, date(2024, 3, 1)),
+            self.reference(self.ana, date(2024, 3, 1)),
+        )
+
+    def test_payment_invalidates_its_tenant(self):
+        """Only the paying tenant is read again"""
+        self.db_manager.get_balances()
+        self.assertTrue(self.db_manager.record_payment(self.ana, 150.0))
+
+        balances = self.db_manager.get_balances()
+        self.assertEqual(balances[self.ana], self.reference(self.ana))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_rent_and_entry_date_invalidate(self):
+        """Changes to what the balance is computed from drop the entry"""
+        self.db_manager.get_balances()
+        with self.db_manager.session_scope() as session:
+            session.get(Tenant, self.ana).entry_date = date(2023, 1, 1)
+        self.db_manager.refresh_balances([self.ana])
+        self.assertEqual(
+            self.db_manager.get_tenant_balance(self.ana), self.reference(self.ana)
+        )
+
+        with self.db_manager.session_scope() as session:
+            session.get(Tenant, self.rui).rent = 500.0
+        self.assertEqual(self.cache.stats()["size"], 1)
+
+        with self.db_manager.session_scope() as session:
+            session.add(
+                RentHistory(
+                    tenant_id=self.ana, amount=450.0, valid_from=date(2024, 1, 1)
+                )
+            )
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_unrelated_changes_keep_entries(self):
+        """Renaming a tenant or a room leaves cached balances alone"""
+        self.db_manager.get_balances()
+        with self.db_manager.session_scope() as session:
+            session.get(Tenant, self.ana).name = "Ana Maria"
+            session.query(Room).one().capacity = 3
+
+        self.db_manager.get_balances()
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["invalidations"]), (2, 0))
+
+    def test_lookup_racing_an_invalidation_is_not_stored(self):
+        """A balance read before a commit does not outlive it"""
+        with self.db_manager.Session() as session:
+            entries = ledger.get_entries(session, [self.ana])
+
+        def commit_meanwhile(session, tenant_ids, as_of_date):
+            self.cache.invalidate([self.ana])
+            return entries
+
+        with mock.patch.object(ledger, "get_entries", commit_meanwhile):
+            self.db_manager.get_tenant_balance(self.ana)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_least_recently_used_are_evicted(self):
+        """The cache keeps at most maxsize entries"""
+        self.cache.maxsize = 1
+        self.db_manager.get_tenant_balance(self.ana)
+        self.db_manager.get_tenant_balance(self.rui)
+        self.db_manager.get_tenant_balance(self.rui)
+        self.db_manager.get_tenant_balance(self.ana)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 3, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
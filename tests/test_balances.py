@@ -0,0 +1,291 @@
+import unittest
+import os
+import sys
+import random
+from datetime import datetime, date, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import (
+    Tenant,
+    Room,
+    Payment,
+    RentHistory,
+    PaymentStatus,
+    PaymentType,
+    TenantBalance,
+)
+from tenants_manager.utils.database import DatabaseManager
+
+
+def populate(session, num_tenants=25, seed=1234):
+    """Create tenants with irregular rent history and payments"""
+    rng = random.Random(seed)
+    room = Room(name="Quarto 1", capacity=4)
+    session.add(room)
+    session.flush()
+
+    tenants = []
+    for i in range(num_tenants):
+        entry_date = date(2019, 1, 1) + timedelta(days=rng.randint(0, 5 * 365))
+        tenant = Tenant(
+            name=f"Tenant {i:03d}",
+            room_id=room.id,
+            rent=round(rng.uniform(300, 900), 2),
+            bi=f"BI{i:06d}",
+            birth_date=date(1990, 1, 1),
+            entry_date=entry_date,
+        )
+        session.add(tenant)
+        session.flush()
+
+        # Rent history: mix of closed intervals, gaps, overlaps and open ends
+        valid_from = datetime.combine(
+            entry_date - timedelta(days=rng.randint(0, 60)), datetime.min.time()
+        ) + timedelta(hours=rng.randint(0, 23))
+        for _ in range(rng.randint(0, 4)):
+            valid_to = None
+            if rng.random() < 0.7:
+                valid_to = valid_from + timedelta(days=rng.randint(20, 500))
+            session.add(
+                RentHistory(
+                    tenant_id=tenant.id,
+                    amount=round(rng.uniform(250, 1000), 2),
+                    valid_from=valid_from,
+                    valid_to=valid_to,
+                )
+            )
+            valid_from = valid_from + timedelta(days=rng.randint(-30, 400))
+
+        for _ in range(rng.randint(0, 30)):
+            session.add(
+                Payment(
+                    tenant_id=tenant.id,
+                    amount=round(rng.uniform(50, 900), 2),
+                    payment_date=datetime.combine(
+                        entry_date + timedelta(days=rng.randint(-10, 1500)),
+                        datetime.min.time(),
+                    )
+                    + timedelta(hours=rng.randint(0, 23)),
+                    payment_type=rng.choice(list(PaymentType)),
+                    status=rng.choice(
+                        [PaymentStatus.COMPLETED] * 3 + [PaymentStatus.PENDING]
+                    ),
+                    reference_month=entry_date.replace(day=1),
+                )
+            )
+        tenants.append(tenant)
+
+    session.commit()
+    return tenants
+
+
+def reference_rent_periods(tenant, as_of_date):
+    """Month-by-month scan of the rent history, one month at a time"""
+    history = sorted(tenant.rent_history, key=lambda x: x.valid_from)
+    periods = []
+    current_date = tenant.entry_date
+    while current_date <= as_of_date:
+        applicable_rent = tenant.rent
+        for record in history:
+            valid_from = record.valid_from.date()
+            valid_to = record.valid_to.date() if record.valid_to else None
+            if valid_from <= current_date and (
+                valid_to is None or valid_to >= current_date
+            ):
+                applicable_rent = record.amount
+                break
+        periods.append({"date": current_date, "amount": applicable_rent})
+        if current_date.month == 12:
+            current_date = current_date.replace(
+                year=current_date.year + 1, month=1, day=1
+            )
+        else:
+            current_date = current_date.replace(month=current_date.month + 1, day=1)
+    return periods
+
+
+class TestRentDue(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+        self.tenants = populate(self.session, num_tenants=60, seed=99)
+
+    def test_rent_periods_match_reference(self):
+        """Lazily generated rent periods match the month-by-month scan"""
+        as_of = date(2025, 3, 10)
+        for tenant in self.tenants:
+            self.assertEqual(
+                tenant._get_rent_periods(as_of),
+                reference_rent_periods(tenant, as_of),
+            )
+
+    def test_rent_due_matches_reference(self):
+        """Closed-form rent due equals the sum of the monthly periods"""
+        for as_of in (date(2019, 6, 30), date(2022, 1, 1), date(2025, 3, 10)):
+            for tenant in self.tenants:
+                expected = sum(
+                    period["amount"]
+                    for period in reference_rent_periods(tenant, as_of)
+                )
+                self.assertAlmostEqual(
+                    tenant.get_rent_due(as_of), expected, places=6
+                )
+
+    def test_iter_rent_periods_is_lazy(self):
+        """Rent periods are produced by a generator"""
+        periods = self.tenants[0]._iter_rent_periods(date(2025, 1, 1))
+        first = next(periods)
+        self.assertEqual(first["date"], self.tenants[0].entry_date)
+
+
+class TestBulkBalances(unittest.TestCase):
+    AS_OF_DATES = [
+        date(2018, 6, 1),
+        date(2020, 2, 29),
+        date(2021, 7, 1),
+        date(2022, 12, 31),
+        date(2024, 5, 17),
+    ]
+
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+        self.tenants = populate(self.session)
+
+    def test_get_balances_matches_get_balance(self):
+        """Bulk balances equal the per-tenant reference computation"""
+        for as_of in self.AS_OF_DATES:
+            balances = self.db_manager.get_balances(as_of_date=as_of)
+            self.assertEqual(len(balances), len(self.tenants))
+            for tenant in self.tenants:
+                self.assertAlmostEqual(
+                    balances[tenant.id], tenant.get_balance(as_of), places=6
+                )
+
+    def test_get_balances_subset(self):
+        """Only the requested tenants are returned"""
+        ids = [tenant.id for tenant in self.tenants[:5]]
+        balances = self.db_manager.get_balances(ids, date(2023, 1, 1))
+        self.assertEqual(sorted(balances), sorted(ids))
+        self.assertEqual(self.db_manager.get_balances([], date(2023, 1, 1)), {})
+
+    def test_paginated_tenants_with_balances(self):
+        """A page of tenants comes back annotated with balances"""
+        tenants = self.db_manager.get_tenants_paginated(
+            offset=5, limit=10, with_balances=True
+        )
+        self.assertEqual(len(tenants), 10)
+        by_id = {tenant.id: tenant for tenant in self.tenants}
+        for tenant in tenants:
+            self.assertEqual(tenant.name, by_id[tenant.id].name)
+            self.assertAlmostEqual(
+                tenant.balance, by_id[tenant.id].get_balance(), places=6
+            )
+
+    def test_get_total_debt(self):
+        """Total debt sums the positive balances only"""
+        as_of = date(2023, 3, 15)
+        expected = sum(
+            max(0.0, tenant.get_balance(as_of)) for tenant in self.tenants
+        )
+        self.assertAlmostEqual(
+            self.db_manager.get_total_debt(as_of), expected, places=6
+        )
+
+
+class TestBalanceLedger(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+        self.tenants = populate(self.session, seed=7)
+
+    def assertLedgerMatchesReference(self):
+        self.session.expire_all()
+        balances = self.db_manager.get_balances()
+        for tenant in self.tenants:
+            self.assertAlmostEqual(balances[tenant.id], tenant.get_balance(), places=6)
+
+    def test_balances_are_stored_on_read(self):
+        """Reading balances fills the ledger, later reads come from it"""
+        self.assertEqual(self.session.query(TenantBalance).count(), 0)
+        self.assertLedgerMatchesReference()
+        self.assertEqual(self.session.query(TenantBalance).count(), len(self.tenants))
+        self.assertLedgerMatchesReference()
+
+    def test_record_payment_updates_ledger(self):
+        """New payments adjust the stored balance incrementally"""
+        self.db_manager.get_balances()
+        tenant = self.tenants[0]
+        before = self.session.get(TenantBalance, tenant.id).balance
+
+        self.db_manager.record_payment(tenant.id, 125.0, payment_date=datetime.utcnow())
+        self.session.expire_all()
+        self.assertAlmostEqual(
+            self.session.get(TenantBalance, tenant.id).balance, before - 125.0
+        )
+        self.assertLedgerMatchesReference()
+
+        # A future-dated payment does not change today's balance
+        self.db_manager.record_payment(
+            tenant.id, 80.0, payment_date=datetime.utcnow() + timedelta(days=3)
+        )
+        self.assertLedgerMatchesReference()
+
+    def test_update_rent_refreshes_ledger(self):
+        """Rent changes recompute the stored balance"""
+        self.db_manager.get_balances()
+        tenant = self.tenants[1]
+        self.assertTrue(tenant.update_rent(tenant.rent + 100, session=self.session))
+        self.assertLedgerMatchesReference()
+
+    def test_soft_delete_and_restore(self):
+        """Soft delete state is mirrored in the ledger"""
+        self.db_manager.get_balances()
+        tenant_id = self.tenants[2].id
+        self.db_manager.delete_tenant(tenant_id)
+        self.session.expire_all()
+        self.assertFalse(self.session.get(TenantBalance, tenant_id).is_active)
+        self.db_manager.restore_tenant(tenant_id)
+        self.session.expire_all()
+        self.assertTrue(self.session.get(TenantBalance, tenant_id).is_active)
+
+    def test_deleted_tenants_left_out_of_totals(self):
+        """Totals skip tenants the ledger marks as deleted"""
+        balances = self.db_manager.get_balances()
+        tenant_id = next(tid for tid, balance in balances.items() if balance > 0)
+        total = self.db_manager.get_total_debt()
+
+        self.db_manager.delete_tenant(tenant_id)
+        active = self.db_manager.get_balances(include_deleted=False)
+        self.assertNotIn(tenant_id, active)
+        self.assertEqual(len(active), len(balances) - 1)
+        self.assertAlmostEqual(
+            self.db_manager.get_total_debt(), total - balances[tenant_id], places=6
+        )
+        self.assertAlmostEqual(
+            self.db_manager.get_total_debt(include_deleted=True), total, places=6
+        )
+
+    def test_rebuild_and_verify(self):
+        """Rebuild fills every row and verify finds no mismatches"""
+        self.assertEqual(self.db_manager.rebuild_balances(), len(self.tenants))
+        report = self.db_manager.verify_balances()
+        self.assertEqual(report["checked"], len(self.tenants))
+        self.assertEqual(report["mismatches"], [])
+        self.assertEqual(report["missing"], [])
+
+        self.session.query(TenantBalance).filter(
+            TenantBalance.tenant_id == self.tenants[0].id
+        ).update({"balance": 1e6})
+        self.session.commit()
+        report = self.db_manager.verify_balances()
+        self.assertEqual([m[0] for m in report["mismatches"]], [self.tenants[0].id])
+
+
+if __name__ == "__main__":
+    unittest.main()
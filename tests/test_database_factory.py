@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from tenants_manager.utils.database import DatabaseManager, get_database_manager
+
+
+class TestDatabaseManagerFactory(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_url = f"sqlite:///{os.path.join(tmp.name, 'tenants.db')}"
+
+    def test_shared_per_url(self):
+        """The factory hands out one manager, and one engine, per URL"""
+        first = get_database_manager(self.db_url)
+        self.addCleanup(first.engine.dispose)
+        self.assertIs(get_database_manager(self.db_url), first)
+        self.assertIs(get_database_manager(self.db_url).engine, first.engine)
+
+    def test_schema_verified_once(self):
+        """Later managers for the same database skip create_all"""
+        first = DatabaseManager(self.db_url)
+        self.addCleanup(first.engine.dispose)
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            second = DatabaseManager(self.db_url)
+            self.addCleanup(second.engine.dispose)
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+        self.assertEqual(statements, [])
+        self.assertEqual(second.search_enabled, first.search_enabled)
+
+    def test_memory_databases_are_always_created(self):
+        """Each in-memory database is new, so its schema is always created"""
+        for _ in range(2):
+            manager = DatabaseManager("sqlite:///:memory:")
+            self.assertEqual(manager.get_tenants_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
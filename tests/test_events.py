@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+from datetime import date
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import Tenant, Room
+from tenants_manager.utils.database import DatabaseManager
+
+
+class TestChangeEvents(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        with self.db_manager.session_scope() as session:
+            rooms = [Room(name="Quarto 1", capacity=2), Room(name="Quarto 2", capacity=2)]
+            session.add_all(rooms)
+            session.flush()
+            tenant = Tenant(
+                name="Ana",
+                room_id=rooms[0].id,
+                rent=400.0,
+                bi="BI000001",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 1),
+            )
+            session.add(tenant)
+            session.flush()
+            self.room_ids = [room.id for room in rooms]
+            self.tenant_id = tenant.id
+
+        self.published = []
+        self.db_manager.changes.subscribe(self.published.append)
+        self.addCleanup(self.db_manager.changes.unsubscribe, self.published.append)
+
+    def test_moving_rooms(self):
+        """A tenant moving rooms changes the tenant and both rooms"""
+        with self.db_manager.session_scope() as session:
+            session.get(Tenant, self.tenant_id).room_id = self.room_ids[1]
+
+        [changes] = self.published
+        self.assertEqual(changes.updated["tenants"], {self.tenant_id})
+        self.assertEqual(changes.ids("rooms"), set(self.room_ids))
+        self.assertIn("tenants", changes)
+        self.assertNotIn("rooms", changes)
+
+    def test_payment_changes_its_tenant(self):
+        """Children are reported through their foreign keys"""
+        self.assertTrue(self.db_manager.record_payment(self.tenant_id, 100.0))
+
+        [changes] = self.published
+        self.assertEqual(len(changes.inserted["payments"]), 1)
+        self.assertEqual(changes.ids("tenants"), {self.tenant_id})
+
+    def test_one_change_set_per_commit(self):
+        """Several flushes of a transaction are published together"""
+        with self.db_manager.session_scope() as session:
+            session.get(Room, self.room_ids[0]).capacity = 3
+            session.flush()
+            session.delete(session.get(Room, self.room_ids[1]))
+
+        [changes] = self.published
+        self.assertEqual(changes.updated["rooms"], {self.room_ids[0]})
+        self.assertEqual(changes.deleted["rooms"], {self.room_ids[1]})
+
+    def test_rollback_and_reads_publish_nothing(self):
+        """Rolled back changes and read-only sessions are not published"""
+        with self.assertRaises(RuntimeError):
+            with self.db_manager.session_scope() as session:
+                session.get(Room, self.room_ids[0]).name = "Quarto A"
+                session.flush()
+                raise RuntimeError("boom")
+        self.db_manager.get_tenants_page(with_balances=True)
+        self.db_manager.get_rooms_with_occupancy()
+        self.assertEqual(self.published, [])
+
+    def test_failing_subscriber(self):
+        """A subscriber raising does not break the commit or the others"""
+
+        def broken(changes):
+            raise RuntimeError("boom")
+
+        self.db_manager.changes.subscribe(broken)
+        self.addCleanup(self.db_manager.changes.unsubscribe, broken)
+        self.db_manager.changes.unsubscribe(self.published.append)
+        self.db_manager.changes.subscribe(self.published.append)
+
+        self.assertTrue(self.db_manager.delete_tenant(self.tenant_id))
+        self.assertEqual(len(self.published), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
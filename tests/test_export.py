@@ -0,0 +1,124 @@
+import unittest
+import os
+import csv
+import json
+import sys
+import tempfile
+from datetime import datetime, date
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import (
+    Tenant,
+    Room,
+    Payment,
+    RentHistory,
+    PaymentStatus,
+    PaymentType,
+)
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils import export
+from tenants_manager import __main__ as entry_point
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        with self.db_manager.session_scope() as session:
+            room = Room(name="Quarto 1", capacity=2)
+            session.add(room)
+            session.flush()
+            tenant = Tenant(
+                name="Ana",
+                room_id=room.id,
+                rent=400.0,
+                bi="BI000001",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 15),
+            )
+            session.add(tenant)
+            session.flush()
+            session.add(
+                RentHistory(tenant_id=tenant.id, amount=400.0, valid_from=datetime(2024, 1, 15))
+            )
+            for day in range(1, 8):
+                session.add(
+                    Payment(
+                        tenant_id=tenant.id,
+                        amount=10.0 * day,
+                        payment_date=datetime(2024, 2, day, 9, 30),
+                        payment_type=PaymentType.RENT,
+                        status=PaymentStatus.COMPLETED,
+                        reference_month=date(2024, 2, 1),
+                        description="Transferência" if day == 1 else None,
+                    )
+                )
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(self.remove_directory)
+
+    def remove_directory(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), encoding="utf-8") as stream:
+            return stream.read()
+
+    def test_csv(self):
+        """Every table is written with a header row, in primary key order"""
+        counts = self.db_manager.export_tables(self.directory, chunk_size=3)
+        self.assertEqual(counts, {"rooms": 1, "tenants": 1, "payments": 7, "rent_history": 1})
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            ["payments.csv", "rent_history.csv", "rooms.csv", "tenants.csv"],
+        )
+
+        rows = list(csv.DictReader(self.read("payments.csv").splitlines()))
+        self.assertEqual([row["amount"] for row in rows], [str(10.0 * day) for day in range(1, 8)])
+        self.assertEqual(rows[0]["payment_date"], "2024-02-01T09:30:00")
+        self.assertEqual(rows[0]["status"], "completed")
+        self.assertEqual(rows[0]["description"], "Transferência")
+        self.assertEqual(rows[1]["description"], "")
+
+    def test_jsonl_and_columnar(self):
+        """JSON Lines and row groups hold the same values"""
+        self.db_manager.export_tables(self.directory, ["payments"], format="jsonl")
+        records = [json.loads(line) for line in self.read("payments.jsonl").splitlines()]
+        self.assertEqual(len(records), 7)
+        self.assertIsNone(records[1]["description"])
+
+        self.db_manager.export_tables(
+            self.directory, ["payments"], format="columnar", chunk_size=3
+        )
+        header, *groups = [
+            json.loads(line) for line in self.read("payments.columns.jsonl").splitlines()
+        ]
+        self.assertEqual(header["columns"], list(records[0]))
+        self.assertEqual([group["rows"] for group in groups], [3, 3, 1])
+        amounts = [amount for group in groups for amount in group["columns"]["amount"]]
+        self.assertEqual(amounts, [record["amount"] for record in records])
+
+    def test_failed_export_leaves_no_file(self):
+        """A partial file is removed instead of replacing the export"""
+        with self.assertRaises(KeyError):
+            self.db_manager.export_tables(self.directory, ["rooms", "contracts"])
+        self.assertEqual(os.listdir(self.directory), ["rooms.csv"])
+
+    def test_cli_arguments(self):
+        """Unknown tables are rejected before anything is written"""
+        with self.assertRaises(SystemExit):
+            export.main(["contracts", "--output-dir", self.directory])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_entry_point(self):
+        """The console script sends export to the export command"""
+        with mock.patch.object(export, "main", return_value=0) as export_main:
+            self.assertEqual(entry_point.main(["export", "payments", "--format", "jsonl"]), 0)
+        export_main.assert_called_once_with(["payments", "--format", "jsonl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import date
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from tenants_manager.models.tenant import Tenant, Room
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.views import main_window
+from tenants_manager.views.main_window import MainWindow
+
+
+class TestLazyTabs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_manager = DatabaseManager(
+            f"sqlite:///{os.path.join(tmp.name, 'tenants.db')}"
+        )
+        self.addCleanup(self.db_manager.engine.dispose)
+        with self.db_manager.session_scope() as session:
+            room = Room(name="Quarto 1", capacity=2)
+            session.add(room)
+            session.flush()
+            session.add(
+                Tenant(
+                    name="Ana",
+                    room_id=room.id,
+                    rent=400.0,
+                    bi="BI000001",
+                    birth_date=date(1990, 1, 1),
+                    entry_date=date(2024, 1, 1),
+                )
+            )
+
+        patcher = mock.patch.object(
+            main_window, "get_database_manager", return_value=self.db_manager
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.window = MainWindow()
+        self.addCleanup(self.window.close)
+        self.loads = []
+        for key, loader in self.window.tab_loaders.items():
+            self.window.tab_loaders[key] = self.recording(key, loader)
+
+    def recording(self, key, loader):
+        def load():
+            self.loads.append(key)
+            loader()
+
+        return load
+
+    def show(self):
+        self.window.show()
+        self.app.processEvents()
+        self.window.queries.wait()
+
+    def select(self, key):
+        self.window.tabs.setCurrentIndex(self.window.tab_keys.index(key))
+        self.app.processEvents()
+        self.window.queries.wait()
+
+    def test_only_the_first_tab_is_built(self):
+        """Other tabs are built and loaded when first selected"""
+        self.assertEqual(self.window.built_tabs, {"tenants"})
+        self.assertFalse(hasattr(self.window, "payments_model"))
+
+        self.show()
+        self.assertEqual(self.loads, ["tenants"])
+        self.assertEqual(self.window.tenant_model.rowCount(), 1)
+
+        self.select("payments")
+        self.assertEqual(self.window.built_tabs, {"tenants", "payments"})
+        self.assertEqual(self.loads, ["tenants", "payments"])
+        self.assertEqual(self.window.payments_model.rowCount(), 1)
+
+        # Going back does not load the tenants again
+        self.select("tenants")
+        self.assertEqual(self.loads, ["tenants", "payments"])
+
+    def test_stale_tabs_reload_when_selected(self):
+        """A change reloads the tab on screen and marks the others"""
+        self.show()
+        self.select("rooms")
+        self.loads.clear()
+
+        self.window.notify_data_changed("rooms", "tenants", "payments")
+        self.assertEqual(self.loads, ["rooms"])
+        self.assertEqual(self.window.stale_tabs, {"tenants", "payments"})
+
+        self.select("tenants")
+        self.select("rooms")
+        self.assertEqual(self.loads, ["rooms", "tenants"])
+        self.assertEqual(self.window.stale_tabs, {"payments"})
+
+    def test_commits_patch_loaded_tabs(self):
+        """Committed changes update rows without reloading the tables"""
+        self.show()
+        self.select("payments")
+        self.select("rooms")
+        self.loads.clear()
+
+        with self.db_manager.session_scope() as session:
+            room = Room(name="Quarto 2", capacity=1)
+            session.add(room)
+            session.flush()
+            tenant = session.query(Tenant).filter_by(name="Ana").one()
+            tenant.rent = 450.0
+            tenant.room_id = room.id
+        self.app.processEvents()
+        self.window.queries.wait()
+
+        self.assertEqual(self.loads, [])
+        tenant_row = self.window.tenant_model.row(0)
+        self.assertEqual((tenant_row.rent, tenant_row.room), (450.0, "Quarto 2"))
+        self.assertEqual(self.window.payments_model.row(0).rent, 450.0)
+        self.assertEqual(
+            [(row.name, row.occupancy) for row in self.window.rooms_model.rows()],
+            [("Quarto 1", 0), ("Quarto 2", 1)],
+        )
+        self.assertEqual(self.window.pending_patches, {})
+
+    def test_nothing_loads_before_show(self):
+        """Changes before the window is shown are only recorded"""
+        self.window.notify_data_changed("tenants")
+        self.assertEqual(self.loads, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
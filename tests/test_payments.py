@@ -0,0 +1,221 @@
+import unittest
+import os
+import sys
+from datetime import datetime, date, timedelta
+from sqlalchemy import event
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import (
+    Tenant,
+    Room,
+    Payment,
+    PaymentStatus,
+    PaymentType,
+)
+from tenants_manager.utils.database import DatabaseManager
+
+
+class TestPaymentQueries(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+
+        self.room = Room(name="Quarto 7", capacity=4)
+        self.session.add(self.room)
+        self.session.flush()
+
+        self.tenants = []
+        for i, name in enumerate(["Carla", "Ana", "Bruno", "Diana"]):
+            tenant = Tenant(
+                name=name,
+                room_id=self.room.id,
+                rent=500.0,
+                bi=f"BI{i}",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 15),
+            )
+            self.session.add(tenant)
+            self.tenants.append(tenant)
+        self.session.flush()
+        carla, ana, bruno, diana = self.tenants
+        diana.soft_delete()
+
+        self.add_payment(carla, 500.0, date(2024, 3, 1))
+        self.add_payment(ana, 200.0, date(2024, 3, 1))
+        self.add_payment(ana, 100.0, date(2024, 3, 1), PaymentStatus.PENDING)
+        self.add_payment(bruno, 500.0, date(2024, 2, 1))
+        self.session.commit()
+
+    def add_payment(self, tenant, amount, month, status=PaymentStatus.COMPLETED):
+        self.session.add(
+            Payment(
+                tenant_id=tenant.id,
+                amount=amount,
+                payment_date=datetime.combine(month, datetime.min.time())
+                + timedelta(days=4, hours=10),
+                payment_type=PaymentType.RENT,
+                status=status,
+                reference_month=month,
+                description=f"Renda {month:%m/%Y}",
+            )
+        )
+
+    def test_monthly_payment_overview(self):
+        """Overview covers every active tenant with the month's totals"""
+        overview = self.db_manager.get_monthly_payment_overview(date(2024, 3, 20))
+        self.assertEqual([entry["name"] for entry in overview], ["Ana", "Bruno", "Carla"])
+
+        by_name = {entry["name"]: entry for entry in overview}
+        self.assertEqual(by_name["Carla"]["status"], "paid")
+        self.assertEqual(by_name["Ana"]["status"], "partial")
+        self.assertAlmostEqual(by_name["Ana"]["amount_paid"], 200.0)
+        self.assertEqual(by_name["Bruno"]["status"], "pending")
+        self.assertEqual(by_name["Bruno"]["room"], "Quarto 7")
+
+        for entry in overview:
+            tenant = self.session.get(Tenant, entry["tenant_id"])
+            self.assertAlmostEqual(
+                entry["balance"], tenant.get_balance(date(2024, 3, 20)), places=6
+            )
+
+
+    def count_queries(self, func, *args, **kwargs):
+        """Run func and return (result, number of SQL statements executed)"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = self.db_manager.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return result, len(statements)
+
+    def test_expected_rent_entries(self):
+        """Months without a rent payment produce expected entries"""
+        carla, ana, bruno, diana = self.tenants
+        entries = self.db_manager.get_expected_rent_entries(
+            bruno.id, date(2024, 1, 1), date(2024, 4, 30)
+        )
+        self.assertEqual(
+            [entry["reference_month"] for entry in entries],
+            [date(2024, 1, 1), date(2024, 3, 1), date(2024, 4, 1)],
+        )
+        self.assertTrue(all(entry["is_expected"] for entry in entries))
+        self.assertEqual(entries[0]["amount"], 500.0)
+
+    def test_expected_rent_entries_bulk(self):
+        """The multi-tenant variant uses a fixed number of queries"""
+        start, end = date(2019, 1, 1), date(2024, 12, 31)
+        expected, queries = self.count_queries(
+            self.db_manager.get_expected_rent_entries_bulk, None, start, end
+        )
+        self.assertLessEqual(queries, 3)
+        carla, ana, bruno, diana = self.tenants
+        # Only active tenants when no IDs are given
+        self.assertEqual(sorted(expected), sorted([carla.id, ana.id, bruno.id]))
+        self.assertEqual(len(expected[ana.id]), 11)  # 12 months minus March
+        single = self.db_manager.get_expected_rent_entries(carla.id, start, end)
+        self.assertEqual(
+            [(e["reference_month"], e["amount"]) for e in expected[carla.id]],
+            [(e["reference_month"], e["amount"]) for e in single],
+        )
+
+    def test_tenant_payments_pagination(self):
+        """Pages merge actual payments and expected entries newest first"""
+        carla, ana, bruno, diana = self.tenants
+        start, end = date(2024, 1, 1), date(2024, 6, 30)
+        (first, total), queries = self.count_queries(
+            self.db_manager.get_tenant_payments, bruno.id, start, end, per_page=4
+        )
+        self.assertEqual(total, 6)
+        self.assertLessEqual(queries, 4)
+        self.assertEqual(
+            [p.reference_month for p in first],
+            [date(2024, 6, 1), date(2024, 5, 1), date(2024, 4, 1), date(2024, 3, 1)],
+        )
+        self.assertTrue(all(p.is_expected for p in first))
+
+        second, total = self.db_manager.get_tenant_payments(
+            bruno.id, start, end, page=2, per_page=4
+        )
+        self.assertEqual(total, 6)
+        self.assertEqual(
+            [p.reference_month for p in second], [date(2024, 2, 1), date(2024, 1, 1)]
+        )
+        self.assertIsInstance(second[0], Payment)
+        self.assertEqual(
+            self.db_manager.count_tenant_payments(bruno.id, start, end), total
+        )
+
+        # Without expected entries only the stored payments are paginated
+        payments, total = self.db_manager.get_tenant_payments(
+            ana.id, start, end, per_page=1, include_expected=False
+        )
+        self.assertEqual(total, 2)
+        self.assertEqual(len(payments), 1)
+        self.assertEqual(
+            self.db_manager.count_tenant_payments(
+                ana.id, start, end, include_expected=False
+            ),
+            2,
+        )
+
+    def test_tenant_payments_search(self):
+        """Descriptions are matched by word prefix, type and status by name"""
+        carla, ana, bruno, diana = self.tenants
+        start, end = date(2024, 1, 1), date(2024, 12, 31)
+
+        def search(term):
+            payments, total = self.db_manager.get_tenant_payments(
+                ana.id, start, end, search_term=term, include_expected=False
+            )
+            return sorted(p.amount for p in payments), total
+
+        self.assertEqual(search("renda"), ([100.0, 200.0], 2))
+        self.assertEqual(search("ren 03/2024"), ([100.0, 200.0], 2))
+        self.assertEqual(search("04/2024"), ([], 0))
+        self.assertEqual(search("pend"), ([100.0], 1))
+        self.assertEqual(search("rent"), ([100.0, 200.0], 2))
+        self.assertEqual(
+            self.db_manager.count_tenant_payments(
+                ana.id, start, end, search_term="pend", include_expected=False
+            ),
+            1,
+        )
+
+    def test_narrowing_matches_database_search(self):
+        """Filtering fetched payments in memory gives the database result"""
+        carla, ana, bruno, diana = self.tenants
+        self.add_payment(ana, 50.0, date(2024, 4, 1))
+        self.session.commit()
+        start, end = date(2024, 1, 1), date(2024, 6, 30)
+
+        fetched, _ = self.db_manager.get_tenant_payments(
+            ana.id, start, end, per_page=1000, search_term="r", include_expected=False
+        )
+        expected = self.db_manager.get_expected_rent_entries(ana.id, start, end)
+        for term in ("r", "re", "ren", "renda", "renda 03", "renda 04/20", "rent", "rx"):
+            narrowed = self.db_manager.merge_expected_entries(
+                [p for p in fetched if self.db_manager.payment_matches_search(p, term)],
+                expected,
+            )
+            payments, total = self.db_manager.get_tenant_payments(
+                ana.id, start, end, per_page=1000, search_term=term
+            )
+            self.assertEqual(len(narrowed), total, term)
+            self.assertEqual(
+                [(p.id, p.reference_month) for p in narrowed],
+                [(p.id, p.reference_month) for p in payments],
+                term,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+import unittest
+import os
+import sys
+from datetime import datetime, date
+from unittest import mock
+
+from sqlalchemy import text
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import (
+    Tenant,
+    Room,
+    Payment,
+    PaymentStatus,
+    PaymentType,
+    RentHistory,
+    BalanceSnapshot,
+)
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils import ledger
+
+
+class TestClosedPeriods(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        with self.db_manager.session_scope() as session:
+            room = Room(name="Quarto 1", capacity=2)
+            session.add(room)
+            session.flush()
+            ana = Tenant(
+                name="Ana",
+                room_id=room.id,
+                rent=400.0,
+                bi="BI000001",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 15),
+            )
+            rui = Tenant(
+                name="Rui",
+                room_id=room.id,
+                rent=300.0,
+                bi="BI000002",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 3, 1),
+            )
+            session.add_all([ana, rui])
+            session.flush()
+            for month, amount in [(1, 400.0), (2, 250.0), (3, 400.0)]:
+                session.add(
+                    Payment(
+                        tenant_id=ana.id,
+                        amount=amount,
+                        payment_date=datetime(2024, month, 20),
+                        payment_type=PaymentType.RENT,
+                        status=PaymentStatus.COMPLETED,
+                        reference_month=date(2024, month, 1),
+                    )
+                )
+            self.ana, self.rui = ana.id, rui.id
+
+    def snapshots(self, month):
+        with self.db_manager.Session() as session:
+            return {
+                snapshot.tenant_id: snapshot
+                for snapshot in session.query(BalanceSnapshot).filter_by(month=month)
+            }
+
+    def reference(self, tenant_id, as_of_date):
+        with self.db_manager.Session() as session:
+            return session.get(Tenant, tenant_id).get_balance(as_of_date)
+
+    def test_backfill(self):
+        """Every month from the first entry gets a snapshot per tenant"""
+        months = self.db_manager.backfill_periods(date(2024, 3, 1))
+        self.assertEqual(months, [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)])
+        self.assertEqual(self.db_manager.get_closed_periods(), months)
+
+        february = self.snapshots(date(2024, 2, 1))
+        self.assertEqual(set(february), {self.ana, self.rui})
+        self.assertAlmostEqual(february[self.rui].closing_balance, 0.0)
+        self.assertAlmostEqual(february[self.ana].opening_balance, 0.0)
+        self.assertAlmostEqual(february[self.ana].charges, 400.0)
+        self.assertAlmostEqual(february[self.ana].payments, 250.0)
+        self.assertAlmostEqual(february[self.ana].closing_balance, 150.0)
+
+        march = self.snapshots(date(2024, 3, 1))
+        self.assertEqual(set(march), {self.ana, self.rui})
+        for tenant_id, snapshot in march.items():
+            self.assertAlmostEqual(
+                snapshot.closing_balance, self.reference(tenant_id, date(2024, 3, 31))
+            )
+        self.assertAlmostEqual(march[self.ana].opening_balance, 150.0)
+
+        # Closed months are skipped on the next run
+        self.assertEqual(
+            self.db_manager.backfill_periods(date(2024, 4, 1)), [date(2024, 4, 1)]
+        )
+        self.assertEqual(self.db_manager.verify_periods()["mismatches"], [])
+
+    def test_month_end_balances_read_from_snapshots(self):
+        """A closed month's last day needs no balance computation"""
+        self.db_manager.close_period(date(2024, 2, 1))
+
+        with mock.patch.object(
+            ledger, "compute_entries", side_effect=AssertionError("computed")
+        ):
+            balances = self.db_manager.get_balances(as_of_date=date(2024, 2, 29))
+        self.assertEqual(balances, {self.ana: 150.0, self.rui: 0.0})
+
+        # Tenants added later have no snapshot and are computed
+        with self.db_manager.session_scope() as session:
+            tenant = Tenant(
+                name="Eva",
+                room_id=session.query(Room.id).scalar(),
+                rent=350.0,
+                bi="BI000003",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 2, 1),
+            )
+            session.add(tenant)
+            session.flush()
+            eva = tenant.id
+        self.assertEqual(
+            self.db_manager.get_balances(as_of_date=date(2024, 2, 29)),
+            {self.ana: 150.0, self.rui: 0.0, eva: 350.0},
+        )
+
+        # Other days are still computed
+        self.assertEqual(
+            self.db_manager.get_tenant_balance(self.ana, date(2024, 2, 28)),
+            self.reference(self.ana, date(2024, 2, 28)),
+        )
+
+    def test_closed_periods_refuse_payments(self):
+        """Payments dated in a closed month need the month reopened"""
+        self.db_manager.backfill_periods(date(2024, 3, 1))
+        self.assertIsNone(
+            self.db_manager.record_payment(self.ana, 50.0, datetime(2024, 2, 25))
+        )
+        # Pending payments do not change balances
+        self.assertTrue(
+            self.db_manager.record_payment(
+                self.ana, 50.0, datetime(2024, 2, 25), status=PaymentStatus.PENDING
+            )
+        )
+
+        self.assertEqual(
+            self.db_manager.reopen_period(date(2024, 2, 1)),
+            [date(2024, 2, 1), date(2024, 3, 1)],
+        )
+        self.assertEqual(self.db_manager.get_closed_periods(), [date(2024, 1, 1)])
+        self.assertTrue(
+            self.db_manager.record_payment(self.ana, 50.0, datetime(2024, 2, 25))
+        )
+        self.assertEqual(
+            self.db_manager.get_tenant_balance(self.ana, date(2024, 2, 29)), 100.0
+        )
+
+    def test_open_months_cannot_be_closed(self):
+        """The current month is still open"""
+        with self.assertRaises(ValueError):
+            self.db_manager.close_period(date.today())
+        self.assertEqual(self.db_manager.get_closed_periods(), [])
+
+    def test_verify_finds_backdated_changes(self):
+        """Snapshots are checked against the history, and rewritten on close"""
+        self.db_manager.backfill_periods(date(2024, 2, 1))
+        # Outside the ORM, so the closed-period guard does not see it
+        with self.db_manager.session_scope() as session:
+            session.execute(
+                text("UPDATE tenants SET entry_date = '2024-02-01' WHERE id = :id"),
+                {"id": self.rui},
+            )
+
+        report = self.db_manager.verify_periods()
+        self.assertEqual(
+            report["mismatches"], [(date(2024, 2, 1), self.rui, 0.0, 300.0)]
+        )
+        self.db_manager.close_period(date(2024, 2, 1))
+        self.assertEqual(self.db_manager.verify_periods()["mismatches"], [])
+
+    def test_closing_invalidates_cached_balances(self):
+        """Cached month-end balances are dropped when snapshots change"""
+        february = date(2024, 2, 29)
+        self.db_manager.close_period(date(2024, 2, 1))
+        self.assertEqual(self.db_manager.get_tenant_balance(self.ana, february), 150.0)
+
+        # Changes the event bus does not see, picked up on reopen and close
+        with self.db_manager.session_scope() as session:
+            session.execute(text("UPDATE payments SET amount = 350.0 WHERE amount = 250.0"))
+        self.db_manager.reopen_period(date(2024, 2, 1))
+        self.assertEqual(self.db_manager.get_tenant_balance(self.ana, february), 50.0)
+
+        with self.db_manager.session_scope() as session:
+            session.execute(text("UPDATE payments SET amount = 250.0 WHERE amount = 350.0"))
+        self.db_manager.close_period(date(2024, 2, 1))
+        self.assertEqual(self.db_manager.get_tenant_balance(self.ana, february), 150.0)
+
+    def test_edits_to_closed_months_refused(self):
+        """Entry date and rent edits that would change a closed month are refused"""
+        with self.db_manager.session_scope() as session:
+            session.add(
+                RentHistory(
+                    tenant_id=self.rui, amount=300.0, valid_from=datetime(2024, 3, 1)
+                )
+            )
+        self.db_manager.backfill_periods(date(2024, 3, 1))
+
+        # Moving the entry date in either direction reaches into closed months
+        for entry_date in [date(2024, 1, 1), date(2024, 4, 1)]:
+            with self.assertRaises(ValueError):
+                with self.db_manager.session_scope() as session:
+                    session.get(Tenant, self.rui).entry_date = entry_date
+
+        # Without rent history every month is billed at the current rent
+        with self.db_manager.Session() as session:
+            tenant = session.get(Tenant, self.ana)
+            self.assertFalse(tenant.update_rent(500.0, session=session))
+        self.assertEqual(self.db_manager.verify_periods()["mismatches"], [])
+
+        # Months covered by the rent history keep their amounts, unless the
+        # history itself is edited
+        with self.assertRaises(ValueError):
+            with self.db_manager.session_scope() as session:
+                session.query(RentHistory).filter_by(tenant_id=self.rui).one().amount = 350.0
+        with self.db_manager.Session() as session:
+            self.assertTrue(session.get(Tenant, self.rui).update_rent(350.0, session=session))
+        self.assertEqual(self.db_manager.verify_periods()["mismatches"], [])
+
+        # Other fields, and any edit once the months are reopened, go through
+        with self.db_manager.session_scope() as session:
+            session.get(Tenant, self.ana).phone = "912345678"
+        self.db_manager.reopen_period(date(2024, 1, 1))
+        with self.db_manager.session_scope() as session:
+            session.get(Tenant, self.rui).entry_date = date(2024, 1, 1)
+
+    def test_hard_delete_removes_snapshots(self):
+        """Permanently deleted tenants leave no snapshots behind"""
+        self.db_manager.backfill_periods(date(2024, 3, 1))
+        self.assertTrue(self.db_manager.delete_tenant(self.rui, hard_delete=True))
+        self.assertEqual(set(self.snapshots(date(2024, 3, 1))), {self.ana})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import os
+import sys
+import threading
+from datetime import date
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication
+
+from tenants_manager.models.tenant import Tenant, Room
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.views.query_runner import (
+    QueryRunner,
+    TenantRow,
+    fetch_tenant_page,
+    fetch_rooms,
+)
+
+
+class TestQueryRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.runner = QueryRunner()
+        self.addCleanup(self.runner.wait)
+
+    def test_results_arrive_on_gui_thread(self):
+        """Loads run on a pool thread, callbacks on the calling thread"""
+        threads, results = [], []
+
+        def load():
+            threads.append(threading.get_ident())
+            return 42
+
+        self.runner.submit("key", load, on_result=results.append)
+        self.runner.wait()
+        self.assertEqual(results, [42])
+        self.assertNotEqual(threads, [threading.get_ident()])
+
+    def test_newer_request_supersedes_older(self):
+        """Only the latest load of a key reaches its callback"""
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "old"
+
+        self.runner.submit("tenants", slow, on_result=results.append)
+        started.wait(5)
+        self.runner.submit("tenants", lambda: "new", on_result=results.append)
+        release.set()
+        self.runner.wait()
+        self.assertEqual(results, ["new"])
+
+    def test_cancel_and_errors(self):
+        """Cancelled loads are dropped, failures go to the error callback"""
+        results, errors = [], []
+        release = threading.Event()
+        self.runner.submit("a", lambda: release.wait(5) and "a", on_result=results.append)
+        self.runner.cancel("a")
+        release.set()
+
+        def fail():
+            raise ValueError("boom")
+
+        self.runner.submit("b", fail, on_result=results.append, on_error=errors.append)
+        self.runner.wait()
+        self.runner.pool.waitForDone()
+        QCoreApplication.processEvents()
+        self.assertEqual(results, [])
+        self.assertEqual(errors, ["boom"])
+
+
+class TestLoaders(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        session = self.db_manager.get_session()
+        self.addCleanup(session.close)
+        room = Room(name="Quarto 3", capacity=2)
+        session.add(room)
+        session.flush()
+        for i, name in enumerate(["Ana", "Bruno", "Carla"]):
+            tenant = Tenant(
+                name=name,
+                room_id=room.id,
+                rent=300.0,
+                bi=f"BI{i}",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 1),
+            )
+            if name == "Carla":
+                tenant.soft_delete()
+            session.add(tenant)
+        session.commit()
+
+    def test_loaders_return_plain_rows(self):
+        """Loaders hand back tuples, not session-bound ORM objects"""
+        page = fetch_tenant_page(self.db_manager, None, 10, "", False)
+        self.assertEqual(page.total, 2)
+        self.assertIsInstance(page.rows[0], TenantRow)
+        self.assertEqual([row.name for row in page.rows], ["Ana", "Bruno"])
+        self.assertEqual(page.rows[0].room, "Quarto 3")
+        self.assertGreater(page.rows[0].balance, 0)
+
+        rooms = fetch_rooms(self.db_manager, "quarto")
+        self.assertEqual(
+            [(r.name, r.capacity, r.occupancy) for r in rooms], [("Quarto 3", 2, 2)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+from datetime import date
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from tenants_manager.models.tenant import Tenant, Room
+from tenants_manager.utils.database import DatabaseManager, RoomOccupancy
+
+
+class TestRoomOccupancy(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+
+        # (name, capacity, active tenants, removed tenants)
+        layout = [
+            ("Quarto 3", 2, 2, 1),
+            ("Quarto 1", 4, 1, 0),
+            ("Sala", 1, 0, 2),
+            ("Quarto 2", 3, 0, 0),
+        ]
+        self.rooms = {}
+        count = 0
+        for name, capacity, active, removed in layout:
+            room = Room(name=name, capacity=capacity)
+            self.session.add(room)
+            self.session.flush()
+            for i in range(active + removed):
+                tenant = Tenant(
+                    name=f"Tenant {count}",
+                    room_id=room.id,
+                    rent=400.0,
+                    bi=f"BI{count:06d}",
+                    birth_date=date(1990, 1, 1),
+                    entry_date=date(2024, 1, 1),
+                )
+                if i >= active:
+                    tenant.soft_delete()
+                self.session.add(tenant)
+                count += 1
+            self.rooms[name] = room
+        self.session.commit()
+
+    def count_queries(self, func, *args, **kwargs):
+        """Run func and return (result, number of SQL statements executed)"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = self.db_manager.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return result, len(statements)
+
+    def test_rooms_with_occupancy(self):
+        """Every room comes back once, with its active tenants counted in SQL"""
+        rooms, queries = self.count_queries(self.db_manager.get_rooms_with_occupancy)
+        self.assertEqual(queries, 1)
+        self.assertEqual(
+            [(room.name, room.occupancy) for room in rooms],
+            [("Quarto 1", 1), ("Quarto 2", 0), ("Quarto 3", 2), ("Sala", 0)],
+        )
+        for room in rooms:
+            self.assertEqual(
+                room.occupancy, self.rooms[room.name].current_occupancy
+            )
+
+    def test_rooms_search(self):
+        """The search term filters on the room name"""
+        rooms = self.db_manager.get_rooms_with_occupancy("quarto 3")
+        self.assertEqual(
+            rooms, [RoomOccupancy(self.rooms["Quarto 3"].id, "Quarto 3", 2, 2)]
+        )
+
+    def test_hybrid_properties_in_sql(self):
+        """current_occupancy and is_full can be queried without loading tenants"""
+        full = (
+            self.session.query(Room.name)
+            .filter(Room.is_full)
+            .order_by(Room.name)
+            .all()
+        )
+        self.assertEqual([name for name, in full], ["Quarto 3"])
+
+        room = self.db_manager.get_room_occupancy(self.rooms["Quarto 1"].id)
+        self.assertEqual(room.occupancy, 1)
+        self.assertEqual(room.capacity, 4)
+        self.assertIsNone(self.db_manager.get_room_occupancy(9999))
+
+    def test_instance_properties(self):
+        """On loaded rooms the properties still count the active tenants"""
+        self.assertTrue(self.rooms["Quarto 3"].is_full)
+        self.assertFalse(self.rooms["Sala"].is_full)
+        self.assertEqual(self.rooms["Sala"].current_occupancy, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
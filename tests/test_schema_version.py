@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from tenants_manager.models.tenant import Base
+from tenants_manager.utils import database, schema
+from tenants_manager.utils.database import DatabaseManager
+
+
+class TestSchemaVersion(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.db_url = f"sqlite:///{self.tmp / 'tenants.db'}"
+
+    def forget_schema(self):
+        """Make the next manager check the database as in a new process"""
+        database._verified_schemas.pop(self.db_url, None)
+
+    def test_head_revisions(self):
+        """Heads are the revisions no migration builds on"""
+        versions = self.tmp / "versions"
+        versions.mkdir()
+        scripts = {
+            "base.py": "revision: str = 'a1'\ndown_revision: Union[str, None] = None\n",
+            "second.py": "revision = 'b2'\ndown_revision = 'a1'\n",
+            "branch.py": "revision = 'c3'\ndown_revision = 'a1'\n",
+            "merge.py": "revision = 'd4'\ndown_revision = ('b2', 'c3')\n",
+            "other.py": "revision = 'e5'\ndown_revision = 'b2'\n",
+        }
+        for name, source in scripts.items():
+            (versions / name).write_text(source)
+        self.assertEqual(schema.get_head_revisions(versions), {"d4", "e5"})
+
+        # The repository's own migrations have a head
+        self.assertTrue(schema.get_head_revisions())
+
+    def test_new_database_is_stamped(self):
+        """A database created from the models is stamped at the heads"""
+        manager = DatabaseManager(self.db_url)
+        self.addCleanup(manager.engine.dispose)
+        with manager.engine.connect() as connection:
+            self.assertEqual(
+                schema.get_stamped_revisions(connection), schema.get_head_revisions()
+            )
+        self.assertTrue(schema.is_schema_current(manager.engine))
+
+    def test_stamped_database_skips_create_all(self):
+        """A stamped database is checked without creating anything"""
+        first = DatabaseManager(self.db_url)
+        self.addCleanup(first.engine.dispose)
+        self.forget_schema()
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            with mock.patch.object(Base.metadata, "create_all") as create_all:
+                second = DatabaseManager(self.db_url)
+                self.addCleanup(second.engine.dispose)
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+        create_all.assert_not_called()
+        self.assertFalse(any("CREATE" in statement for statement in statements))
+        self.assertEqual(second.search_enabled, first.search_enabled)
+
+    def test_outdated_database_is_not_stamped(self):
+        """A database missing model columns is left for the migrations"""
+        engine = create_engine(self.db_url)
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE tenants DROP COLUMN deleted_at"))
+
+        manager = DatabaseManager(self.db_url)
+        self.addCleanup(manager.engine.dispose)
+        self.assertFalse(schema.is_schema_current(manager.engine))
+        with manager.engine.connect() as connection:
+            self.assertEqual(schema.get_stamped_revisions(connection), frozenset())
+
+
+if __name__ == "__main__":
+    unittest.main()
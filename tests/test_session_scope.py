@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+from datetime import date
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+
+from tenants_manager.models.tenant import Tenant, Room, EmergencyContact
+from tenants_manager.utils.database import DatabaseManager, RoomInfo
+
+
+class TestSessionScope(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        with self.db_manager.session_scope() as session:
+            room = Room(name="Quarto 1", capacity=2)
+            session.add(room)
+            session.flush()
+            tenant = Tenant(
+                name="Ana",
+                room_id=room.id,
+                rent=400.0,
+                bi="BI000001",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 1),
+            )
+            tenant.emergency_contact = EmergencyContact(name="Rui", phone="911")
+            session.add(tenant)
+            session.flush()
+            self.room_id, self.tenant_id = room.id, tenant.id
+
+    def test_commits_on_success(self):
+        """Changes made in the scope are committed when it ends"""
+        with self.db_manager.session_scope() as session:
+            session.get(Room, self.room_id).name = "Quarto A"
+        self.assertEqual(self.db_manager.get_room(self.room_id).name, "Quarto A")
+
+    def test_rolls_back_on_error(self):
+        """An exception undoes the changes and propagates"""
+        with self.assertRaises(RuntimeError):
+            with self.db_manager.session_scope() as session:
+                session.get(Room, self.room_id).name = "Quarto A"
+                session.flush()
+                raise RuntimeError("boom")
+        self.assertEqual(self.db_manager.get_room(self.room_id).name, "Quarto 1")
+
+    def test_objects_do_not_outlive_the_scope(self):
+        """Loaded objects are detached once the scope ends"""
+        with self.db_manager.session_scope() as session:
+            room = session.get(Room, self.room_id)
+        self.assertTrue(inspect(room).detached)
+
+    def test_get_room(self):
+        """Rooms come back as plain RoomInfo values"""
+        self.assertEqual(
+            self.db_manager.get_room(self.room_id),
+            RoomInfo(self.room_id, "Quarto 1", 2, 1),
+        )
+        self.assertIsNone(self.db_manager.get_room(9999))
+
+    def test_get_tenant(self):
+        """The detached tenant keeps its room and emergency contact"""
+        tenant = self.db_manager.get_tenant(self.tenant_id)
+        self.assertTrue(inspect(tenant).detached)
+        self.assertEqual(tenant.room_ref.name, "Quarto 1")
+        self.assertEqual(tenant.emergency_contact.name, "Rui")
+        self.assertIsNone(self.db_manager.get_tenant(9999))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from tenants_manager.config.database import SQLITE_PRAGMAS, get_sqlite_pragmas
+from tenants_manager.utils.database import DatabaseManager
+
+
+class TestSqlitePragmas(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_url = f"sqlite:///{os.path.join(tmp.name, 'tenants.db')}"
+
+    def read_pragmas(self, db_manager, *names):
+        self.addCleanup(db_manager.engine.dispose)
+        with db_manager.engine.connect() as connection:
+            return {
+                name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                for name in names
+            }
+
+    def test_profile_applied_on_connect(self):
+        """Every connection gets the environment's pragmas"""
+        db_manager = DatabaseManager(self.db_url, pragmas=get_sqlite_pragmas("prod"))
+        values = self.read_pragmas(
+            db_manager,
+            "journal_mode",
+            "synchronous",
+            "cache_size",
+            "mmap_size",
+            "temp_store",
+            "foreign_keys",
+        )
+        self.assertEqual(
+            values,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "cache_size": SQLITE_PRAGMAS["prod"]["cache_size"],
+                "mmap_size": SQLITE_PRAGMAS["prod"]["mmap_size"],
+                "temp_store": 2,  # MEMORY
+                "foreign_keys": 1,
+            },
+        )
+
+    def test_empty_profile_keeps_defaults(self):
+        """pragmas={} leaves SQLite's own settings"""
+        db_manager = DatabaseManager(self.db_url, pragmas={})
+        values = self.read_pragmas(db_manager, "journal_mode", "foreign_keys")
+        self.assertEqual(values, {"journal_mode": "delete", "foreign_keys": 0})
+
+    def test_environment_overrides(self):
+        """SQLITE_<NAME> variables override single values"""
+        with mock.patch.dict(os.environ, {"SQLITE_CACHE_SIZE": "-1024"}):
+            pragmas = get_sqlite_pragmas("dev")
+        self.assertEqual(pragmas["cache_size"], "-1024")
+        self.assertEqual(pragmas["journal_mode"], "WAL")
+        self.assertEqual(get_sqlite_pragmas("unknown"), SQLITE_PRAGMAS["dev"])
+
+    def test_invalid_pragmas_skipped(self):
+        """Unknown names and values that are not a single word are not run"""
+        with mock.patch.dict(
+            os.environ, {"SQLITE_CACHE_SIZE": "-1024; DROP TABLE tenants"}
+        ):
+            pragmas = dict(get_sqlite_pragmas("dev"), user_version=7)
+        with self.assertLogs("tenants_manager.config.database", "WARNING") as logs:
+            db_manager = DatabaseManager(self.db_url, pragmas=pragmas)
+        self.assertEqual(len(logs.output), 2)
+        values = self.read_pragmas(db_manager, "cache_size", "user_version", "foreign_keys")
+        self.assertEqual(values, {"cache_size": -2000, "user_version": 0, "foreign_keys": 1})
+        with db_manager.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM tenants")).scalar(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
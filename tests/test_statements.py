@@ -0,0 +1,167 @@
+import unittest
+import os
+import io
+import csv
+import json
+import sys
+from datetime import datetime, date, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import (
+    Tenant,
+    Room,
+    Payment,
+    RentHistory,
+    PaymentStatus,
+    PaymentType,
+)
+from tenants_manager.utils.database import DatabaseManager
+from tenants_manager.utils import statements
+
+
+class TestRentStatements(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+
+        room = Room(name="Quarto 1", capacity=4)
+        self.session.add(room)
+        self.session.flush()
+        self.room_id = room.id
+
+        self.ana = self.add_tenant("Ana", 400.0, date(2024, 1, 15))
+        # Rent went up in March
+        self.session.add_all(
+            [
+                RentHistory(
+                    tenant_id=self.ana,
+                    amount=400.0,
+                    valid_from=datetime(2024, 1, 15),
+                    valid_to=datetime(2024, 2, 29, 23, 59),
+                ),
+                RentHistory(tenant_id=self.ana, amount=450.0, valid_from=datetime(2024, 3, 1)),
+            ]
+        )
+        self.add_payment(self.ana, 400.0, datetime(2024, 1, 20))
+        self.add_payment(self.ana, 400.0, datetime(2024, 2, 1, 18, 30))
+        self.add_payment(self.ana, 450.0, datetime(2024, 3, 31, 22, 0))
+        self.add_payment(self.ana, 99.0, datetime(2024, 3, 10), PaymentStatus.PENDING)
+        self.rui = self.add_tenant("Rui", 300.0, date(2024, 3, 1))
+        self.session.commit()
+
+    def add_tenant(self, name, rent, entry_date):
+        tenant = Tenant(
+            name=name,
+            room_id=self.room_id,
+            rent=rent,
+            bi=f"BI{name}",
+            birth_date=date(1990, 1, 1),
+            entry_date=entry_date,
+        )
+        self.session.add(tenant)
+        self.session.flush()
+        return tenant.id
+
+    def add_payment(self, tenant_id, amount, payment_date, status=PaymentStatus.COMPLETED):
+        self.session.add(
+            Payment(
+                tenant_id=tenant_id,
+                amount=amount,
+                payment_date=payment_date,
+                payment_type=PaymentType.RENT,
+                status=status,
+                reference_month=payment_date.date().replace(day=1),
+            )
+        )
+
+    def test_lines_in_date_order(self):
+        """Charges and payments merge by date with a running balance"""
+        lines = list(
+            statements.iter_statement(
+                self.session, self.ana, date(2024, 2, 1), date(2024, 3, 31)
+            )
+        )
+        self.assertEqual(
+            [(line.date, line.kind, line.amount, line.balance) for line in lines],
+            [
+                (date(2024, 2, 1), "opening", None, 0.0),
+                # Rent is charged before a payment on the same day
+                (date(2024, 2, 1), "rent", 400.0, 400.0),
+                (datetime(2024, 2, 1, 18, 30), "payment", -400.0, 0.0),
+                (date(2024, 3, 1), "rent", 450.0, 450.0),
+                # The whole last day is included
+                (datetime(2024, 3, 31, 22, 0), "payment", -450.0, 0.0),
+                (date(2024, 3, 31), "closing", None, 0.0),
+            ],
+        )
+        self.assertEqual(lines[2].reference, "2024-02")
+
+    def test_balances_match_tenant(self):
+        """Opening and closing balances agree with Tenant.get_balance"""
+        for start_date, end_date in [
+            (date(2024, 1, 1), date(2024, 1, 31)),
+            (date(2024, 1, 16), date(2024, 3, 15)),
+            (date(2024, 3, 1), date(2024, 6, 30)),
+        ]:
+            lines = statements.iter_statements(self.session, start_date, end_date)
+            for line in lines:
+                if line.kind not in ("opening", "closing"):
+                    continue
+                tenant = self.session.get(Tenant, line.tenant_id)
+                as_of_date = (
+                    start_date - timedelta(days=1) if line.kind == "opening" else end_date
+                )
+                self.assertAlmostEqual(line.balance, tenant.get_balance(as_of_date))
+
+    def test_chunks_cover_every_tenant(self):
+        """Small chunks yield the same lines as one big chunk"""
+        for index in range(5):
+            self.add_tenant(f"T{index}", 100.0 + index, date(2024, 1 + index, 1))
+        self.session.commit()
+
+        expected = list(statements.iter_statements(self.session, date(2024, 1, 1)))
+        chunked = list(
+            statements.iter_statements(self.session, date(2024, 1, 1), chunk_size=2)
+        )
+        self.assertEqual(chunked, expected)
+        self.assertEqual(sum(1 for line in expected if line.kind == "opening"), 7)
+
+    def test_export_writers(self):
+        """CSV and JSON Lines exports carry the same lines"""
+        stream = io.StringIO()
+        count = self.db_manager.export_statements(
+            stream, date(2024, 3, 1), date(2024, 3, 31), tenant_ids=[self.rui]
+        )
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(count, len(rows))
+        self.assertEqual([row["kind"] for row in rows], ["opening", "rent", "closing"])
+        self.assertEqual(rows[1]["date"], "2024-03-01")
+        self.assertEqual(rows[0]["amount"], "")
+
+        stream = io.StringIO()
+        self.db_manager.export_statements(
+            stream, date(2024, 3, 1), date(2024, 3, 31), format="jsonl"
+        )
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records[-1]["tenant_id"], self.rui)
+        self.assertEqual(records[-1]["balance"], 300.0)
+        self.assertIsNone(records[-1]["amount"])
+
+    def test_generate_rent_statement(self):
+        """The dict statement is built from the same lines"""
+        statement = self.db_manager.generate_rent_statement(
+            self.ana, date(2024, 2, 1), date(2024, 3, 31)
+        )
+        self.assertEqual(statement["opening_balance"], 0.0)
+        self.assertEqual(statement["total_rent_due"], 850.0)
+        self.assertEqual(statement["total_payments"], 850.0)
+        self.assertEqual(statement["closing_balance"], 0.0)
+        self.assertEqual(len(statement["payments"]), 2)
+        self.assertIsNone(self.db_manager.generate_rent_statement(999, date(2024, 1, 1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import unittest
+import os
+import sys
+from datetime import date, datetime
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, Qt
+
+from tenants_manager.models.tenant import PaymentStatus, PaymentType
+from tenants_manager.utils.aging import AgingRow, summarize_rooms
+from tenants_manager.views.query_runner import (
+    TenantRow,
+    PaymentOverviewRow,
+    payment_history_row,
+)
+from tenants_manager.views.table_models import (
+    TenantTableModel,
+    PaymentOverviewModel,
+    PaymentHistoryModel,
+    AgingTableModel,
+    RoomAgingModel,
+    RED,
+)
+
+
+def tenant_rows(count, start=0):
+    return [
+        TenantRow(
+            i,
+            f"Tenant {i:05d}",
+            "Quarto 1",
+            500.0,
+            f"BI{i:06d}",
+            None,
+            None,
+            None,
+            date(1990, 1, 1),
+            i % 2 == 0,
+            100.0 if i % 3 == 0 else 0.0,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+class TestRowTableModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.model = TenantTableModel()
+
+    def test_rows_are_exposed_in_batches(self):
+        """Held rows reach the view FETCH_BATCH at a time"""
+        self.model.set_rows(tenant_rows(450))
+        batch = self.model.FETCH_BATCH
+        self.assertEqual(self.model.rowCount(), batch)
+        self.assertTrue(self.model.canFetchMore())
+
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 450)
+        self.assertEqual(self.model.row(449).id, 449)
+        self.assertIsNone(self.model.row(450))
+
+    def test_loader_appends_chunks(self):
+        """The loader is asked for more rows once the held ones run out"""
+        requests = []
+        self.model.set_rows(tenant_rows(10), loader=requests.append)
+        self.assertTrue(self.model.canFetchMore())
+        self.model.fetchMore()
+        self.assertEqual(len(requests), 1)
+
+        # Only one chunk is requested at a time
+        self.assertFalse(self.model.canFetchMore())
+        self.model.fetchMore()
+        self.assertEqual(len(requests), 1)
+
+        requests.pop()(tenant_rows(10, start=10), True)
+        self.assertEqual(self.model.rowCount(), 20)
+        self.assertTrue(self.model.canFetchMore())
+
+        self.model.fetchMore()
+        requests.pop()(tenant_rows(5, start=20), False)
+        self.assertEqual(self.model.rowCount(), 25)
+        self.assertFalse(self.model.canFetchMore())
+
+    def test_stale_chunk_is_dropped(self):
+        """Rows fetched before a reset do not end up in the new list"""
+        requests = []
+        self.model.set_rows(tenant_rows(10), loader=requests.append)
+        self.model.fetchMore()
+        self.model.set_rows(tenant_rows(3, start=100))
+        requests.pop()(tenant_rows(10, start=10), True)
+        self.assertEqual([row.id for row in self.model.rows()], [100, 101, 102])
+
+    def test_roles(self):
+        """Text, colours, fonts and the row ID come from data()"""
+        self.model.set_rows(tenant_rows(4))
+        index = self.model.index(1, 0)
+        self.assertEqual(self.model.data(index), "Tenant 00001")
+        self.assertEqual(self.model.data(index, Qt.ItemDataRole.UserRole), 1)
+        # Tenant 1 is deleted: red and struck out
+        self.assertIs(self.model.data(index, Qt.ItemDataRole.ForegroundRole), RED)
+        self.assertTrue(
+            self.model.data(index, Qt.ItemDataRole.FontRole).strikeOut()
+        )
+        self.assertIsNone(
+            self.model.data(self.model.index(2, 0), Qt.ItemDataRole.FontRole)
+        )
+        # Tenant 0 owes money: rent in red
+        self.assertEqual(self.model.data(self.model.index(0, 2)), "500.00 €")
+        self.assertIs(
+            self.model.data(self.model.index(0, 2), Qt.ItemDataRole.ForegroundRole),
+            RED,
+        )
+        self.assertEqual(self.model.data(self.model.index(0, 7)), "01/01/1990")
+        self.assertEqual(
+            self.model.headerData(0, Qt.Orientation.Horizontal), "Nome"
+        )
+
+    def test_patch_rows(self):
+        """Changed rows are replaced, moved, removed and inserted in place"""
+        order_key = lambda row: (row.name, row.id)
+        rows = tenant_rows(5)
+        self.model.set_rows(rows)
+        resets = []
+        self.model.modelReset.connect(lambda: resets.append(True))
+
+        renamed = rows[1]._replace(name="Tenant 00004z")
+        updated = rows[2]._replace(rent=650.0)
+        added = rows[0]._replace(id=9, name="Tenant 00000a")
+        self.model.patch_rows(
+            [renamed.id, updated.id, 3, added.id], [renamed, updated, added], order_key
+        )
+
+        self.assertEqual(resets, [])
+        self.assertEqual(
+            [row.id for row in self.model.rows()], [0, 9, 2, 4, 1]
+        )
+        self.assertEqual(self.model.data(self.model.index(2, 2)), "650.00 €")
+
+    def test_patch_leaves_unloaded_rows_to_the_loader(self):
+        """New rows past the loaded ones wait for their chunk"""
+        order_key = lambda row: (row.name, row.id)
+        self.model.set_rows(tenant_rows(3), loader=lambda deliver: None)
+        later = tenant_rows(1, start=50)
+        earlier = tenant_rows(1, start=1)[0]._replace(id=60, name="Tenant 00001a")
+        self.model.patch_rows([50, 60], later + [earlier], order_key)
+        self.assertEqual([row.id for row in self.model.rows()], [0, 1, 60, 2])
+
+        # Without an order the position of new rows is unknown
+        self.model.patch_rows([70], tenant_rows(1, start=70))
+        self.assertEqual(len(self.model.rows()), 4)
+
+    def test_sort_survives_reset(self):
+        """Sorting uses raw values and is kept for new rows"""
+        model = PaymentOverviewModel()
+        rows = [
+            PaymentOverviewRow(i, f"T{i}", "Q", 500.0, 0.0, "pending", balance)
+            for i, balance in enumerate([5.0, 100.0, -20.0])
+        ]
+        model.sort(5, Qt.SortOrder.DescendingOrder)
+        model.set_rows(rows)
+        self.assertEqual([model.row(i).balance for i in range(3)], [100.0, 5.0, -20.0])
+        model.sort(-1)
+        model.set_rows(rows)
+        self.assertEqual([model.row(i).tenant_id for i in range(3)], [0, 1, 2])
+
+    def test_aging_models(self):
+        """Bucket columns show amounts and sort by value"""
+        rows = [
+            AgingRow(1, "Ana", 1, "Quarto 1", 1050.0, 450.0, 450.0, 150.0, 0.0),
+            AgingRow(2, "Eva", 2, "Quarto 2", 2450.0, 350.0, 350.0, 350.0, 1400.0),
+            AgingRow(3, "Rui", 1, "Quarto 1", -300.0, 0.0, 0.0, 0.0, 0.0),
+        ]
+        model = AgingTableModel()
+        model.set_rows(rows)
+        self.assertEqual(model.data(model.index(0, 2)), "450.00 €")
+        self.assertEqual(model.data(model.index(1, 6)), "2450.00 €")
+        self.assertIs(model.data(model.index(1, 5), Qt.ItemDataRole.ForegroundRole), RED)
+        self.assertIsNone(model.data(model.index(0, 5), Qt.ItemDataRole.ForegroundRole))
+        model.sort(6, Qt.SortOrder.DescendingOrder)
+        self.assertEqual([model.row(i).name for i in range(3)], ["Eva", "Ana", "Rui"])
+
+        rooms = RoomAgingModel()
+        rooms.set_rows(summarize_rooms(rows))
+        self.assertEqual(rooms.data(rooms.index(0, 0)), "Quarto 1")
+        self.assertEqual(rooms.data(rooms.index(0, 1)), "1/2")
+        self.assertEqual(rooms.data(rooms.index(0, 6)), "1050.00 €")
+
+    def test_payment_history_rows(self):
+        """Payments and expected entries become compact rows"""
+        model = PaymentHistoryModel()
+        expected = type(
+            "Payment",
+            (),
+            {
+                "id": None,
+                "payment_date": None,
+                "amount": 450.0,
+                "payment_type": PaymentType.RENT,
+                "reference_month": date(2024, 3, 1),
+                "description": "Renda esperada",
+                "status": "EXPECTED",
+                "is_expected": True,
+            },
+        )
+        payment = type(
+            "Payment",
+            (),
+            {
+                "id": 7,
+                "payment_date": datetime(2024, 2, 3),
+                "amount": 450.0,
+                "payment_type": PaymentType.RENT,
+                "reference_month": date(2024, 2, 1),
+                "description": None,
+                "status": PaymentStatus.PENDING,
+            },
+        )
+        model.set_rows([payment_history_row(expected), payment_history_row(payment)])
+        self.assertEqual(model.data(model.index(0, 0)), "")
+        self.assertEqual(model.data(model.index(0, 2)), "03/2024")
+        self.assertTrue(model.data(model.index(0, 1), Qt.ItemDataRole.FontRole).italic())
+        self.assertEqual(model.data(model.index(1, 0)), "03/02/2024")
+        self.assertEqual(model.data(model.index(1, 5)), "")
+        self.assertEqual(model.data(model.index(1, 0), Qt.ItemDataRole.UserRole), 7)
+        self.assertIsNone(model.data(model.index(1, 0), Qt.ItemDataRole.FontRole))
+
+
+if __name__ == "__main__":
+    unittest.main()
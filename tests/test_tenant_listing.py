@@ -0,0 +1,134 @@
+import unittest
+import os
+import sys
+from datetime import date
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tenants_manager.models.tenant import Tenant, Room
+from tenants_manager.utils.database import DatabaseManager
+
+
+class TestTenantListing(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = DatabaseManager("sqlite:///:memory:")
+        self.session = self.db_manager.get_session()
+        self.addCleanup(self.session.close)
+
+        room = Room(name="Quarto 1", capacity=50)
+        self.session.add(room)
+        self.session.flush()
+
+        # Repeated names make the id tie-breaker matter
+        names = ["Ana", "Bruno", "Carla", "Diana", "Eva"] * 5
+        for i, name in enumerate(names):
+            tenant = Tenant(
+                name=name,
+                room_id=room.id,
+                rent=400.0,
+                bi=f"BI{i:03d}",
+                birth_date=date(1990, 1, 1),
+                entry_date=date(2024, 1, 1),
+            )
+            if i % 6 == 0:
+                tenant.soft_delete()
+            self.session.add(tenant)
+        self.session.commit()
+
+        self.ordered = [
+            tenant.id
+            for tenant in self.session.query(Tenant)
+            .filter(Tenant.is_active == True)
+            .order_by(Tenant.name, Tenant.id)
+        ]
+
+    def test_keyset_pages_cover_all_tenants(self):
+        """Following next cursors visits every tenant once, in order"""
+        seen, cursor, pages = [], None, []
+        while True:
+            tenants, next_cursor, prev_cursor = self.db_manager.get_tenants_page(
+                cursor, limit=4
+            )
+            if cursor is None:
+                self.assertIsNone(prev_cursor)
+            pages.append((tenants, prev_cursor))
+            seen.extend(tenant.id for tenant in tenants)
+            if next_cursor is None:
+                break
+            cursor = next_cursor
+        self.assertEqual(seen, self.ordered)
+
+        # Walking back from the last page gives the same pages
+        tenants, prev_cursor = pages[-1]
+        for expected, _ in reversed(pages[:-1]):
+            tenants, next_cursor, prev_cursor = self.db_manager.get_tenants_page(
+                prev_cursor, limit=4
+            )
+            self.assertIsNotNone(next_cursor)
+            self.assertEqual(
+                [tenant.id for tenant in tenants], [tenant.id for tenant in expected]
+            )
+        self.assertIsNone(prev_cursor)
+
+    def test_keyset_matches_offset_pagination(self):
+        """Keyset pages agree with OFFSET pages for the same filters"""
+        for search_term in (None, "bi0"):
+            cursor, page = None, 0
+            while True:
+                tenants, cursor, _ = self.db_manager.get_tenants_page(
+                    cursor, limit=5, search_term=search_term, include_deleted=True
+                )
+                offset_page = self.db_manager.get_tenants_paginated(
+                    offset=page * 5,
+                    limit=5,
+                    search_term=search_term,
+                    include_deleted=True,
+                )
+                self.assertEqual(
+                    [tenant.id for tenant in tenants],
+                    [tenant.id for tenant in offset_page],
+                )
+                page += 1
+                if cursor is None:
+                    break
+            self.assertEqual(page, 5)
+
+    def test_search_covers_contact_fields(self):
+        """Search matches word prefixes in any indexed tenant column"""
+        tenant = self.session.get(Tenant, self.ordered[0])
+        tenant.email = "ana.pereira@example.com"
+        tenant.address = "Rua das Flores 12"
+        self.session.commit()
+
+        for term in ("pereira", "flo", "rua 12", "quarto"):
+            tenants = self.db_manager.get_tenants_paginated(search_term=term)
+            self.assertIn(tenant.id, [t.id for t in tenants], term)
+        self.assertEqual(self.db_manager.get_tenants_count(search_term="flores rua"), 1)
+        self.assertEqual(self.db_manager.get_tenants_count(search_term="lores"), 0)
+
+        # Room renames reach the index through the rooms trigger
+        tenant.room_ref.name = "Suite Azul"
+        self.session.commit()
+        self.assertEqual(
+            self.db_manager.get_tenants_count(search_term="azul"), len(self.ordered)
+        )
+
+        # Best matches first: a name match outranks a match in the email
+        other = self.session.get(Tenant, self.ordered[-1])
+        other.name = "Pereira Silva"
+        self.session.commit()
+        ranked = self.db_manager.get_tenants_paginated(search_term="pereira")
+        self.assertEqual([t.id for t in ranked], [other.id, tenant.id])
+        tenants, _, _ = self.db_manager.get_tenants_page(search_term="pereira")
+        self.assertEqual([t.id for t in tenants], [other.id, tenant.id])
+
+    def test_invalid_cursor_starts_over(self):
+        """An unreadable cursor falls back to the first page"""
+        tenants, _, prev_cursor = self.db_manager.get_tenants_page("not-a-cursor", limit=3)
+        self.assertEqual([tenant.id for tenant in tenants], self.ordered[:3])
+        self.assertIsNone(prev_cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()